@@ -0,0 +1,42 @@
+"""
+Sample chalice-spec app shared by the benchmarks.
+"""
+from apispec import APISpec
+from pydantic import BaseModel
+
+from chalice_spec import ChaliceWithSpec, Docs, PydanticPlugin
+from chalice_spec.compat import model_json
+
+
+class PostInput(BaseModel):
+    hello: str
+    world: int
+
+
+class PostOutput(BaseModel):
+    message: str
+
+
+def create_app(runtime=None, strict_event_detection=False) -> ChaliceWithSpec:
+    spec = APISpec(
+        title="Benchmark",
+        openapi_version="3.0.1",
+        version="0.0.0",
+        plugins=[PydanticPlugin()],
+    )
+    app = ChaliceWithSpec(
+        app_name="benchmark",
+        spec=spec,
+        runtime=runtime,
+        strict_event_detection=strict_event_detection,
+    )
+
+    @app.route(
+        "/posts",
+        methods=["POST"],
+        docs=Docs(request=PostInput, response=PostOutput),
+    )
+    def post():
+        return model_json(PostOutput(message="hello"))
+
+    return app
@@ -0,0 +1,89 @@
+"""
+Benchmark : type coercion of Bedrock agent properties.
+
+Reports the per-request cost of converting the request with the coercion
+plan of the route, compared with converting it as strings and parsing the
+values in the handler.
+
+    python -m benchmarks.bench_bedrock_coercion
+"""
+import json
+import timeit
+from typing import List
+
+from pydantic import BaseModel
+
+from chalice_spec import Docs
+from chalice_spec.runtime.api_runtime import APIRuntime
+from chalice_spec.runtime.converter import ConversionContext
+from chalice_spec.runtime.converter.bedrock_agent_event_to_apigw import (
+    BedrockAgentEventToApiGateway,
+)
+from benchmarks.app import create_app
+from benchmarks.events import bedrock_agent_event
+
+NUMBER = 10000
+
+
+class Order(BaseModel):
+    name: str
+    quantity: int
+    price: float
+    gift: bool
+    sizes: List[int]
+
+
+def measure(function) -> float:
+    """
+    Return the mean time in microseconds.
+    """
+    return timeit.timeit(function, number=NUMBER) / NUMBER * 1e6
+
+
+def parse_in_handler(body: dict) -> dict:
+    """
+    What handlers do without coercion.
+    """
+    return {
+        "name": body["name"],
+        "quantity": int(body["quantity"]),
+        "price": float(body["price"]),
+        "gift": body["gift"].lower() == "true",
+        "sizes": json.loads(body["sizes"]),
+    }
+
+
+def main():
+    app = create_app([APIRuntime.BedrockAgent])
+
+    @app.route("/orders", methods=["POST"], docs=Docs(request=Order, response=Order))
+    def create_order():
+        return {}
+
+    event = bedrock_agent_event("/orders")
+    event["requestBody"]["content"]["application/json"]["properties"] = [
+        {"name": "name", "type": "string", "value": "order"},
+        {"name": "quantity", "type": "integer", "value": "2"},
+        {"name": "price", "type": "number", "value": "9.5"},
+        {"name": "gift", "type": "boolean", "value": "true"},
+        {"name": "sizes", "type": "array", "value": "[1, 2, 3]"},
+    ]
+    coercing = BedrockAgentEventToApiGateway()
+    plain = BedrockAgentEventToApiGateway(coerce_types=False)
+
+    def convert(converter):
+        conversion = ConversionContext(event, app)
+        converter.convert_request(event, conversion)
+        return conversion.json_body
+
+    cases = {
+        "convert, strings": lambda: convert(plain),
+        "convert, strings + handler parsing": lambda: parse_in_handler(convert(plain)),
+        "convert, coercion plan": lambda: convert(coercing),
+    }
+    for name, function in cases.items():
+        print(f"{name:<38}{measure(function):>10.2f} us")
+
+
+if __name__ == "__main__":
+    main()
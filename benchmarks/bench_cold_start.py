@@ -0,0 +1,83 @@
+"""
+Benchmark : cold start of an app with many documented routes.
+
+Reports the time to declare the routes of an app (the import of the app
+module on a cold start), eager and lazy spec, and the time of the first
+read of the spec. Each run declares new models, as pydantic caches the
+schema of a model class.
+
+    python -m benchmarks.bench_cold_start
+"""
+import time
+
+from apispec import APISpec
+from pydantic import create_model
+
+from chalice_spec import ChaliceWithSpec, Docs, LazyAPISpec, Op, PydanticPlugin
+
+ROUTES = 300
+REPEAT = 5
+
+
+def create_models() -> list:
+    """
+    Declare new request and response models for each route.
+    """
+    models = []
+    for index in range(ROUTES):
+        address = create_model(f"Address{index}", street=(str, ...), city=(str, ...))
+        request = create_model(
+            f"Input{index}", name=(str, ...), count=(int, 0), address=(address, ...)
+        )
+        response = create_model(f"Output{index}", id=(str, ...), input=(request, ...))
+        models.append((request, response))
+    return models
+
+
+def create_app(models: list, lazy_spec: bool) -> ChaliceWithSpec:
+    spec = (LazyAPISpec if lazy_spec else APISpec)(
+        title="Benchmark",
+        openapi_version="3.0.1",
+        version="0.0.0",
+        plugins=[PydanticPlugin()],
+    )
+    app = ChaliceWithSpec(app_name="benchmark", spec=spec, lazy_spec=lazy_spec)
+    for index, (request, response) in enumerate(models):
+
+        def view(item_id):
+            """Update an item"""
+
+        view.__name__ = f"view_{index}"
+        app.route(
+            f"/items{index}/{{item_id}}",
+            methods=["PUT"],
+            docs=Docs(put=Op(request=request, response=response)),
+        )(view)
+    return app
+
+
+def measure(lazy_spec: bool):
+    """
+    Return the best times in milliseconds : declaration, first read of the spec.
+    """
+    declare, read = [], []
+    for _ in range(REPEAT):
+        models = create_models()
+        start = time.perf_counter()
+        app = create_app(models, lazy_spec)
+        declared = time.perf_counter()
+        app.materialize_spec().to_dict()
+        declare.append(declared - start)
+        read.append(time.perf_counter() - declared)
+    return min(declare) * 1e3, min(read) * 1e3
+
+
+def main():
+    print(f"{ROUTES} routes{'declare':>22}{'first spec read':>18}")
+    for name, lazy_spec in (("eager spec", False), ("lazy spec", True)):
+        declare, read = measure(lazy_spec)
+        print(f"{name:<20}{declare:>12.1f} ms{read:>15.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
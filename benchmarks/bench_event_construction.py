@@ -0,0 +1,104 @@
+"""
+Benchmark : time and allocation of building converted events.
+
+Compares the pydantic models round trip (parse_obj, then .dict(by_alias=True))
+with the immutable templates filled in by plain dict operations, for the
+API Gateway event given to Chalice and the Bedrock agent response.
+
+    python -m benchmarks.bench_event_construction
+"""
+import timeit
+import tracemalloc
+
+from chalice_spec.runtime.model_utility.apigw import (
+    build_api_gateway_event,
+    empty_api_gateway_event,
+)
+from chalice_spec.runtime.model_utility.bedrock_agent import (
+    build_bedrock_agent_response,
+    empty_bedrock_agent_response,
+)
+
+NUMBER = 5000
+BODY = '{"hello": "abc", "world": 123}'
+
+
+def api_gateway_event_with_models() -> dict:
+    apigw_event = empty_api_gateway_event()
+    apigw_event.requestContext.httpMethod = "POST"
+    apigw_event.requestContext.resourcePath = "/posts"
+    apigw_event.headers["content-type"] = "application/json"
+    apigw_event.body = BODY
+    return apigw_event.dict(by_alias=True)
+
+
+def api_gateway_event_with_template() -> dict:
+    return build_api_gateway_event(
+        http_method="POST",
+        resource_path="/posts",
+        headers={"content-type": "application/json"},
+        body=BODY,
+    )
+
+
+def bedrock_agent_response_with_models() -> dict:
+    result = empty_bedrock_agent_response()
+    result.response.action_group = "Main"
+    result.response.api_path = "/posts"
+    result.response.http_method = "POST"
+    result.response.http_status_code = 200
+    result.response.add_response_body(content_type="application/json", body=BODY)
+    return result.dict(by_alias=True)
+
+
+def bedrock_agent_response_with_template() -> dict:
+    return build_bedrock_agent_response(
+        action_group="Main",
+        api_path="/posts",
+        http_method="POST",
+        http_status_code=200,
+        content_type="application/json",
+        body=BODY,
+    )
+
+
+def measure(function) -> tuple:
+    """
+    Return the mean time in microseconds and allocated bytes per call.
+    """
+    seconds = timeit.timeit(function, number=NUMBER)
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    tracemalloc.reset_peak()
+    function()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return seconds / NUMBER * 1e6, peak - before
+
+
+def main():
+    cases = {
+        "api-gateway event": (
+            api_gateway_event_with_models,
+            api_gateway_event_with_template,
+        ),
+        "bedrock response": (
+            bedrock_agent_response_with_models,
+            bedrock_agent_response_with_template,
+        ),
+    }
+    print(
+        f"{'conversion':<20}{'models (us)':>12}{'template (us)':>15}"
+        f"{'models (B)':>12}{'template (B)':>14}"
+    )
+    for name, (models, template) in cases.items():
+        models_time, models_bytes = measure(models)
+        template_time, template_bytes = measure(template)
+        print(
+            f"{name:<20}{models_time:>12.2f}{template_time:>15.2f}"
+            f"{models_bytes:>12}{template_bytes:>14}"
+        )
+
+
+if __name__ == "__main__":
+    main()
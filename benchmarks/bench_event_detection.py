@@ -0,0 +1,43 @@
+"""
+Benchmark : per-event cost of runtime detection.
+
+Compares the shape classifier (default) with strict pydantic validation for
+every runtime supported by APIRuntimeHandler.
+
+    python -m benchmarks.bench_event_detection
+"""
+import timeit
+
+from chalice_spec.runtime.api_runtime import (
+    APIRuntimeAll,
+    classify_event,
+)
+from benchmarks.events import api_gateway_event, bedrock_agent_event
+
+NUMBER = 20000
+
+
+def measure(event: dict, strict: bool) -> float:
+    """
+    Return the mean detection time in microseconds.
+    """
+    seconds = timeit.timeit(
+        lambda: classify_event(event, APIRuntimeAll, strict), number=NUMBER
+    )
+    return seconds / NUMBER * 1e6
+
+
+def main():
+    events = {
+        "api-gateway": api_gateway_event(),
+        "bedrock-agent": bedrock_agent_event(),
+    }
+    print(f"{'runtime':<16}{'shape (us)':>12}{'strict (us)':>14}{'speedup':>10}")
+    for name, event in events.items():
+        shape = measure(event, strict=False)
+        strict = measure(event, strict=True)
+        print(f"{name:<16}{shape:>12.2f}{strict:>14.2f}{strict / shape:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""
+Benchmark : HTTP API (payload v2.0) and Function URL conversion.
+
+Reports the cost of converting the request and the response, and the end to
+end invocation compared with a native REST API (v1) event.
+
+    python -m benchmarks.bench_http_api_conversion
+"""
+import timeit
+
+from chalice_spec.runtime.api_runtime import APIRuntime
+from chalice_spec.runtime.converter import ConversionContext
+from chalice_spec.runtime.converter.http_api_event_to_apigw import (
+    HttpApiEventToApiGateway,
+)
+from benchmarks.app import create_app
+from benchmarks.events import api_gateway_event, http_api_event
+
+NUMBER = 10000
+
+
+def measure(function) -> float:
+    """
+    Return the mean time in microseconds.
+    """
+    return timeit.timeit(function, number=NUMBER) / NUMBER * 1e6
+
+
+def main():
+    app = create_app([APIRuntime.APIGateway, APIRuntime.HttpApi])
+    converter = HttpApiEventToApiGateway()
+    v1_event = api_gateway_event()
+    v2_event = http_api_event()
+    function_url_event = http_api_event()
+    function_url_event["routeKey"] = "$default"
+    response = app(v1_event, {})
+
+    cases = {
+        "convert_request (route key)": lambda: converter.convert_request(
+            v2_event, ConversionContext(v2_event, app)
+        ),
+        "convert_request (function url)": lambda: converter.convert_request(
+            function_url_event, ConversionContext(function_url_event, app)
+        ),
+        "convert_response": lambda: converter.convert_response(v2_event, response),
+        "invoke REST API v1": lambda: app(v1_event, {}),
+        "invoke HTTP API v2": lambda: app(v2_event, {}),
+        "invoke Function URL": lambda: app(function_url_event, {}),
+    }
+    for name, function in cases.items():
+        print(f"{name:<34}{measure(function):>10.2f} us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""
+Benchmark : per-request cost of reading an event through lazy views.
+
+Compares full pydantic validation of the event with lazy views that
+validate only the fields a converter or a handler reads.
+
+    python -m benchmarks.bench_lazy_views
+"""
+import timeit
+
+from chalice_spec.runtime.models.apigw import (
+    APIGatewayProxyEventModel,
+    APIGatewayProxyEventView,
+)
+from chalice_spec.runtime.models.bedrock_agent import (
+    BedrockAgentEventModel,
+    BedrockAgentEventView,
+)
+from benchmarks.events import api_gateway_event, bedrock_agent_event
+
+NUMBER = 10000
+
+
+def read_api_gateway_event(event):
+    return (
+        event.requestContext.httpMethod,
+        event.requestContext.resourcePath,
+        event.headers,
+        event.body,
+    )
+
+
+def read_bedrock_agent_event(event):
+    return (
+        event.action_group,
+        event.api_path,
+        event.http_method,
+        event.request_body,
+    )
+
+
+def measure(function) -> float:
+    """
+    Return the mean time in microseconds.
+    """
+    return timeit.timeit(function, number=NUMBER) / NUMBER * 1e6
+
+
+def main():
+    apigw = api_gateway_event()
+    agent = bedrock_agent_event()
+    cases = {
+        "api-gateway": (
+            lambda: read_api_gateway_event(APIGatewayProxyEventModel.parse_obj(apigw)),
+            lambda: read_api_gateway_event(APIGatewayProxyEventView(apigw)),
+        ),
+        "bedrock-agent": (
+            lambda: read_bedrock_agent_event(BedrockAgentEventModel.parse_obj(agent)),
+            lambda: read_bedrock_agent_event(BedrockAgentEventView(agent)),
+        ),
+    }
+    print(f"{'event':<16}{'model (us)':>12}{'view (us)':>12}{'speedup':>10}")
+    for name, (model, view) in cases.items():
+        model_time = measure(model)
+        view_time = measure(view)
+        print(
+            f"{name:<16}{model_time:>12.2f}{view_time:>12.2f}"
+            f"{model_time / view_time:>9.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
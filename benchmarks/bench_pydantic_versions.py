@@ -0,0 +1,118 @@
+"""
+Benchmark : pydantic v1 and v2, side by side.
+
+Reports the spec build of the app of bench_spec_build, and the per-event
+conversion : validation of the lambda events with the runtime models, and
+the invocation of an app with strict event detection, which validates each
+event. Each interpreter runs the benchmark with the pydantic it has
+installed, e.g. a virtualenv with pydantic v1 and one with pydantic v2.
+
+    python -m benchmarks.bench_pydantic_versions
+    python -m benchmarks.bench_pydantic_versions --python venv1/bin/python venv2/bin/python
+"""
+import argparse
+import json
+import subprocess
+import sys
+import time
+import timeit
+
+from pydantic import VERSION
+
+from chalice_spec.compat import parse_model
+from chalice_spec.pydantic import PydanticPlugin
+from chalice_spec.runtime.api_runtime import APIRuntime
+from chalice_spec.runtime.models.apigw import APIGatewayProxyEventModel
+from chalice_spec.runtime.models.bedrock_agent import BedrockAgentEventModel
+from benchmarks.app import create_app
+from benchmarks.bench_spec_build import build_spec, create_models
+from benchmarks.events import api_gateway_event, bedrock_agent_event
+
+NUMBER = 5000
+REPEAT = 5
+
+
+def measure_event(function) -> float:
+    """
+    Return the best mean time in microseconds.
+    """
+    return min(timeit.repeat(function, number=NUMBER, repeat=REPEAT)) / NUMBER * 1e6
+
+
+def measure_spec_build() -> float:
+    """
+    Return the best cold build time in milliseconds.
+    """
+    times = []
+    for _ in range(REPEAT):
+        models = create_models()
+        start = time.perf_counter()
+        build_spec(models, PydanticPlugin())
+        times.append(time.perf_counter() - start)
+    return min(times) * 1e3
+
+
+def run() -> dict:
+    """
+    Run the benchmark with the installed pydantic.
+    """
+    apigw_event = api_gateway_event()
+    agent_event = bedrock_agent_event()
+    app = create_app(
+        [APIRuntime.BedrockAgent, APIRuntime.APIGateway], strict_event_detection=True
+    )
+    return {
+        "pydantic": VERSION,
+        "results": [
+            ["spec build (ms)", measure_spec_build()],
+            [
+                "parse API Gateway event (us)",
+                measure_event(
+                    lambda: parse_model(APIGatewayProxyEventModel, apigw_event)
+                ),
+            ],
+            [
+                "parse Bedrock agent event (us)",
+                measure_event(lambda: parse_model(BedrockAgentEventModel, agent_event)),
+            ],
+            [
+                "invoke API Gateway, strict (us)",
+                measure_event(lambda: app(apigw_event, {})),
+            ],
+            [
+                "invoke Bedrock agent, strict (us)",
+                measure_event(lambda: app(agent_event, {})),
+            ],
+        ],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--python", nargs="*", default=[], help="interpreters to compare"
+    )
+    parser.add_argument("--json", action="store_true", help="print JSON results")
+    args = parser.parse_args()
+    if args.json:
+        print(json.dumps(run()))
+        return
+
+    runs = []
+    for python in args.python or [sys.executable]:
+        output = subprocess.run(
+            [python, "-m", "benchmarks.bench_pydantic_versions", "--json"],
+            check=True,
+            capture_output=True,
+            text=True,
+        ).stdout
+        runs.append(json.loads(output))
+
+    print(f"{'':<36}" + "".join(f"{'pydantic ' + r['pydantic']:>18}" for r in runs))
+    for index, (name, _) in enumerate(runs[0]["results"]):
+        values = "".join(f"{r['results'][index][1]:>18.2f}" for r in runs)
+        print(f"{name:<36}{values}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,39 @@
+"""
+Benchmark : direct invoke (RPC) compared with the REST API path.
+
+Reports the end to end invocation of the same operation from an RPC event
+({operationId, params, body}) and from an API Gateway event.
+
+    python -m benchmarks.bench_rpc
+"""
+import timeit
+
+from chalice_spec.runtime.api_runtime import APIRuntime
+from benchmarks.app import create_app
+from benchmarks.events import api_gateway_event
+
+NUMBER = 10000
+
+
+def measure(function) -> float:
+    """
+    Return the mean time in microseconds.
+    """
+    return timeit.timeit(function, number=NUMBER) / NUMBER * 1e6
+
+
+def main():
+    app = create_app([APIRuntime.Rpc, APIRuntime.APIGateway])
+    rest_event = api_gateway_event()
+    rpc_event = {"operationId": "post_posts", "body": {"hello": "a", "world": 1}}
+
+    cases = {
+        "invoke REST API": lambda: app(rest_event, {}),
+        "invoke RPC": lambda: app(rpc_event, {}),
+    }
+    for name, function in cases.items():
+        print(f"{name:<34}{measure(function):>10.2f} us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""
+Benchmark : spec build time for apps with deep, shared model graphs.
+
+Each route documents a request and a response model that reference a tree
+of nested models, shared across the routes. Reports the build of a spec of
+the app with the schema cache of PydanticPlugin, and with the previous
+registration (a try/except DuplicateComponentNameError for each nested
+definition of each model), cold and warm.
+
+    python -m benchmarks.bench_spec_build
+"""
+import time
+from typing import Any, Union
+
+from apispec import APISpec
+from apispec.exceptions import DuplicateComponentNameError
+from pydantic import BaseModel, create_model
+
+from chalice_spec import ChaliceWithSpec, Docs, Op, PydanticPlugin
+
+ROUTES = 200
+DEPTH = 6
+WIDTH = 3
+REPEAT = 5
+
+
+class UncachedPydanticPlugin(PydanticPlugin):
+    """
+    PydanticPlugin before the schema cache, as a baseline.
+    """
+
+    def schema_helper(
+        self, name: str, definition: dict, **kwargs: Any
+    ) -> Union[dict, None]:
+        model: Union[BaseModel, None] = kwargs.pop("model", None)
+        if model:
+            schema = dict(model.schema(ref_template="#/components/schemas/{model}"))
+            spec: Union[APISpec, None] = kwargs.pop("spec", None)
+            if spec and "definitions" in schema:
+                for k, v in schema["definitions"].items():
+                    try:
+                        spec.components.schema(k, v)
+                    except DuplicateComponentNameError:
+                        pass
+            if "definitions" in schema:
+                del schema["definitions"]
+            return schema
+        return None
+
+
+def create_models() -> list:
+    """
+    Declare a tree of DEPTH levels of WIDTH nested models, and the models of each route.
+    """
+    level = [create_model(f"Leaf{i}", value=(str, ...)) for i in range(WIDTH)]
+    for depth in range(DEPTH):
+        level = [
+            create_model(
+                f"Node{depth}_{i}",
+                **{f"child{j}": (child, ...) for j, child in enumerate(level)},
+            )
+            for i in range(WIDTH)
+        ]
+    models = []
+    for index in range(ROUTES):
+        root = level[index % WIDTH]
+        request = create_model(f"Input{index}", root=(root, ...))
+        response = create_model(f"Output{index}", root=(root, ...), id=(str, ...))
+        models.append((request, response))
+    return models
+
+
+def build_spec(models: list, plugin) -> dict:
+    spec = APISpec(
+        title="Benchmark",
+        openapi_version="3.0.1",
+        version="0.0.0",
+        plugins=[plugin],
+    )
+    app = ChaliceWithSpec(app_name="benchmark", spec=spec)
+    for index, (request, response) in enumerate(models):
+
+        def view():
+            pass
+
+        view.__name__ = f"view_{index}"
+        app.route(
+            f"/items{index}",
+            methods=["PUT"],
+            docs=Docs(put=Op(request=request, response=response)),
+        )(view)
+    return spec.to_dict()
+
+
+def measure(plugin_class) -> tuple:
+    """
+    Return the best times in milliseconds : cold build, warm build.
+    """
+    cold, warm = [], []
+    for _ in range(REPEAT):
+        models = create_models()
+        start = time.perf_counter()
+        build_spec(models, plugin_class())
+        built = time.perf_counter()
+        build_spec(models, plugin_class())
+        cold.append(built - start)
+        warm.append(time.perf_counter() - built)
+    return min(cold) * 1e3, min(warm) * 1e3
+
+
+def main():
+    print(f"{ROUTES} routes, depth {DEPTH}{'cold build':>18}{'warm build':>14}")
+    for name, plugin_class in (
+        ("without schema cache", UncachedPydanticPlugin),
+        ("with schema cache", PydanticPlugin),
+    ):
+        cold, warm = measure(plugin_class)
+        print(f"{name:<28}{cold:>11.1f} ms{warm:>11.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+"""
+Sample lambda events shared by the benchmarks.
+"""
+import json
+
+
+def api_gateway_event(path: str = "/posts", method: str = "POST") -> dict:
+    """
+    API Gateway (REST API) proxy event, shaped like a real request with
+    identity, authorizer and client certificate information.
+    """
+    return {
+        "resource": path,
+        "path": path,
+        "httpMethod": method,
+        "headers": {
+            "accept": "application/json",
+            "content-type": "application/json",
+            "host": "xxxxxxxxxx.execute-api.us-east-1.amazonaws.com",
+            "user-agent": "benchmark/1.0",
+            "x-forwarded-for": "127.0.0.1",
+        },
+        "multiValueHeaders": {
+            "accept": ["application/json"],
+            "content-type": ["application/json"],
+        },
+        "queryStringParameters": {"page": "1"},
+        "multiValueQueryStringParameters": {"page": ["1"]},
+        "requestContext": {
+            "accountId": "123456789012",
+            "apiId": "xxxxxxxxxx",
+            "authorizer": {"claims": {"sub": "user"}, "scopes": ["read"]},
+            "httpMethod": method,
+            "identity": {
+                "sourceIp": "127.0.0.1",
+                "userAgent": "benchmark/1.0",
+                "clientCert": {
+                    "clientCertPem": "-----BEGIN CERTIFICATE-----",
+                    "subjectDN": "www.example.com",
+                    "issuerDN": "Example issuer",
+                    "serialNumber": "a1:a1:a1:a1",
+                    "validity": {
+                        "notBefore": "May 28 12:30:02 2019 GMT",
+                        "notAfter": "Aug  5 09:36:04 2021 GMT",
+                    },
+                },
+            },
+            "path": "/api" + path,
+            "protocol": "HTTP/1.1",
+            "requestId": "c6af9ac6-7b61-11e6-9a41-93e8deadbeef",
+            "requestTime": "09/Apr/2015:12:34:56 +0000",
+            "requestTimeEpoch": 1428582896000,
+            "resourceId": "123456",
+            "resourcePath": path,
+            "stage": "api",
+        },
+        "pathParameters": None,
+        "stageVariables": None,
+        "body": json.dumps({"hello": "abc", "world": 123}),
+        "isBase64Encoded": False,
+    }
+
+
+def bedrock_agent_event(path: str = "/posts", method: str = "POST") -> dict:
+    """
+    Agents for Amazon Bedrock event with a JSON request body.
+    """
+    return {
+        "messageVersion": "1.0",
+        "agent": {
+            "name": "agent",
+            "id": "AGENTID",
+            "alias": "TSTALIASID",
+            "version": "DRAFT",
+        },
+        "inputText": "Say hello",
+        "sessionId": "123456789012345",
+        "actionGroup": "Main",
+        "apiPath": path,
+        "httpMethod": method,
+        "parameters": [],
+        "requestBody": {
+            "content": {
+                "application/json": {
+                    "properties": [
+                        {"name": "hello", "type": "string", "value": "abc"},
+                        {"name": "world", "type": "integer", "value": "123"},
+                    ]
+                }
+            }
+        },
+        "sessionAttributes": {},
+        "promptSessionAttributes": {},
+    }
+
+
+def http_api_event(path: str = "/posts", method: str = "POST") -> dict:
+    """
+    API Gateway HTTP API (payload format version 2.0) event.
+    Lambda Function URL events have the same shape, with the $default route key.
+    """
+    return {
+        "version": "2.0",
+        "routeKey": f"{method} {path}",
+        "rawPath": path,
+        "rawQueryString": "page=1",
+        "cookies": ["session=abc"],
+        "headers": {
+            "accept": "application/json",
+            "content-type": "application/json",
+            "host": "xxxxxxxxxx.execute-api.us-east-1.amazonaws.com",
+            "user-agent": "benchmark/1.0",
+        },
+        "queryStringParameters": {"page": "1"},
+        "requestContext": {
+            "accountId": "123456789012",
+            "apiId": "xxxxxxxxxx",
+            "domainName": "xxxxxxxxxx.execute-api.us-east-1.amazonaws.com",
+            "domainPrefix": "xxxxxxxxxx",
+            "http": {
+                "method": method,
+                "path": path,
+                "protocol": "HTTP/1.1",
+                "sourceIp": "127.0.0.1",
+                "userAgent": "benchmark/1.0",
+            },
+            "requestId": "c6af9ac6-7b61-11e6-9a41-93e8deadbeef",
+            "routeKey": f"{method} {path}",
+            "stage": "$default",
+            "time": "09/Apr/2015:12:34:56 +0000",
+            "timeEpoch": 1428582896000,
+        },
+        "body": json.dumps({"hello": "abc", "world": 123}),
+        "isBase64Encoded": False,
+    }
@@ -1,4 +1,5 @@
 from .chalice_legacy import *
 from .chalice import *
+from .components import *
 from .docs import *
 from .pydantic import *
@@ -0,0 +1,190 @@
+import dataclasses
+import enum
+import hashlib
+import json
+from typing import Any, Dict, Iterable, Optional, Set
+
+from apispec import APISpec
+from pydantic import BaseModel
+
+from chalice_spec.compat import (
+    model_fields,
+    model_schema_extra,
+    type_arguments,
+    type_constraints,
+    type_origin,
+)
+from chalice_spec.export import HTTP_METHODS
+
+# Version of the artifact format, part of the fingerprint
+ARTIFACT_VERSION = 1
+
+
+class StaleSpecArtifactWarning(UserWarning):
+    """
+    The spec artifact was built from other routes or models than the ones of the app.
+    """
+
+
+def _model_signature(model: type, seen: Set[type]) -> Any:
+    if model in seen:
+        # Recursive model : referenced by name
+        return f"{model.__module__}.{model.__qualname__}"
+    seen.add(model)
+    fields = []
+    for name, field in model_fields(model).items():
+        fields.append(
+            [
+                name,
+                field.alias,
+                field.required,
+                _canonical(field.default, seen),
+                _type_signature(field.annotation, seen),
+                field.title,
+                field.description,
+                _canonical(field.extra, seen),
+                _canonical(field.constraints, seen),
+                _canonical(field.examples, seen),
+            ]
+        )
+    return [
+        f"{model.__module__}.{model.__qualname__}",
+        model.__doc__,
+        _canonical(model_schema_extra(model), seen),
+        fields,
+    ]
+
+
+def _type_signature(type_: Any, seen: Set[type]) -> Any:
+    if isinstance(type_, type) and issubclass(type_, BaseModel):
+        return _model_signature(type_, seen)
+    if isinstance(type_, type) and issubclass(type_, enum.Enum):
+        return [type_.__qualname__, [repr(member.value) for member in type_]]
+    constraints = _canonical(type_constraints(type_), seen)
+    arguments = type_arguments(type_)
+    if arguments:
+        return [
+            repr(type_origin(type_)),
+            [_type_signature(argument, seen) for argument in arguments],
+            constraints,
+        ]
+    return [repr(type_), constraints] if constraints is not None else repr(type_)
+
+
+def _canonical(value: Any, seen: Set[type]) -> Any:
+    """
+    JSON-able form of the documentation of a route, models by their fields.
+    """
+    if isinstance(value, type) and issubclass(value, BaseModel):
+        return _model_signature(value, seen)
+    if isinstance(value, dict):
+        return sorted([str(key), _canonical(item, seen)] for key, item in value.items())
+    if isinstance(value, (list, tuple)):
+        return [_canonical(item, seen) for item in value]
+    if isinstance(value, (set, frozenset)):
+        return sorted((_canonical(item, seen) for item in value), key=json.dumps)
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    if dataclasses.is_dataclass(value) and not isinstance(value, type):
+        # Constraints of pydantic v2, e.g. MaxLen(max_length=5)
+        fields = {
+            field.name: getattr(value, field.name)
+            for field in dataclasses.fields(value)
+        }
+        return [type(value).__name__, _canonical(fields, seen)]
+    if hasattr(value, "__dict__") and not callable(value):
+        # Docs, Operation, Response
+        return [type(value).__name__, _canonical(vars(value), seen)]
+    if callable(value) and hasattr(value, "__qualname__"):
+        # By name : the repr of functions changes with each process
+        return f"{getattr(value, '__module__', None)}.{value.__qualname__}"
+    return repr(value)
+
+
+def spec_fingerprint(documented_routes: Iterable[tuple], **options: Any) -> str:
+    """
+    Fingerprint of the documentation of the routes of an app.
+
+    The fingerprint covers the paths, methods, docs, docstrings and the fields
+    of the models of the routes, without generating their schemas.
+
+    :param documented_routes: (docs, path, methods, content_types, func, tags) of the routes
+    :param options: options of the app that change the spec
+    :return: hex digest
+    """
+    digest = hashlib.sha256()
+    digest.update(
+        json.dumps([ARTIFACT_VERSION, _canonical(options, set())]).encode("utf-8")
+    )
+    for docs, path, methods, content_types, func, tags in documented_routes:
+        route = [
+            path,
+            list(methods),
+            _canonical(content_types, set()),
+            _canonical(tags, set()),
+            func.__doc__,
+            _canonical(docs, set()),
+        ]
+        digest.update(json.dumps(route, default=repr).encode("utf-8"))
+    return digest.hexdigest()
+
+
+def dump_spec_artifact(spec: APISpec, fingerprint: str) -> str:
+    """
+    Serialize a built spec to a compact artifact.
+
+    :param spec: spec with the routes of the app
+    :param fingerprint: fingerprint of the routes of the app
+    :return: artifact JSON
+    """
+    artifact = {
+        "version": ARTIFACT_VERSION,
+        "fingerprint": fingerprint,
+        "spec": spec.to_dict(),
+    }
+    return json.dumps(artifact, separators=(",", ":"), ensure_ascii=False)
+
+
+def read_spec_artifact(path: str) -> Optional[Dict[str, Any]]:
+    """
+    Read a spec artifact.
+
+    :param path: artifact file
+    :return: artifact, or None if the file does not exist or is of another version
+    """
+    try:
+        with open(path, encoding="utf-8") as fp:
+            artifact = json.load(fp)
+    except FileNotFoundError:
+        return None
+    if not isinstance(artifact, dict) or artifact.get("version") != ARTIFACT_VERSION:
+        return None
+    return artifact
+
+
+def load_spec_artifact(spec: APISpec, artifact: Dict[str, Any]) -> None:
+    """
+    Add the paths and schemas of an artifact to a spec, without generating schemas.
+
+    Schemas already registered, e.g. by the app module, are kept.
+
+    :param spec: spec of the app
+    :param artifact: artifact built by dump_spec_artifact
+    """
+    built = artifact["spec"]
+    schemas = spec.components.schemas
+    for name, schema in built.get("components", {}).get("schemas", {}).items():
+        # Registered as built : the plugins already ran at export
+        schemas.setdefault(name, schema)
+    for path, path_item in built.get("paths", {}).items():
+        spec.path(
+            path,
+            operations={
+                method: operation
+                for method, operation in path_item.items()
+                if method in HTTP_METHODS
+            },
+            summary=path_item.get("summary"),
+            description=path_item.get("description"),
+            parameters=path_item.get("parameters"),
+        )
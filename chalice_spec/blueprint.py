@@ -1,20 +1,234 @@
+import gzip
+import hashlib
+import io
+import json
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
 from apispec import APISpec
-from chalice import Blueprint, Response
+from chalice import BadRequestError, Blueprint, Response
+from chalice.app import Request
+from pydantic import BaseModel, Field, ValidationError
+
+from chalice_spec.chalice import BlueprintWithSpec
+from chalice_spec.compat import PYDANTIC_V2, RootModel, parse_model, root_value
+from chalice_spec.docs import Docs, Operation
+from chalice_spec.runtime.concurrency import map_concurrently
+from chalice_spec.runtime.model_utility.apigw import build_api_gateway_event
+from chalice_spec.runtime.routing import RouteTrie
+
+
+# Encodings of the cached spec, in order of preference
+SPEC_ENCODINGS = ("br", "gzip")
+
+
+def _compress(body: bytes, encoding: str) -> Optional[bytes]:
+    """
+    Compress a body, None if the encoding is not available.
+    """
+    if encoding == "gzip":
+        # gzip.compress only takes mtime since python 3.8
+        buffer = io.BytesIO()
+        with gzip.GzipFile(fileobj=buffer, mode="wb", compresslevel=9, mtime=0) as file:
+            file.write(body)
+        return buffer.getvalue()
+    if encoding == "br":
+        try:
+            import brotli
+        except ImportError:
+            # Optional dependency : gzip only
+            return None
+        return brotli.compress(body)
+    return None
 
 
-def chalice_spec_blueprint(spec: APISpec, enable_swagger: bool = False):
+class SerializedSpec:
+    """
+    A spec document, serialized once, with its ETag and compressed variants.
+    """
+
+    def __init__(self, body: str, content_type: str):
+        """
+        constructor.
+
+        :param body: serialized spec
+        :param content_type: media type of the body
+        """
+        self.body = body
+        self.content_type = content_type
+        self.raw = body.encode("utf-8")
+        self.etag = '"' + hashlib.sha256(self.raw).hexdigest()[:32] + '"'
+        # Compressed bodies : encoding -> bytes, None if not available
+        self._compressed: Dict[str, Optional[bytes]] = {}
+        self._lock = threading.Lock()
+
+    def compressed(self, encoding: str) -> Optional[bytes]:
+        """
+        compressed body, built on first use.
+
+        :param encoding: gzip or br
+        :return: compressed body, or None if the encoding is not available
+        """
+        if encoding not in self._compressed:
+            with self._lock:
+                if encoding not in self._compressed:
+                    self._compressed[encoding] = _compress(self.raw, encoding)
+        return self._compressed[encoding]
+
+    def matches(self, if_none_match: Optional[str]) -> bool:
+        """
+        check an If-None-Match header against the ETag.
+        """
+        if not if_none_match:
+            return False
+        for tag in if_none_match.split(","):
+            tag = tag.strip()
+            if tag == "*" or tag == self.etag or tag == "W/" + self.etag:
+                return True
+        return False
+
+
+class SpecDocuments:
+    """
+    Serialized documents of a spec, rebuilt when routes were added since.
+    """
+
+    def __init__(self, spec: APISpec):
+        self._spec = spec
+        self._documents: Dict[str, Tuple[int, SerializedSpec]] = {}
+        self._lock = threading.Lock()
+
+    def _serialize(self, kind: str) -> SerializedSpec:
+        if kind == "yaml":
+            return SerializedSpec(self._spec.to_yaml(), "application/yaml")
+        return SerializedSpec(
+            json.dumps(self._spec.to_dict(), separators=(",", ":")),
+            "application/json",
+        )
+
+    def get(self, kind: str, revision: int) -> SerializedSpec:
+        """
+        serialized document of the spec.
+
+        :param kind: json or yaml
+        :param revision: number of routes of the app
+        :return: serialized document
+        """
+        cached = self._documents.get(kind)
+        if cached is None or cached[0] != revision:
+            with self._lock:
+                cached = self._documents.get(kind)
+                if cached is None or cached[0] != revision:
+                    cached = (revision, self._serialize(kind))
+                    self._documents[kind] = cached
+        return cached[1]
+
+
+def _accepted_encodings(accept_encoding: Optional[str]) -> List[str]:
+    accepted = []
+    for item in (accept_encoding or "").split(","):
+        coding, _, parameters = item.strip().partition(";")
+        if parameters.replace(" ", "") in ("q=0", "q=0.0", "q=0.00", "q=0.000"):
+            continue
+        accepted.append(coding.strip().lower())
+    return accepted
+
+
+def _is_binary_type(content_type: str, binary_types: List[str]) -> bool:
+    main_type = content_type.split("/", 1)[0]
+    return any(
+        binary_type in (content_type, main_type + "/*", "*/*")
+        for binary_type in binary_types
+    )
+
+
+def serve_spec_document(
+    document: SerializedSpec,
+    headers: Dict[str, str],
+    binary_types: List[str],
+    max_age: int,
+) -> Response:
+    """
+    Response of a serialized spec, for the headers of a request.
+
+    Bodies are compressed only for content types that the app serves as
+    binary : API Gateway needs them base64 encoded.
+
+    :param document: serialized spec
+    :param headers: request headers
+    :param binary_types: binary types of the app
+    :param max_age: Cache-Control max-age, in seconds
+    :return: Chalice response
+    """
+    response_headers = {
+        "ETag": document.etag,
+        "Cache-Control": f"public, max-age={max_age}",
+        "Vary": "Accept-Encoding",
+    }
+    if document.matches(headers.get("if-none-match")):
+        return Response(body="", status_code=304, headers=response_headers)
+
+    response_headers["Content-Type"] = document.content_type
+    if _is_binary_type(document.content_type, binary_types):
+        accepted = _accepted_encodings(headers.get("accept-encoding"))
+        for encoding in SPEC_ENCODINGS:
+            if encoding in accepted:
+                body = document.compressed(encoding)
+                if body is not None:
+                    response_headers["Content-Encoding"] = encoding
+                    return Response(body=body, headers=response_headers)
+        return Response(body=document.raw, headers=response_headers)
+    return Response(body=document.body, headers=response_headers)
+
+
+def chalice_spec_blueprint(
+    spec: APISpec,
+    enable_swagger: bool = False,
+    enable_yaml: bool = False,
+    max_age: int = 86400,
+):
     """
     Returns a Blueprint which will render the OpenAPI spec and (optionally)
     a Swagger UI.
 
     This Blueprint is opinionated on the location of the JSON spec file and
     the Swagger UI, and is modelled after FastAPI.
+
+    The spec is serialized once, and served with an ETag : requests with a
+    matching If-None-Match are answered with 304. It is serialized again
+    when routes were added to the app since.
+
+    :param spec: spec of the app
+    :param enable_swagger: serve the Swagger UI at /docs
+    :param enable_yaml: serve the spec as YAML at /openapi.yaml, needs PyYAML
+    :param max_age: Cache-Control max-age of the spec, in seconds
     """
     blueprint = Blueprint(__name__)
+    documents = SpecDocuments(spec)
+
+    def serve(kind: str) -> Response:
+        app = blueprint.current_app
+        if hasattr(app, "materialize_spec"):
+            # Routes recorded in lazy mode, or the spec artifact
+            app.materialize_spec()
+        revision = sum(len(entries) for entries in app.routes.values())
+        return serve_spec_document(
+            documents.get(kind, revision),
+            blueprint.current_request.headers,
+            app.api.binary_types,
+            max_age,
+        )
 
     @blueprint.route("/openapi.json")
     def openapi_json():
-        return spec.to_dict()
+        return serve("json")
+
+    if enable_yaml:
+
+        @blueprint.route("/openapi.yaml")
+        def openapi_yaml():
+            return serve("yaml")
 
     if enable_swagger:
 
@@ -53,3 +267,200 @@ def chalice_spec_blueprint(spec: APISpec, enable_swagger: bool = False):
             )
 
     return blueprint
+
+
+class BatchRequestItem(BaseModel):
+    """
+    A sub-request of a batch request.
+    """
+
+    method: str = Field("GET", description="HTTP method, e.g. GET")
+    path: str = Field(..., description="Request path, with query string")
+    headers: Dict[str, str] = Field({}, description="Request headers")
+    body: Any = Field(None, description="Request JSON body")
+
+
+if PYDANTIC_V2:
+
+    class BatchRequest(RootModel[List[BatchRequestItem]]):
+        pass
+
+else:
+
+    class BatchRequest(BaseModel):
+        __root__: List[BatchRequestItem]
+
+
+class BatchResponseItem(BaseModel):
+    """
+    The response of a sub-request of a batch request.
+    """
+
+    status: int = Field(..., description="HTTP status code")
+    headers: Dict[str, str] = Field({}, description="Response headers")
+    body: Any = Field(None, description="Response body, parsed if it is JSON")
+
+
+if PYDANTIC_V2:
+
+    class BatchResponse(RootModel[List[BatchResponseItem]]):
+        pass
+
+else:
+
+    class BatchResponse(BaseModel):
+        __root__: List[BatchResponseItem]
+
+
+# Methods without side effects : their sub-requests may run concurrently
+SAFE_METHODS = frozenset(["GET", "HEAD", "OPTIONS"])
+
+
+def _batch_response_item(response: dict) -> dict:
+    headers = response.get("headers") or {}
+    body = response.get("body")
+    content_type = (
+        {key.lower(): value for key, value in headers.items()}
+        .get("content-type", "")
+        .split(";")[0]
+    )
+    # Without content type, the body is JSON as for API Gateway
+    if body and content_type in ("", "application/json"):
+        try:
+            body = json.loads(body)
+        except ValueError:
+            pass
+    return {"status": response["statusCode"], "headers": headers, "body": body}
+
+
+def _dispatch_batch_item(
+    app, item: BatchRequestItem, context: Any, request: Optional[Request]
+) -> dict:
+    """
+    dispatch a sub-request through the routes of the app, in-process.
+    """
+    url = urlsplit(item.path)
+    method = item.method.upper()
+    match = RouteTrie.for_app(app).match(url.path)
+    if match is None:
+        return {"status": 404, "headers": {}, "body": {"Code": "NotFoundError"}}
+    route, params = match
+    if method not in app.routes[route]:
+        return {"status": 405, "headers": {}, "body": {"Code": "MethodNotAllowedError"}}
+
+    request_context = {}
+    if request is not None:
+        if route == request.path:
+            # Nested batches would multiply the work of one request
+            return {"status": 400, "headers": {}, "body": {"Code": "BadRequestError"}}
+        batch_entry = app.routes[request.path][request.method]
+        entry = app.routes[route][method]
+        # The caller is only authorized for the batch route
+        if (
+            entry.authorizer != batch_entry.authorizer
+            or entry.api_key_required != batch_entry.api_key_required
+        ):
+            return {"status": 403, "headers": {}, "body": {"Code": "ForbiddenError"}}
+        request_context = request.context
+
+    headers = {"content-type": "application/json"}
+    headers.update({key.lower(): value for key, value in item.headers.items()})
+    event = build_api_gateway_event(
+        http_method=method, resource_path=route, headers=headers, body=None
+    )
+    event["path"] = url.path
+    event["pathParameters"] = params or None
+    event["multiValueQueryStringParameters"] = parse_qs(url.query) or None
+    # The caller of the batch request is the caller of its sub-requests
+    for key in ("authorizer", "identity"):
+        if request_context.get(key) is not None:
+            event["requestContext"][key] = dict(request_context[key])
+    return _batch_response_item(app.invoke_rest_api(event, context, item.body))
+
+
+def dispatch_batch(
+    app,
+    items: List[BatchRequestItem],
+    context: Any,
+    max_workers: int,
+    request: Optional[Request] = None,
+) -> List[dict]:
+    """
+    dispatch the sub-requests of a batch request, and return their responses.
+
+    Consecutive sub-requests with safe methods (GET, HEAD, OPTIONS) run
+    concurrently, the other ones run one at a time, in order.
+
+    With the batch request, the sub-requests run with its authorizer and
+    identity, and are forbidden on routes with another authorizer or API key
+    requirement than the batch route, or on the batch route itself.
+
+    :param app: ChaliceWithSpec app
+    :param items: sub-requests
+    :param context: lambda context
+    :param max_workers: maximum number of sub-requests run concurrently
+    :param request: batch request
+    :return: responses, in the order of the sub-requests
+    """
+    responses = []
+    start = 0
+    while start < len(items):
+        end = start + 1
+        if items[start].method.upper() in SAFE_METHODS:
+            while end < len(items) and items[end].method.upper() in SAFE_METHODS:
+                end += 1
+        responses.extend(
+            map_concurrently(
+                lambda item: _dispatch_batch_item(app, item, context, request),
+                items[start:end],
+                max_workers,
+            )
+        )
+        start = end
+    return responses
+
+
+def chalice_spec_batch_blueprint(
+    max_items: int = 50, max_workers: int = 8, tags: Optional[List[str]] = None
+) -> BlueprintWithSpec:
+    """
+    Returns a Blueprint which exposes POST /batch, to run many requests of
+    the app in one invocation.
+
+    The body is an array of {method, path, headers, body} sub-requests, they
+    are dispatched in-process through the routes of the app, and the
+    response is the array of their {status, headers, body} responses.
+    Sub-requests run with the authorizer and identity of the batch request,
+    only on routes with the same authorizer and API key requirement.
+    Register it on a ChaliceWithSpec app so that it is documented in the spec.
+    """
+    blueprint = BlueprintWithSpec(__name__, tags=tags)
+
+    @blueprint.route(
+        "/batch",
+        methods=["POST"],
+        docs=Docs(post=Operation(request=BatchRequest, response=BatchResponse)),
+    )
+    def batch():
+        """
+        Run many requests in one invocation.
+        """
+        app = blueprint.current_app
+        request = app.current_request
+        try:
+            items = root_value(parse_model(BatchRequest, request.json_body))
+        except ValidationError as e:
+            raise BadRequestError(str(e))
+        if len(items) > max_items:
+            raise BadRequestError(f"A batch has at most {max_items} requests")
+
+        try:
+            return dispatch_batch(
+                app, items, request.lambda_context, max_workers, request
+            )
+        finally:
+            # Sub-requests replaced the request of this thread
+            app.current_request = request
+            app.lambda_context = request.lambda_context
+
+    return blueprint
@@ -1,9 +1,19 @@
 import re
-
-from chalice_spec.docs import trim_docstring
+import threading
+import warnings
+
+from chalice_spec.artifact import (
+    StaleSpecArtifactWarning,
+    dump_spec_artifact,
+    load_spec_artifact,
+    read_spec_artifact,
+    spec_fingerprint,
+)
+from chalice_spec.docs import default_operation_id, trim_docstring
+from chalice_spec.export import function_definitions_from_spec, select_operations
 from chalice_spec.runtime import APIRuntimeHandler, APIRuntime
 from chalice_spec import Docs, Operation
-from typing import Any, Callable, Optional, Union, List
+from typing import Any, Callable, Dict, Optional, Set, Tuple, Union, List
 
 from apispec import APISpec
 from chalice import Blueprint
@@ -35,25 +45,57 @@ def default_docs_for_methods(
     )
 
 
+class LazyAPISpec(APISpec):
+    """
+    APISpec of an app in lazy mode, or with a spec artifact.
+
+    The app records its routes, and adds them to the spec when it is read :
+    to_dict() and to_yaml() never return a partial spec.
+    """
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        # Adds the routes recorded by the app to the spec
+        self._materialize: Optional[Callable[[], Any]] = None
+
+    def bind(self, materialize: Callable[[], Any]) -> None:
+        """
+        Set the function that adds the recorded routes to the spec, before reads.
+
+        :param materialize: e.g. ChaliceWithSpec.materialize_spec
+        """
+        self._materialize = materialize
+
+    def to_dict(self) -> Dict[str, Any]:
+        if self._materialize is not None:
+            self._materialize()
+        return super().to_dict()
+
+
 class BlueprintWithSpec(Blueprint):
     """
     A Chalice Blueprint that has been augmented with chalice-spec to
     enable easy OpenAPI documentation.
     """
 
-    def __init__(self, import_name: str, tags=None) -> None:
+    def __init__(self, import_name: str, tags=None, action_group=None) -> None:
         self._chalice_spec_docs = []
         self._chalice_spec_tags = tags
+        self._chalice_spec_action_group = action_group
+        # Action group of the routes : (path, methods, action group)
+        self._chalice_spec_action_groups = []
         super(BlueprintWithSpec, self).__init__(import_name)
 
     def route(self, path: str, **kwargs: Any) -> Callable[..., Any]:
         def route_decorator(func):
             docs: Docs = kwargs.pop("docs", None)
+            action_group = kwargs.pop("action_group", None)
 
             methods = [method.lower() for method in kwargs.get("methods", ["get"])]
             content_types = kwargs.get("content_types", ["application/json"])
 
             self._chalice_spec_docs.append((path, methods, content_types, docs, func))
+            self._chalice_spec_action_groups.append((path, methods, action_group))
 
             return super(BlueprintWithSpec, self).route(path, **kwargs)(func)
 
@@ -93,78 +135,335 @@ class ChaliceWithSpec(Chalice, APIRuntimeHandler):
         spec: APISpec,
         generate_default_docs=False,
         runtime: Optional[List[APIRuntime]] = None,
-        **kwargs
+        strict_event_detection: bool = False,
+        generate_operation_ids: bool = False,
+        lazy_spec: bool = False,
+        spec_artifact: Optional[str] = None,
+        **kwargs,
     ):
         super().__init__(app_name, **kwargs)
 
         self.__spec = spec
         self.__generate_default_docs = generate_default_docs
-        self.set_runtime_handler(runtime)
+        self.__generate_operation_ids = generate_operation_ids
+        # Spec built by "chalice-spec export", loaded on first access of the spec
+        self.__spec_artifact = spec_artifact
+        # Documented routes : (docs, path, methods, content_types, func, tags)
+        self._chalice_spec_docs: List[tuple] = []
+        # Routes documented on first access of the spec, in lazy mode
+        self.__pending_docs: Optional[List[tuple]] = None
+        if lazy_spec or spec_artifact is not None:
+            if not isinstance(spec, LazyAPISpec):
+                raise TypeError(
+                    "lazy_spec and spec_artifact need a LazyAPISpec, "
+                    "which adds the recorded routes when it is read"
+                )
+            spec.bind(self.materialize_spec)
+            self.__pending_docs = []
+            self.__lock = threading.Lock()
+        # Documented operation of each route : (path, METHOD) -> Operation
+        self._chalice_spec_operations: Dict[Tuple[str, str], Operation] = {}
+        # Documented operationIds of the routes, generated ones never reuse them
+        self.__documented_operation_ids: Set[str] = set()
+        # operationIds written to the spec : id -> ((path, METHOD), generated)
+        self.__operation_ids: Dict[str, Tuple[Tuple[str, str], bool]] = {}
+        # Bedrock action group of each route : (path, METHOD) -> (group, apiPath)
+        self._chalice_spec_action_groups: Dict[Tuple[str, str], Tuple[str, str]] = {}
+        self.set_runtime_handler(runtime, strict_event_detection)
+
+    def get_route_operation(self, path: str, method: str) -> Optional[Operation]:
+        """
+        Return the documented Operation of a route, or None if it is not documented.
+
+        :param path: route path, e.g. /items/{id}
+        :param method: http method
+        """
+        return self._chalice_spec_operations.get((path, method.upper()))
+
+    def bind_action_group(
+        self,
+        action_group: str,
+        path: str,
+        methods: List[str],
+        api_path: Optional[str] = None,
+    ) -> None:
+        """
+        Bind a route to a Bedrock agent action group.
+
+        Events of the action group are dispatched by (apiPath, httpMethod)
+        among the routes of the group only, so that routes of different groups
+        may share an apiPath.
+
+        :param action_group: name of the action group
+        :param path: route path, e.g. /orders/items/{id}
+        :param methods: http methods of the route
+        :param api_path: apiPath of the route in the action group, default is path
+        """
+        for method in methods:
+            self._chalice_spec_action_groups[(path, method.upper())] = (
+                action_group,
+                api_path or path,
+            )
+
+    def get_action_groups(self) -> List[str]:
+        """
+        Return the names of the action groups that routes are bound to.
+        """
+        return sorted({group for group, _ in self._chalice_spec_action_groups.values()})
+
+    def action_group_spec(self, action_group: str) -> dict:
+        """
+        Return the spec of an action group, to register with the Bedrock agent.
+
+        The spec has the operations of the routes bound to the action group,
+        under their apiPath, and the schemas they reference.
+
+        :param action_group: name of the action group
+        """
+        return select_operations(
+            self.materialize_spec().to_dict(),
+            [
+                (path, method, api_path)
+                for (path, method), (
+                    group,
+                    api_path,
+                ) in self._chalice_spec_action_groups.items()
+                if group == action_group
+            ],
+        )
+
+    def function_definitions(self, action_group: Optional[str] = None) -> dict:
+        """
+        Return the function details of an action group, to register with the Bedrock agent.
+
+        Functions are named by the operationId of their route, the runtime
+        APIRuntime.BedrockAgentFunction dispatches them by this name.
+
+        :param action_group: name of the action group, default is all the routes
+        """
+        operations = None
+        if action_group is not None:
+            operations = [
+                (path, method)
+                for (path, method), (
+                    group,
+                    _,
+                ) in self._chalice_spec_action_groups.items()
+                if group == action_group
+            ]
+        return function_definitions_from_spec(
+            self.materialize_spec().to_dict(), operations
+        )
+
+    def materialize_spec(self, use_artifact: bool = True) -> APISpec:
+        """
+        Add the routes recorded in lazy mode to the spec, and return the spec.
+
+        LazyAPISpec calls it before to_dict() and to_yaml(). Call it before
+        reading spec.components directly, e.g. components.schemas. The spec
+        artifact of the app is loaded instead of generating the schemas,
+        unless it is stale.
+
+        :param use_artifact: load the spec artifact, if the app has one
+        """
+        if self.__pending_docs:
+            with self.__lock:
+                pending = list(self.__pending_docs)
+                if not (use_artifact and self.__load_spec_artifact()):
+                    for args in pending:
+                        self.__document_route(*args)
+                # Cleared once documented : readers see a whole spec
+                del self.__pending_docs[: len(pending)]
+        return self.__spec
+
+    def spec_fingerprint(self) -> str:
+        """
+        Return the fingerprint of the documented routes and their models.
+        """
+        return spec_fingerprint(
+            self._chalice_spec_docs,
+            generate_default_docs=self.__generate_default_docs,
+            generate_operation_ids=self.__generate_operation_ids,
+        )
+
+    def build_spec_artifact(self) -> str:
+        """
+        Build the spec of the app, and return it as an artifact for spec_artifact.
+        """
+        return dump_spec_artifact(
+            self.materialize_spec(use_artifact=False), self.spec_fingerprint()
+        )
+
+    def __load_spec_artifact(self) -> bool:
+        """
+        Load the spec artifact into the spec, once.
+
+        :return: True if the artifact was loaded, False if it is missing or stale
+        """
+        path, self.__spec_artifact = self.__spec_artifact, None
+        if path is None:
+            return False
+        artifact = read_spec_artifact(path)
+        if artifact is None:
+            warnings.warn(
+                f"Spec artifact {path} not found, the spec is generated",
+                StaleSpecArtifactWarning,
+            )
+            return False
+        if artifact["fingerprint"] != self.spec_fingerprint():
+            warnings.warn(
+                f"Spec artifact {path} is stale, the spec is generated. "
+                "Run chalice-spec export again.",
+                StaleSpecArtifactWarning,
+            )
+            return False
+        load_spec_artifact(self.__spec, artifact)
+        return True
 
     def decorate(self, docs, path, methods, content_types, func, tags) -> None:
         if docs is None and self.__generate_default_docs:
             docs = default_docs_for_methods(methods, content_types)
 
         if docs:
-            operations = docs.build_operations(self.__spec, methods, content_types)
-
-            # Infer path parameters
-            get_params = r"{([^}]+)}"
-            path_params = []
-            for param in re.findall(get_params, path):
-                path_params.append(
-                    {
-                        "in": "path",
-                        "name": param,
-                        "schema": {"type": "string"},
-                        "required": True,
-                    }
+            # Checked when declared, schemas may be generated later
+            docs.check_methods(methods)
+            for method in methods:
+                operation = docs.get_operation(method)
+                if operation is not None:
+                    self._chalice_spec_operations[(path, method.upper())] = operation
+                    if operation.operation_id:
+                        self.__documented_operation_ids.add(operation.operation_id)
+
+            self._chalice_spec_docs.append(
+                (docs, path, methods, content_types, func, tags)
+            )
+            if self.__pending_docs is not None:
+                # Lazy mode : schemas are generated on first access of the spec
+                self.__pending_docs.append(
+                    (docs, path, methods, content_types, func, tags)
                 )
+            else:
+                self.__document_route(docs, path, methods, content_types, func, tags)
+
+    def __document_route(self, docs, path, methods, content_types, func, tags) -> None:
+        """
+        Add the operations of a route to the spec.
+        """
+        operations = docs.build_operations(self.__spec, methods, content_types)
+
+        # Generate missing operationIds, the ones of the RPC runtime
+        for operation in operations:
+            self.__assign_operation_id(path, operation, operations[operation])
+
+        # Infer path parameters
+        get_params = r"{([^}]+)}"
+        path_params = []
+        for param in re.findall(get_params, path):
+            path_params.append(
+                {
+                    "in": "path",
+                    "name": param,
+                    "schema": {"type": "string"},
+                    "required": True,
+                }
+            )
 
-            # Infer tags
+        # Infer tags
+        for operation in operations:
+            if (
+                "tags" not in operations[operation]
+                or operations[operation]["tags"] is None
+            ):
+                if tags:
+                    operations[operation]["tags"] = tags
+                else:
+                    operations[operation]["tags"] = [
+                        "/" + path.lstrip("/").split("/", 1)[0]
+                    ]
+
+        # Infer summary and description from route docstrings
+        if func.__doc__:
+            split_docstring = trim_docstring(func.__doc__).split("\n", 1)
             for operation in operations:
                 if (
-                    "tags" not in operations[operation]
-                    or operations[operation]["tags"] is None
+                    "summary" not in operations[operation]
+                    or operations[operation]["summary"] is None
                 ):
-                    if tags:
-                        operations[operation]["tags"] = tags
-                    else:
-                        operations[operation]["tags"] = [
-                            "/" + path.lstrip("/").split("/", 1)[0]
-                        ]
-
-            # Infer summary and description from route docstrings
-            if func.__doc__:
-                split_docstring = trim_docstring(func.__doc__).split("\n", 1)
-                for operation in operations:
-                    if (
-                        "summary" not in operations[operation]
-                        or operations[operation]["summary"] is None
-                    ):
-                        operations[operation]["summary"] = split_docstring[0]
-                    if (
-                        "description" not in operations[operation]
-                        or operations[operation]["description"] is None
-                    ) and len(split_docstring) == 2:
-                        operations[operation]["description"] = split_docstring[
-                            1
-                        ].strip()
-
-            self.__spec.path(
-                path,
-                operations=operations,
-                summary=docs.summary,
-                parameters=path_params,
-            )
+                    operations[operation]["summary"] = split_docstring[0]
+                if (
+                    "description" not in operations[operation]
+                    or operations[operation]["description"] is None
+                ) and len(split_docstring) == 2:
+                    operations[operation]["description"] = split_docstring[1].strip()
+
+        self.__spec.path(
+            path,
+            operations=operations,
+            summary=docs.summary,
+            parameters=path_params,
+        )
+
+    def __assign_operation_id(self, path: str, method: str, operation: dict) -> None:
+        """
+        Generate the missing operationId of an operation, and check it is unique.
+
+        A generated operationId already used by another route is left out of
+        the spec, as OperationIndex leaves it out of the runtime. Two routes
+        with the same documented operationId raise a ValueError.
+        """
+        route = (path, method.upper())
+        generated = "operationId" not in operation
+        if generated:
+            if not self.__generate_operation_ids:
+                return
+            operation_id = default_operation_id(path, method)
+        else:
+            operation_id = operation["operationId"]
+        indexed = self.__operation_ids.get(operation_id)
+        # Documented operationIds of the routes declared so far win
+        shadowed = generated and operation_id in self.__documented_operation_ids
+        if (indexed is None or indexed[0] == route) and not shadowed:
+            self.__operation_ids[operation_id] = (route, generated)
+            if generated:
+                operation["operationId"] = operation_id
+            return
+
+        other = indexed[0] if indexed is not None else None
+        message = (
+            f"operationId {operation_id} of {route[1]} {route[0]} is already used"
+            + (f" by {other[1]} {other[0]}" if other is not None else "")
+            + ", set operation_id on their Operation"
+        )
+        if not generated and not indexed[1]:
+            raise ValueError(message)
+        if generated:
+            message += ", it is left out of the spec"
+        warnings.warn(message)
 
     def register_blueprint(
         self,
         blueprint: Union[Blueprint, BlueprintWithSpec],
         name_prefix: Optional[str] = None,
         url_prefix: Optional[str] = None,
+        action_group: Optional[str] = None,
     ) -> None:
         if isinstance(blueprint, BlueprintWithSpec):
+            # Routes of an action group keep their blueprint path as apiPath
+            for (
+                path,
+                methods,
+                route_action_group,
+            ) in blueprint._chalice_spec_action_groups:
+                group = (
+                    route_action_group
+                    or action_group
+                    or blueprint._chalice_spec_action_group
+                )
+                if group:
+                    self.bind_action_group(
+                        group, (url_prefix if url_prefix else "") + path, methods, path
+                    )
+
             for (
                 path,
                 methods,
@@ -190,10 +489,13 @@ class ChaliceWithSpec(Chalice, APIRuntimeHandler):
     def route(self, path: str, **kwargs: Any) -> Callable[..., Any]:
         def route_decorator(func):
             docs: Docs = kwargs.pop("docs", None)
+            action_group = kwargs.pop("action_group", None)
             methods = [method.lower() for method in kwargs.get("methods", ["get"])]
             content_types = kwargs.get("content_types", None)
 
             self.decorate(docs, path, methods, content_types, func, None)
+            if action_group:
+                self.bind_action_group(action_group, path, methods)
 
             return super(ChaliceWithSpec, self).route(path, **kwargs)(func)
 
@@ -0,0 +1,81 @@
+"""
+chalice-spec command line.
+
+    chalice-spec export app:app -o chalicelib/openapi.json
+    chalice-spec export app:app -o chalicelib/openapi.json --check
+"""
+import argparse
+import importlib
+import os
+import sys
+from typing import List, Optional
+
+from chalice_spec.artifact import read_spec_artifact
+
+
+def load_app(target: str):
+    """
+    Import a ChaliceWithSpec app.
+
+    :param target: module and attribute of the app, e.g. app:app
+    :return: app
+    """
+    module_name, _, attribute = target.partition(":")
+    # Chalice projects import their app module from the project directory
+    if os.getcwd() not in sys.path:
+        sys.path.insert(0, os.getcwd())
+    module = importlib.import_module(module_name)
+    return getattr(module, attribute or "app")
+
+
+def export(target: str, output: str, check: bool = False) -> int:
+    """
+    Build the spec artifact of an app, or check that it is up to date.
+
+    :param target: module and attribute of the app, e.g. app:app
+    :param output: artifact file
+    :param check: only check the fingerprint of the artifact
+    :return: exit status
+    """
+    app = load_app(target)
+    if check:
+        artifact = read_spec_artifact(output)
+        if artifact is None or artifact["fingerprint"] != app.spec_fingerprint():
+            print(f"{output} is stale, run chalice-spec export", file=sys.stderr)
+            return 1
+        print(f"{output} is up to date")
+        return 0
+
+    payload = app.build_spec_artifact()
+    directory = os.path.dirname(output)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(output, "w", encoding="utf-8") as fp:
+        fp.write(payload)
+    print(f"Exported {output} ({len(payload.encode('utf-8'))} bytes)")
+    return 0
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="chalice-spec")
+    commands = parser.add_subparsers(dest="command", required=True)
+    export_parser = commands.add_parser(
+        "export", help="build the spec artifact of an app, loaded with spec_artifact"
+    )
+    export_parser.add_argument(
+        "target", help="module and attribute of the app, e.g. app:app"
+    )
+    export_parser.add_argument(
+        "-o", "--output", default="chalicelib/openapi.json", help="artifact file"
+    )
+    export_parser.add_argument(
+        "--check",
+        action="store_true",
+        help="exit with status 1 if the artifact is stale",
+    )
+    args = parser.parse_args(argv)
+    return export(args.target, args.output, args.check)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,436 @@
+"""
+Compatibility of chalice-spec with pydantic v1 and v2, and python 3.7.
+
+Models, schemas and events go through these helpers, so that pydantic v2
+validates and generates schemas natively with pydantic-core, and pydantic v1
+keeps its own API.
+"""
+import types
+import typing
+from typing import Any, Callable, Dict, Optional, Type
+
+from pydantic import VERSION, BaseModel, ValidationError
+
+PYDANTIC_V2 = VERSION.startswith("2.")
+# Origins of Optional[X], and of X | None since python 3.10
+UNION_TYPES = (typing.Union, getattr(types, "UnionType", typing.Union))
+
+if PYDANTIC_V2:
+    from pydantic import BeforeValidator, RootModel, TypeAdapter, model_validator
+    from typing_extensions import Annotated
+else:
+    from pydantic import root_validator
+    from pydantic.error_wrappers import ErrorWrapper
+    from pydantic.errors import MissingError
+    from pydantic.types import (
+        ConstrainedBytes,
+        ConstrainedDecimal,
+        ConstrainedFloat,
+        ConstrainedInt,
+        ConstrainedList,
+        ConstrainedSet,
+        ConstrainedStr,
+    )
+
+    RootModel = None
+    # Bases of the types of constr, conint... : their constraints are class attributes
+    CONSTRAINED_TYPES = (
+        ConstrainedBytes,
+        ConstrainedDecimal,
+        ConstrainedFloat,
+        ConstrainedInt,
+        ConstrainedList,
+        ConstrainedSet,
+        ConstrainedStr,
+    )
+
+# Template of the references to the definitions of a schema
+DEFINITIONS_REF_TEMPLATE = "#/definitions/{model}"
+# Attribute of the models that caches their fields
+FIELDS_ATTRIBUTE = "__chalice_spec_fields__"
+
+
+class ModelField:
+    """
+    A field of a pydantic model, the same for pydantic v1 and v2.
+    """
+
+    def __init__(
+        self,
+        model: Type[BaseModel],
+        name: str,
+        alias: str,
+        required: bool,
+        default: Any,
+        annotation: Any,
+        type_: Any,
+        title: Optional[str],
+        description: Optional[str],
+        extra: Any,
+        constraints: Any,
+        examples: Any,
+        field: Any,
+    ):
+        self.model = model
+        self.name = name
+        # Key of the field in the raw data
+        self.alias = alias
+        self.required = required
+        self.default = default
+        # Declared type without Optional, e.g. List[Item]
+        self.annotation = annotation
+        # Type of the items, e.g. Item for List[Item] or Optional[Item]
+        self.type_ = type_
+        self.title = title
+        self.description = description
+        # Extra JSON schema of the field
+        self.extra = extra
+        # Constraints of the field, e.g. Field(max_length=5)
+        self.constraints = constraints
+        self.examples = examples
+        # pydantic field
+        self._field = field
+        # pydantic v2 validator of the field, created on first use
+        self._adapter = None
+
+    def get_default(self) -> Any:
+        """
+        default value of the field, a new one for default factories.
+        """
+        if PYDANTIC_V2:
+            return self._field.get_default(call_default_factory=True)
+        return self._field.get_default()
+
+    def validate(self, value: Any) -> Any:
+        """
+        validate a raw value of the field.
+
+        :param value: raw value
+        :return: validated value
+        :raise ValidationError: the value is invalid
+        """
+        if PYDANTIC_V2:
+            if self._adapter is None:
+                self._adapter = _field_adapter(self._field)
+            return self._adapter.validate_python(value)
+        value, errors = self._field.validate(value, {}, loc=self.alias, cls=self.model)
+        if errors:
+            raise ValidationError([errors], self.model)
+        return value
+
+    def missing_error(self) -> ValidationError:
+        """
+        error of a missing required field.
+        """
+        if PYDANTIC_V2:
+            return ValidationError.from_exception_data(
+                self.model.__name__,
+                [{"type": "missing", "loc": (self.alias,), "input": {}}],
+            )
+        return ValidationError(
+            [ErrorWrapper(MissingError(), loc=self.alias)], self.model
+        )
+
+
+def type_arguments(annotation: Any) -> tuple:
+    """
+    arguments of a generic type, e.g. (int,) for List[int].
+
+    typing.get_args is only available since python 3.8.
+    """
+    return getattr(annotation, "__args__", None) or ()
+
+
+def type_origin(annotation: Any) -> Any:
+    """
+    origin of a generic type, e.g. list for List[int], or None.
+
+    typing.get_origin is only available since python 3.8.
+    """
+    return getattr(annotation, "__origin__", None)
+
+
+def type_constraints(annotation: Any) -> Any:
+    """
+    constraints of a type, e.g. of constr(max_length=5), or None.
+
+    :param annotation: type, e.g. Annotated[str, StringConstraints(max_length=5)]
+    :return: metadata of an Annotated type, or class attributes of a pydantic
+        v1 constrained type
+    """
+    metadata = getattr(annotation, "__metadata__", None)
+    if metadata is not None:
+        return list(metadata)
+    if (
+        not PYDANTIC_V2
+        and isinstance(annotation, type)
+        and issubclass(annotation, CONSTRAINED_TYPES)
+    ):
+        return {
+            name: value
+            for name, value in vars(annotation).items()
+            if not name.startswith("_")
+            and not callable(value)
+            and not isinstance(value, (classmethod, staticmethod))
+        }
+    return None
+
+
+def _required_type(annotation: Any) -> Any:
+    """
+    annotation without Optional, as the outer_type_ of pydantic v1 fields.
+    """
+    if typing.get_origin(annotation) in UNION_TYPES:
+        arguments = [a for a in typing.get_args(annotation) if a is not type(None)]
+        if len(arguments) == 1:
+            return arguments[0]
+    return annotation
+
+
+def _item_type(annotation: Any) -> Any:
+    """
+    type of the items of an annotation, as the type_ of pydantic v1 fields.
+    """
+    while True:
+        origin = typing.get_origin(annotation)
+        arguments = [a for a in typing.get_args(annotation) if a is not type(None)]
+        if origin is Annotated:
+            annotation = arguments[0]
+        elif origin in UNION_TYPES and len(arguments) == 1:
+            annotation = arguments[0]
+        elif origin in (list, set, frozenset, tuple) and arguments:
+            annotation = arguments[0]
+        elif origin is dict and len(arguments) == 2:
+            annotation = arguments[1]
+        else:
+            return annotation
+
+
+def model_fields(model: Type[BaseModel]) -> Dict[str, ModelField]:
+    """
+    fields of a model, by name.
+
+    The fields are cached on the model : models created at runtime are not
+    kept alive by a cache.
+
+    :param model: pydantic model
+    :return: fields of the model
+    """
+    fields = model.__dict__.get(FIELDS_ATTRIBUTE)
+    if fields is None:
+        fields = _model_fields(model)
+        setattr(model, FIELDS_ATTRIBUTE, fields)
+    return fields
+
+
+def _model_fields(model: Type[BaseModel]) -> Dict[str, ModelField]:
+    fields = {}
+    if PYDANTIC_V2:
+        for name, info in model.model_fields.items():
+            fields[name] = ModelField(
+                model=model,
+                name=name,
+                alias=info.alias or name,
+                required=info.is_required(),
+                default=info.default,
+                annotation=_required_type(info.annotation),
+                type_=_item_type(info.annotation),
+                title=info.title,
+                description=info.description,
+                extra=info.json_schema_extra,
+                constraints=list(info.metadata),
+                examples=info.examples,
+                field=info,
+            )
+        return fields
+
+    for name, field in model.__fields__.items():
+        info = field.field_info
+        fields[name] = ModelField(
+            model=model,
+            name=name,
+            alias=field.alias,
+            required=bool(field.required),
+            default=field.default,
+            annotation=field.outer_type_,
+            type_=field.type_,
+            title=info.title,
+            description=info.description,
+            extra=info.extra,
+            constraints={
+                name: getattr(info, name)
+                for name in sorted(info.get_constraints() | {"const"})
+                if getattr(info, name) is not None
+            },
+            examples=info.extra.get("examples"),
+            field=field,
+        )
+    return fields
+
+
+def _field_adapter(info: Any) -> Any:
+    if info.metadata:
+        # Constraints of the field, e.g. Field(gt=0)
+        return TypeAdapter(Annotated[(info.annotation, *info.metadata)])
+    return TypeAdapter(info.annotation)
+
+
+def root_field(model: Type[BaseModel]) -> Optional[ModelField]:
+    """
+    field of the root of a custom root model, e.g. a list of items.
+
+    :param model: pydantic model
+    :return: root field, or None for models with fields
+    """
+    if PYDANTIC_V2:
+        if issubclass(model, RootModel):
+            return model_fields(model)["root"]
+        return None
+    if getattr(model, "__custom_root_type__", False):
+        return model_fields(model)["__root__"]
+    return None
+
+
+def root_value(instance: BaseModel) -> Any:
+    """
+    root of a custom root model instance.
+    """
+    return instance.root if PYDANTIC_V2 else instance.__root__
+
+
+def model_schema_extra(model: Type[BaseModel]) -> Any:
+    """
+    extra JSON schema of a model, from its configuration.
+    """
+    if PYDANTIC_V2:
+        return model.model_config.get("json_schema_extra")
+    return getattr(model.__config__, "schema_extra", None)
+
+
+def parse_model(model: Type[BaseModel], data: Any) -> BaseModel:
+    """
+    validate data with a model.
+
+    :param model: pydantic model
+    :param data: raw data, e.g. a lambda event
+    :return: model instance
+    :raise ValidationError: the data is invalid
+    """
+    if PYDANTIC_V2:
+        return model.model_validate(data)
+    return model.parse_obj(data)
+
+
+def model_json(instance: BaseModel) -> str:
+    """
+    serialize a model instance to JSON, by field name.
+    """
+    if PYDANTIC_V2:
+        return instance.model_dump_json()
+    return instance.json()
+
+
+def model_json_schema(
+    model: Type[BaseModel],
+    ref_template: str = DEFINITIONS_REF_TEMPLATE,
+    schema_generator: Optional[type] = None,
+) -> dict:
+    """
+    JSON schema of a model.
+
+    The schemas are the same with both versions : the definitions of the
+    nested models are under "definitions", pydantic v2 names them "$defs",
+    and optional fields are documented by their type, without the null
+    alternative of pydantic v2 that OpenAPI 3.0 does not support.
+
+    :param model: pydantic model
+    :param ref_template: template of the references to nested models
+    :param schema_generator: GenerateJsonSchema class of pydantic v2
+    :return: schema
+    """
+    if not PYDANTIC_V2:
+        return dict(model.schema(ref_template=ref_template))
+    if model is BaseModel:
+        # Schema of any object, as pydantic v1
+        return {"title": "BaseModel", "type": "object", "properties": {}}
+    options = {"schema_generator": schema_generator} if schema_generator else {}
+    schema = model.model_json_schema(ref_template=ref_template, **options)
+    schema = _without_null(schema)
+    if "$defs" in schema:
+        schema["definitions"] = schema.pop("$defs")
+    return schema
+
+
+def _without_null(value: Any) -> Any:
+    """
+    remove the null alternative of the optional fields of a pydantic v2 schema,
+    and move the references with siblings to allOf, as pydantic v1.
+    """
+    if isinstance(value, list):
+        return [_without_null(item) for item in value]
+    if not isinstance(value, dict):
+        return value
+    value = {key: _without_null(item) for key, item in value.items()}
+    alternatives = value.get("anyOf")
+    if isinstance(alternatives, list) and {"type": "null"} in alternatives:
+        alternatives = [item for item in alternatives if item != {"type": "null"}]
+        if value.get("default", 0) is None:
+            del value["default"]
+        del value["anyOf"]
+        if len(alternatives) != 1:
+            value["anyOf"] = alternatives
+        else:
+            value.update(alternatives[0])
+    if "$ref" in value and set(value) - {"$ref", "$defs"}:
+        # A reference with a title or a description : $ref can not have siblings
+        value["allOf"] = [{"$ref": value.pop("$ref")}]
+    return value
+
+
+def empty_string_as(annotation: Any, factory: Callable[[], Any]) -> Any:
+    """
+    Annotation of a field that validates "" as the value of factory.
+
+    pydantic v1 validates "" as an empty dict, pydantic v2 rejects it : test
+    events of API Gateway send "stageVariables": "".
+
+    :param annotation: type of the field
+    :param factory: value of "", e.g. dict
+    :return: annotation of the field
+    """
+    if not PYDANTIC_V2:
+        return annotation
+    return Annotated[
+        annotation, BeforeValidator(lambda value: factory() if value == "" else value)
+    ]
+
+
+def model_check(check: Callable[[type, Dict[str, Any]], None]) -> Any:
+    """
+    Declare a check of a whole model, run after its fields were validated.
+
+    Example:
+        class Event(BaseModel):
+            @model_check
+            def check_message(cls, values):
+                if ...:
+                    raise ValueError("...")
+
+    :param check: function of the model class and the field values, that raises ValueError
+    :return: validator of the model
+    """
+    if PYDANTIC_V2:
+
+        def validate(self):
+            check(type(self), self.__dict__)
+            return self
+
+        validate.__name__ = check.__name__
+        return model_validator(mode="after")(validate)
+
+    def validate_values(cls, values):
+        check(cls, values)
+        return values
+
+    validate_values.__name__ = check.__name__
+    return root_validator(allow_reuse=True, skip_on_failure=True)(validate_values)
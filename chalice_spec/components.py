@@ -0,0 +1,120 @@
+import re
+import threading
+from typing import Dict, Optional
+from weakref import WeakKeyDictionary, ref
+
+from apispec import APISpec
+
+__all__ = ["ComponentRegistry", "long_model_name"]
+
+# Component registry of each spec, see ComponentRegistry.for_spec
+# Weak keys : the registry of a spec is dropped with the spec
+_registries: "WeakKeyDictionary[APISpec, ComponentRegistry]" = WeakKeyDictionary()
+_registries_lock = threading.Lock()
+
+
+def long_model_name(model: type) -> str:
+    """
+    Name of a model with its module, as the long names of pydantic, e.g. orders__Item.
+    """
+    name = f"{model.__module__}__{model.__qualname__}".replace(".", "__")
+    return re.sub(r"[^0-9A-Za-z_.-]", "_", name)
+
+
+class ComponentRegistry:
+    """
+    Schemas of the models of a spec, by model identity.
+
+    Each model is registered once per spec, under a unique component name :
+    its class name, or its module and class name when another model of the
+    spec already has this name. Operations and the schemas of other models
+    reference it by $ref.
+
+    Example:
+        registry = ComponentRegistry.for_spec(spec)
+        name = registry.register(MyModel)
+        operation["responses"][200]["content"]["application/json"]["schema"] = name
+    """
+
+    def __init__(self, spec: APISpec):
+        """
+        constructor.
+
+        :param spec: spec of the components
+        """
+        # Weak : the registry would keep its spec alive in _registries
+        self._spec_ref = ref(spec)
+        self._names: Dict[type, str] = {}
+        self._models: Dict[str, type] = {}
+
+    def name_of(self, model: type) -> Optional[str]:
+        """
+        component name of a model.
+
+        :param model: pydantic model
+        :return: name, or None if the model is not registered
+        """
+        return self._names.get(model)
+
+    def bind(self, model: type, name: str) -> None:
+        """
+        Record the component name of a model, registered to the spec by name.
+
+        :param model: pydantic model
+        :param name: component name
+        """
+        if model not in self._names and name not in self._models:
+            self._names[model] = name
+            self._models[name] = model
+
+    def register(self, model: type, schema: Optional[dict] = None) -> str:
+        """
+        Register the schema of a model, once per spec.
+
+        :param model: pydantic model, or a type of a model, e.g. an enum
+        :param schema: schema of a type that is not a model, generated with its model
+        :return: component name
+        """
+        name = self._names.get(model)
+        if name is None:
+            spec = self._spec
+            name = self._unique_name(model)
+            # Bound before the schema : recursive models reference their name
+            self.bind(model, name)
+            if schema is None:
+                spec.components.schema(name, model=model, spec=spec)
+            else:
+                spec.components.schema(name, schema)
+        return name
+
+    @property
+    def _spec(self) -> APISpec:
+        return self._spec_ref()
+
+    def _unique_name(self, model: type) -> str:
+        schemas = self._spec.components.schemas
+        for name in (model.__name__, long_model_name(model)):
+            if name not in self._models and name not in schemas:
+                return name
+        index = 2
+        while f"{name}_{index}" in self._models or f"{name}_{index}" in schemas:
+            index += 1
+        return f"{name}_{index}"
+
+    @classmethod
+    def for_spec(cls, spec: APISpec) -> "ComponentRegistry":
+        """
+        component registry of a spec.
+
+        The registry is created once, and kept until the spec is collected.
+
+        :param spec: spec
+        :return: component registry
+        """
+        registry = _registries.get(spec)
+        if registry is None:
+            with _registries_lock:
+                registry = _registries.get(spec)
+                if registry is None:
+                    registry = _registries[spec] = cls(spec)
+        return registry
@@ -1,9 +1,12 @@
+import re
 import sys
 from typing import Type, Optional, Union, List, Dict
 
 from apispec import APISpec
 from pydantic import BaseModel
 
+from chalice_spec.components import ComponentRegistry
+
 DEFAULT_DESCRIPTION = "Success"
 DEFAULT_CODE = 200
 
@@ -38,6 +41,8 @@ class Operation:
         response: Optional[Union[Response, Type[BaseModel]]] = None,
         responses: Optional[List[Response]] = None,
         security: Optional[List[Dict[str, List[str]]]] = None,
+        operation_id: Optional[str] = None,
+        max_response_bytes: Optional[int] = None,
     ):
         self.summary = summary
         self.description = description
@@ -47,6 +52,9 @@ class Operation:
         self.content_types = content_types
         self.request = request
         self.security = security
+        self.operation_id = operation_id
+        # Size budget of the responses sent to Bedrock agents
+        self.max_response_bytes = max_response_bytes
 
         if response and responses:
             raise TypeError("You must only pass one of response or responses")
@@ -128,12 +136,11 @@ class Docs:
         cls, method: Operation, spec: APISpec, content_types: List[str] = None
     ):
         operation = {}
+        # Models are registered once per spec, by identity
+        registry = ComponentRegistry.for_spec(spec)
 
         if method.request:
-            if method.request.__name__ not in spec.components.schemas:
-                spec.components.schema(
-                    method.request.__name__, model=method.request, spec=spec
-                )
+            request_schema = registry.register(method.request)
             content_type = (
                 method.content_types[0]
                 if method.content_types
@@ -144,7 +151,7 @@ class Docs:
             operation["requestBody"] = {
                 "content": {
                     content_type: {
-                        "schema": method.request.__name__,
+                        "schema": request_schema,
                     }
                 }
             }
@@ -153,17 +160,12 @@ class Docs:
             responses = {}
 
             for code, response in method.responses.items():
-                if response.model.__name__ not in spec.components.schemas:
-                    spec.components.schema(
-                        response.model.__name__,
-                        model=response.model,
-                        spec=spec,
-                    )
+                response_schema = registry.register(response.model)
                 responses[code] = {
                     "description": response.description,
                     "content": {
                         "application/json": {
-                            "schema": response.model.__name__,
+                            "schema": response_schema,
                         }
                     },
                 }
@@ -180,6 +182,8 @@ class Docs:
             operation["parameters"] = method.parameters
         if method.security:
             operation["security"] = method.security
+        if method.operation_id:
+            operation["operationId"] = method.operation_id
 
         return operation
 
@@ -211,17 +215,46 @@ class Docs:
             spec,
         )
 
+    def get_operation(self, method: str) -> Optional[Operation]:
+        """
+        Return the Operation documented for a method, or None.
+
+        Short-hand Docs and bare models are normalized to an Operation.
+        """
+        if self.request or self.responses or self.response:
+            return Operation(
+                content_types=self.content_types,
+                request=self.request,
+                response=self.response,
+                responses=self.responses or ([] if not self.response else None),
+            )
+
+        documented = getattr(self, method.lower(), None)
+        if documented is None or method.lower() not in self.methods:
+            return None
+        if isinstance(documented, Operation):
+            return documented
+        return Operation(response=documented)
+
+    def check_methods(self, methods: List[str]) -> None:
+        """
+        Check that the Docs can document a route with these methods.
+
+        :param methods: http methods of the route
+        :raise TypeError: short-hand Docs of a route with many methods
+        """
+        if (self.request or self.responses or self.response) and len(methods) != 1:
+            raise TypeError(
+                "You can only use Docs short-hand for single-method API routes."
+            )
+
     def build_operations(
         self, spec: APISpec, methods: List[str], content_types: List[str] = None
     ):
         operations = {}
+        self.check_methods(methods)
 
         if self.request or self.responses or self.response:
-            if len(methods) != 1:
-                raise TypeError(
-                    "You can only use Docs short-hand for single-method API routes."
-                )
-
             operations[methods[0].lower()] = self._build_simple_operation(
                 spec, content_types
             )
@@ -240,6 +273,15 @@ Resp = Response
 Op = Operation
 
 
+def default_operation_id(path: str, method: str) -> str:
+    """
+    Generate a deterministic operationId from a route, e.g.
+    GET /users/{user_id} -> get_users_user_id
+    """
+    words = re.findall(r"[0-9A-Za-z]+", path)
+    return "_".join([method.lower()] + words)
+
+
 # From: https://peps.python.org/pep-0257/#handling-docstring-indentation
 def trim_docstring(docstring):
     if not docstring:
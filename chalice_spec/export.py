@@ -0,0 +1,469 @@
+import copy
+import json
+from typing import Any, Dict, Iterable, Optional, Set, Union
+
+from apispec import APISpec
+from pydantic import BaseModel
+
+from chalice_spec.docs import default_operation_id
+
+# Prefix of references to the schemas of the spec
+SCHEMA_REF_PREFIX = "#/components/schemas/"
+# Keys of the operations of a path item
+HTTP_METHODS = frozenset(
+    ["get", "put", "post", "delete", "options", "head", "patch", "trace"]
+)
+
+
+def _collect_schema_refs(value: Any, refs: Set[str]) -> None:
+    if isinstance(value, dict):
+        ref = value.get("$ref")
+        if isinstance(ref, str) and ref.startswith(SCHEMA_REF_PREFIX):
+            refs.add(ref[len(SCHEMA_REF_PREFIX) :])
+        for item in value.values():
+            _collect_schema_refs(item, refs)
+    elif isinstance(value, list):
+        for item in value:
+            _collect_schema_refs(item, refs)
+
+
+def prune_components(spec: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Remove the schemas that the paths of the spec do not reference.
+
+    References are followed through the schemas, so nested models are kept.
+
+    :param spec: spec dict, updated in place
+    :return: spec dict
+    """
+    schemas = spec.get("components", {}).get("schemas")
+    if not schemas:
+        return spec
+    referenced: Set[str] = set()
+    _collect_schema_refs(spec.get("paths", {}), referenced)
+    pending = list(referenced)
+    while pending:
+        found: Set[str] = set()
+        _collect_schema_refs(schemas.get(pending.pop(), {}), found)
+        for name in found - referenced:
+            referenced.add(name)
+            pending.append(name)
+    spec["components"]["schemas"] = {
+        name: schema for name, schema in schemas.items() if name in referenced
+    }
+    return spec
+
+
+def select_operations(
+    spec: Dict[str, Any], operations: Iterable[tuple]
+) -> Dict[str, Any]:
+    """
+    Build a spec with some operations of a spec only.
+
+    :param spec: spec dict
+    :param operations: (path, method, exported path) of the operations to keep
+    :return: new spec dict, with the schemas referenced by the operations
+    """
+    selected = {key: value for key, value in spec.items() if key != "paths"}
+    selected = copy.deepcopy(selected)
+    paths: Dict[str, Dict[str, Any]] = {}
+    for path, method, exported_path in operations:
+        path_item = spec.get("paths", {}).get(path, {})
+        operation = path_item.get(method.lower())
+        if operation is None:
+            continue
+        exported = paths.setdefault(exported_path, {})
+        for key, value in path_item.items():
+            # Path level fields, e.g. parameters, summary
+            if key not in HTTP_METHODS:
+                exported.setdefault(key, copy.deepcopy(value))
+        exported[method.lower()] = copy.deepcopy(operation)
+    selected["paths"] = paths
+    return prune_components(selected)
+
+
+# Keys of a schema whose values are schemas
+_SCHEMA_KEYS = ("items", "additionalProperties", "not")
+# Keys of a schema whose values are lists of schemas
+_SCHEMA_LIST_KEYS = ("allOf", "anyOf", "oneOf")
+
+
+class _Minifier:
+    def __init__(self, strip_examples: bool, max_description_length: Optional[int]):
+        self.strip_examples = strip_examples
+        self.max_description_length = max_description_length
+
+    def description(self, value: Any) -> Any:
+        limit = self.max_description_length
+        if not isinstance(value, str) or limit is None or len(value) <= limit:
+            return value
+        # Cut on a word boundary
+        cut = value[:limit].rsplit(" ", 1)[0].rstrip(" ,;:")
+        return (cut or value[:limit]) + "..."
+
+    def node(self, value: Any) -> Any:
+        """
+        minify a node of the spec that is not a schema.
+        """
+        if isinstance(value, list):
+            return [self.node(item) for item in value]
+        if not isinstance(value, dict):
+            return value
+        result = {}
+        for key, item in value.items():
+            if self.strip_examples and key in ("example", "examples"):
+                continue
+            if key == "description":
+                result[key] = self.description(item)
+            elif key == "schema":
+                result[key] = self.schema(item)
+            else:
+                result[key] = self.node(item)
+        return result
+
+    def schema(self, value: Any) -> Any:
+        """
+        minify a schema : titles are removed, and single allOf unwrapped.
+        """
+        if not isinstance(value, dict):
+            return value
+        result = {}
+        for key, item in value.items():
+            if key == "title" or (
+                self.strip_examples and key in ("example", "examples")
+            ):
+                continue
+            if key == "description":
+                result[key] = self.description(item)
+            elif key == "properties" and isinstance(item, dict):
+                result[key] = {name: self.schema(prop) for name, prop in item.items()}
+            elif key in _SCHEMA_KEYS:
+                result[key] = self.schema(item)
+            elif key in _SCHEMA_LIST_KEYS and isinstance(item, list):
+                result[key] = [self.schema(prop) for prop in item]
+            else:
+                result[key] = item
+        return _collapse_all_of(result)
+
+
+def _collapse_all_of(schema: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    unwrap {"allOf": [schema]}, the wrapper pydantic emits for nested models.
+    """
+    all_of = schema.get("allOf")
+    if not isinstance(all_of, list) or len(all_of) != 1:
+        return schema
+    inner = all_of[0]
+    siblings = {key: value for key, value in schema.items() if key != "allOf"}
+    if not siblings:
+        return inner
+    # $ref can not have siblings in OpenAPI 3.0
+    if "$ref" in inner or set(siblings) & set(inner):
+        return schema
+    merged = dict(inner)
+    merged.update(siblings)
+    return merged
+
+
+def _count_schema_refs(value: Any, counts: Dict[str, int]) -> None:
+    if isinstance(value, dict):
+        ref = value.get("$ref")
+        if isinstance(ref, str) and ref.startswith(SCHEMA_REF_PREFIX):
+            name = ref[len(SCHEMA_REF_PREFIX) :]
+            counts[name] = counts.get(name, 0) + 1
+        for item in value.values():
+            _count_schema_refs(item, counts)
+    elif isinstance(value, list):
+        for item in value:
+            _count_schema_refs(item, counts)
+
+
+def _is_recursive(name: str, schemas: Dict[str, Any]) -> bool:
+    seen: Set[str] = set()
+    pending = [name]
+    while pending:
+        refs: Set[str] = set()
+        _collect_schema_refs(schemas.get(pending.pop(), {}), refs)
+        if name in refs:
+            return True
+        pending.extend(refs - seen)
+        seen |= refs
+    return False
+
+
+def _replace_refs(value: Any, inlined: Dict[str, Any]) -> Any:
+    if isinstance(value, list):
+        return [_replace_refs(item, inlined) for item in value]
+    if not isinstance(value, dict):
+        return value
+    ref = value.get("$ref")
+    if isinstance(ref, str) and ref[len(SCHEMA_REF_PREFIX) :] in inlined:
+        return _replace_refs(inlined[ref[len(SCHEMA_REF_PREFIX) :]], inlined)
+    return {key: _replace_refs(item, inlined) for key, item in value.items()}
+
+
+def inline_single_use_components(spec: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Replace the references to schemas that are referenced once by the schema.
+
+    Recursive schemas are kept as components.
+
+    :param spec: spec dict, updated in place
+    :return: spec dict
+    """
+    schemas = spec.get("components", {}).get("schemas")
+    if not schemas:
+        return spec
+    counts: Dict[str, int] = {}
+    _count_schema_refs(spec, counts)
+    inlined = {
+        name: schema
+        for name, schema in schemas.items()
+        if counts.get(name) == 1 and not _is_recursive(name, schemas)
+    }
+    if not inlined:
+        return spec
+    spec["paths"] = _replace_refs(spec.get("paths", {}), inlined)
+    spec["components"]["schemas"] = {
+        name: _replace_refs(schema, inlined)
+        for name, schema in schemas.items()
+        if name not in inlined
+    }
+    if not spec["components"]["schemas"]:
+        del spec["components"]["schemas"]
+    if not spec["components"]:
+        del spec["components"]
+    return spec
+
+
+def minify_spec(
+    spec: Union[APISpec, Dict[str, Any]],
+    strip_examples: bool = False,
+    max_description_length: Optional[int] = None,
+    inline_components: bool = True,
+) -> Dict[str, Any]:
+    """
+    Minify a spec for Bedrock agents, whose prompt includes the schema.
+
+    Unused schemas are pruned, schema titles (generated by pydantic from the
+    names) are removed and single allOf wrappers are unwrapped. The paths,
+    parameters, types and required fields are kept as-is.
+
+    :param spec: APISpec, or spec dict
+    :param strip_examples: remove examples
+    :param max_description_length: truncate longer descriptions
+    :param inline_components: inline the schemas referenced only once
+    :return: minified spec dict
+    """
+    if isinstance(spec, APISpec):
+        spec = spec.to_dict()
+    minifier = _Minifier(strip_examples, max_description_length)
+    minified = {}
+    for key, value in spec.items():
+        if key == "components":
+            minified[key] = {
+                name: (
+                    {
+                        schema_name: minifier.schema(schema)
+                        for schema_name, schema in item.items()
+                    }
+                    if name == "schemas"
+                    else copy.deepcopy(item)
+                )
+                for name, item in value.items()
+            }
+        elif key == "paths":
+            minified[key] = minifier.node(value)
+        else:
+            minified[key] = copy.deepcopy(value)
+    prune_components(minified)
+    if inline_components:
+        inline_single_use_components(minified)
+    return minified
+
+
+def dumps_spec(spec: Dict[str, Any]) -> str:
+    """
+    Serialize a spec to compact JSON.
+    """
+    return json.dumps(spec, separators=(",", ":"), ensure_ascii=False)
+
+
+# Default budget of the schema of an action group. Set them to the quotas of
+# your account, see "Quotas for Amazon Bedrock" in the AWS documentation.
+DEFAULT_MAX_SCHEMA_BYTES = 100 * 1024
+DEFAULT_MAX_OPERATIONS = 11
+# Rough number of bytes of JSON per prompt token
+BYTES_PER_TOKEN = 4
+
+
+class SpecSizeReport(BaseModel):
+    """
+    Size of an exported spec, against the budget of a Bedrock action group.
+    """
+
+    # Size of the spec as apispec builds it, compact JSON
+    original_bytes: int
+    # Size of the exported spec, compact JSON
+    exported_bytes: int
+    # Number of operations
+    operations: int
+    max_bytes: int = DEFAULT_MAX_SCHEMA_BYTES
+    max_operations: int = DEFAULT_MAX_OPERATIONS
+
+    @property
+    def estimated_tokens(self) -> int:
+        return self.exported_bytes // BYTES_PER_TOKEN
+
+    @property
+    def within_limits(self) -> bool:
+        return (
+            self.exported_bytes <= self.max_bytes
+            and self.operations <= self.max_operations
+        )
+
+    def __str__(self) -> str:
+        saved = self.original_bytes - self.exported_bytes
+        return (
+            f"{self.exported_bytes} / {self.max_bytes} bytes "
+            f"(~{self.estimated_tokens} tokens, {saved} bytes saved), "
+            f"{self.operations} / {self.max_operations} operations"
+            + ("" if self.within_limits else " : OVER LIMITS")
+        )
+
+
+def spec_size_report(
+    original: Union[APISpec, Dict[str, Any]],
+    exported: Dict[str, Any],
+    max_bytes: int = DEFAULT_MAX_SCHEMA_BYTES,
+    max_operations: int = DEFAULT_MAX_OPERATIONS,
+) -> SpecSizeReport:
+    """
+    Report the size of an exported spec against the budget of an action group.
+
+    :param original: spec before export
+    :param exported: exported spec
+    :param max_bytes: budget of the schema, compact JSON bytes
+    :param max_operations: budget of operations
+    :return: size report
+    """
+    if isinstance(original, APISpec):
+        original = original.to_dict()
+    return SpecSizeReport(
+        original_bytes=len(dumps_spec(original).encode("utf-8")),
+        exported_bytes=len(dumps_spec(exported).encode("utf-8")),
+        operations=sum(
+            1
+            for path_item in exported.get("paths", {}).values()
+            for key in path_item
+            if key in HTTP_METHODS
+        ),
+        max_bytes=max_bytes,
+        max_operations=max_operations,
+    )
+
+
+# Types of the parameters of Bedrock agent functions
+FUNCTION_PARAMETER_TYPES = frozenset(
+    ["string", "number", "integer", "boolean", "array"]
+)
+
+
+def _resolve_schema(schema: Any, schemas: Dict[str, Any]) -> Dict[str, Any]:
+    seen: Set[str] = set()
+    while isinstance(schema, dict):
+        ref = schema.get("$ref")
+        if isinstance(ref, str) and ref.startswith(SCHEMA_REF_PREFIX):
+            name = ref[len(SCHEMA_REF_PREFIX) :]
+            if name in seen:
+                break
+            seen.add(name)
+            schema = schemas.get(name, {})
+        elif isinstance(schema.get("allOf"), list) and len(schema["allOf"]) == 1:
+            schema = schema["allOf"][0]
+        else:
+            return schema
+    return schema if isinstance(schema, dict) else {}
+
+
+def _function_parameter(
+    schema: Any, description: Optional[str], required: bool, schemas: Dict[str, Any]
+) -> Dict[str, Any]:
+    resolved = _resolve_schema(schema, schemas)
+    schema_type = resolved.get("type")
+    # Objects and untyped schemas are sent as JSON strings
+    if schema_type not in FUNCTION_PARAMETER_TYPES:
+        schema_type = "string"
+    parameter = {"type": schema_type, "required": required}
+    description = description or resolved.get("description") or resolved.get("title")
+    if description:
+        parameter["description"] = description
+    return parameter
+
+
+def function_definitions_from_spec(
+    spec: Union[APISpec, Dict[str, Any]],
+    operations: Optional[Iterable[tuple]] = None,
+    content_type: str = "application/json",
+) -> Dict[str, Any]:
+    """
+    Build the function details of a Bedrock action group from a spec.
+
+    Each operation is a function, named by its operationId (or the generated
+    operationId). Its parameters are the path, query and header parameters
+    and the properties of the JSON request body.
+
+    :param spec: APISpec, or spec dict
+    :param operations: (path, method) of the operations, default is all
+    :param content_type: content type of the request body
+    :return: {"functions": [...]}, the functionSchema of the action group
+    """
+    if isinstance(spec, APISpec):
+        spec = spec.to_dict()
+    schemas = spec.get("components", {}).get("schemas", {})
+    paths = spec.get("paths", {})
+    if operations is None:
+        operations = [
+            (path, method)
+            for path, path_item in paths.items()
+            for method in path_item
+            if method in HTTP_METHODS
+        ]
+    functions = []
+    for path, method in operations:
+        path_item = paths.get(path, {})
+        operation = path_item.get(method.lower())
+        if operation is None:
+            continue
+        parameters: Dict[str, Dict[str, Any]] = {}
+        for parameter in list(path_item.get("parameters", [])) + list(
+            operation.get("parameters", [])
+        ):
+            if parameter.get("in") not in ("path", "query", "header"):
+                continue
+            parameters[parameter["name"]] = _function_parameter(
+                parameter.get("schema", {}),
+                parameter.get("description"),
+                parameter.get("in") == "path" or bool(parameter.get("required")),
+                schemas,
+            )
+        content = operation.get("requestBody", {}).get("content", {})
+        body = _resolve_schema(content.get(content_type, {}).get("schema"), schemas)
+        required = set(body.get("required", []))
+        for name, schema in body.get("properties", {}).items():
+            parameters.setdefault(
+                name, _function_parameter(schema, None, name in required, schemas)
+            )
+        function: Dict[str, Any] = {
+            "name": operation.get("operationId") or default_operation_id(path, method)
+        }
+        description = " ".join(
+            text
+            for text in (operation.get("summary"), operation.get("description"))
+            if text
+        )
+        if description:
+            function["description"] = description
+        function["parameters"] = parameters
+        functions.append(function)
+    return {"functions": functions}
@@ -1,9 +1,291 @@
-from typing import Any, Union
+import enum
+import threading
+from typing import Any, Dict, Optional, Set, Tuple, Union
+from weakref import WeakKeyDictionary
 
 from apispec import BasePlugin, APISpec
-from apispec.exceptions import DuplicateComponentNameError
 from pydantic import BaseModel
 
+from chalice_spec.compat import (
+    PYDANTIC_V2,
+    model_fields,
+    model_json_schema,
+    type_arguments,
+)
+from chalice_spec.components import ComponentRegistry
+
+if PYDANTIC_V2:
+    from pydantic.json_schema import GenerateJsonSchema
+else:
+    from pydantic.schema import (
+        get_flat_models_from_model,
+        get_model_name_map,
+        model_process_schema,
+    )
+
+# Template of the references to the schemas of the spec
+REF_TEMPLATE = "#/components/schemas/{model}"
+REF_PREFIX = REF_TEMPLATE.partition("{model}")[0]
+
+# Generated schemas : model -> {ref_template: (schema, definitions, types)}
+# types are the models, or enums, of the definitions by name
+# Weak keys : models created at runtime are not kept alive by the cache
+_schema_cache: "WeakKeyDictionary[type, Dict[str, GeneratedSchema]]" = (
+    WeakKeyDictionary()
+)
+_schema_cache_lock = threading.Lock()
+
+GeneratedSchema = Tuple[dict, dict, Dict[str, type]]
+
+# Key of the placeholder of a cached nested model, in pydantic v2 schemas
+_CACHED_MODEL_KEY = "x-chalice-spec-cached-model"
+
+
+def _cached_schema(model: type, ref_template: str) -> Optional[GeneratedSchema]:
+    schemas = _schema_cache.get(model)
+    return schemas.get(ref_template) if schemas is not None else None
+
+
+def _ref_names(value: Any, prefix: str, suffix: str, names: list) -> None:
+    if isinstance(value, dict):
+        ref = value.get("$ref")
+        if isinstance(ref, str) and ref.startswith(prefix) and ref.endswith(suffix):
+            names.append(ref[len(prefix) : len(ref) - len(suffix)])
+        for item in value.values():
+            _ref_names(item, prefix, suffix, names)
+    elif isinstance(value, list):
+        for item in value:
+            _ref_names(item, prefix, suffix, names)
+
+
+def _referenced_definitions(
+    schema: dict, definitions: dict, ref_template: str
+) -> Dict[str, dict]:
+    """
+    definitions referenced by a schema, directly or through other definitions.
+    """
+    prefix, _, suffix = ref_template.partition("{model}")
+    referenced: Dict[str, dict] = {}
+    pending = [schema]
+    while pending:
+        names: list = []
+        _ref_names(pending.pop(), prefix, suffix, names)
+        for name in names:
+            if name not in referenced and name in definitions:
+                referenced[name] = definitions[name]
+                pending.append(definitions[name])
+    return referenced
+
+
+def _generate_schema(model: type, ref_template: str) -> GeneratedSchema:
+    """
+    Generate the JSON schema of a model.
+
+    With pydantic v1, the schemas of the nested models that are already
+    cached are reused, and the schemas of the other nested models are cached
+    on the way. pydantic v2 generates the whole schema with pydantic-core.
+    """
+    if PYDANTIC_V2:
+        return _generate_schema_v2(model, ref_template, set())
+
+    flat_models = get_flat_models_from_model(model)
+    model_name_map = get_model_name_map(flat_models)
+    types = {name: nested for nested, name in model_name_map.items()}
+    if any(name != nested.__name__ for nested, name in model_name_map.items()):
+        # Conflicting names : the long names depend on the whole graph
+        schema = model_json_schema(model, ref_template)
+        definitions = schema.pop("definitions", {})
+        return schema, definitions, _types_of(definitions, types)
+
+    known = [
+        nested
+        for nested in flat_models
+        if nested is not model and _cached_schema(nested, ref_template) is not None
+    ]
+    # Known models are referenced, their schemas are not generated again
+    schema, definitions, nested_names = model_process_schema(
+        model,
+        model_name_map=model_name_map,
+        ref_template=ref_template,
+        known_models=set(known),
+    )
+    for nested in known:
+        nested_schema, nested_definitions, _ = _cached_schema(nested, ref_template)
+        for name, definition in nested_definitions.items():
+            definitions.setdefault(name, definition)
+        if "$ref" not in nested_schema:
+            definitions.setdefault(model_name_map[nested], nested_schema)
+
+    # Cache the nested models generated with the model
+    for nested in flat_models:
+        name = model_name_map[nested]
+        if (
+            nested is model
+            or nested in known
+            or name not in definitions
+            or not issubclass(nested, BaseModel)
+        ):
+            continue
+        nested_schema = definitions[name]
+        nested_definitions = _referenced_definitions(
+            nested_schema, definitions, ref_template
+        )
+        if name in nested_definitions:
+            # Recursive model, as in model.schema()
+            nested_schema = {"$ref": ref_template.format(model=name)}
+        _cache_schema(
+            nested,
+            ref_template,
+            (nested_schema, nested_definitions, _types_of(nested_definitions, types)),
+        )
+
+    name = model_name_map[model]
+    if name in nested_names:
+        # Recursive model, as in model.schema()
+        definitions[name] = schema
+        schema = {"$ref": ref_template.format(model=name)}
+    return schema, definitions, _types_of(definitions, types)
+
+
+def _types_of(definitions: dict, types: Dict[str, type]) -> Dict[str, type]:
+    return {name: types[name] for name in definitions if name in types}
+
+
+def _nested_types(annotation: Any, types: Set[type]) -> None:
+    if isinstance(annotation, type) and issubclass(annotation, (BaseModel, enum.Enum)):
+        types.add(annotation)
+    for argument in type_arguments(annotation):
+        _nested_types(argument, types)
+
+
+def _generate_schema_v2(
+    model: type, ref_template: str, generating: Set[type]
+) -> GeneratedSchema:
+    """
+    Generate the JSON schema of a model with pydantic v2.
+
+    The nested models are generated and cached first, then the model is
+    generated with a placeholder for each cached nested model, replaced by
+    its cached schema : pydantic v2 generates JSON schemas in python, and
+    does not share them between models.
+    """
+    generating = generating | {model}
+    nested: Set[type] = {model}
+    for field in model_fields(model).values():
+        _nested_types(field.annotation, nested)
+    # Types generated with the model, e.g. enums, by name when it is unique
+    names = [nested_type.__name__ for nested_type in nested]
+    types = {
+        nested_type.__name__: nested_type
+        for nested_type in nested
+        if names.count(nested_type.__name__) == 1
+    }
+    for nested_model in nested - generating:
+        if not issubclass(nested_model, BaseModel):
+            continue
+        if _cached_schema(nested_model, ref_template) is None:
+            _cache_schema(
+                nested_model,
+                ref_template,
+                _generate_schema_v2(nested_model, ref_template, generating),
+            )
+
+    placeholders: Dict[str, type] = {}
+
+    class CachedModelsJsonSchema(GenerateJsonSchema):
+        def model_schema(self, schema):
+            cls = schema["cls"]
+            if cls is not model and _cached_schema(cls, ref_template) is not None:
+                key = f"{cls.__module__}.{cls.__qualname__}.{id(cls)}"
+                placeholders[key] = cls
+                return {_CACHED_MODEL_KEY: key}
+            return super().model_schema(schema)
+
+    schema = model_json_schema(model, ref_template, CachedModelsJsonSchema)
+    definitions = schema.pop("definitions", {})
+    generated_types = _types_of(definitions, types)
+    for name, definition in list(definitions.items()):
+        key = definition.get(_CACHED_MODEL_KEY)
+        if key is None:
+            continue
+        nested_model = placeholders[key]
+        nested_schema, nested_definitions, nested_types = _cached_schema(
+            nested_model, ref_template
+        )
+        if "$ref" in nested_schema:
+            # Recursive model : its schema is in its definitions
+            if nested_schema["$ref"] != ref_template.format(model=name):
+                return _generate_uncached(model, ref_template, types)
+            del definitions[name]
+        else:
+            definitions[name] = nested_schema
+        generated_types[name] = nested_model
+        for nested_name, nested_definition in nested_definitions.items():
+            known = definitions.setdefault(nested_name, nested_definition)
+            known_type = generated_types.setdefault(
+                nested_name, nested_types.get(nested_name)
+            )
+            if (
+                known is not nested_definition and known != nested_definition
+            ) or known_type is not nested_types.get(nested_name):
+                # Conflicting names between the models
+                return _generate_uncached(model, ref_template, types)
+    generated_types = {n: t for n, t in generated_types.items() if t is not None}
+    return schema, definitions, generated_types
+
+
+def _generate_uncached(
+    model: type, ref_template: str, types: Dict[str, type]
+) -> GeneratedSchema:
+    schema = model_json_schema(model, ref_template)
+    definitions = schema.pop("definitions", {})
+    return schema, definitions, _types_of(definitions, types)
+
+
+def _rename_refs(value: Any, names: Dict[str, str]) -> Any:
+    """
+    replace the references to definitions by the references to their components.
+    """
+    if isinstance(value, list):
+        return [_rename_refs(item, names) for item in value]
+    if not isinstance(value, dict):
+        return value
+    value = {key: _rename_refs(item, names) for key, item in value.items()}
+    ref = value.get("$ref")
+    if isinstance(ref, str) and ref.startswith(REF_PREFIX):
+        name = names.get(ref[len(REF_PREFIX) :])
+        if name is not None:
+            value["$ref"] = REF_PREFIX + name
+    return value
+
+
+def _cache_schema(model: type, ref_template: str, schema: GeneratedSchema) -> None:
+    with _schema_cache_lock:
+        _schema_cache.setdefault(model, {})[ref_template] = schema
+
+
+def model_schema(model: type, ref_template: str = REF_TEMPLATE) -> Tuple[dict, dict]:
+    """
+    Generate the JSON schema of a model, once per process.
+
+    The schema of each nested model is generated once too, and shared by
+    the models that reference it.
+
+    :param model: pydantic model
+    :param ref_template: template of the references to nested models
+    :return: schema without its definitions, definitions of the nested models
+    """
+    schema, definitions, _ = _model_schema(model, ref_template)
+    return schema, definitions
+
+
+def _model_schema(model: type, ref_template: str) -> GeneratedSchema:
+    cached = _cached_schema(model, ref_template)
+    if cached is None:
+        cached = _generate_schema(model, ref_template)
+        _cache_schema(model, ref_template, cached)
+    return cached
+
 
 class PydanticPlugin(BasePlugin):
     """
@@ -23,25 +305,49 @@ class PydanticPlugin(BasePlugin):
         spec.components.schema("MyModel", model=MyModel)
     """
 
+    def __init__(self):
+        super().__init__()
+        self._spec: Optional[APISpec] = None
+
+    def init_spec(self, spec: APISpec) -> None:
+        super().init_spec(spec)
+        self._spec = spec
+
     def schema_helper(
         self, name: str, definition: dict, **kwargs: Any
     ) -> Union[dict, None]:
         model: Union[BaseModel, None] = kwargs.pop("model", None)
         if model:
-            schema = model.schema(ref_template="#/components/schemas/{model}")
-
+            schema, definitions, types = _model_schema(model, REF_TEMPLATE)
             # If the spec has passed, we probably have nested models to contend with.
             spec: Union[APISpec, None] = kwargs.pop("spec", None)
-            if spec and "definitions" in schema:
-                for k, v in schema["definitions"].items():
-                    try:
-                        spec.components.schema(k, v)
-                    except DuplicateComponentNameError:
-                        pass
+            if spec is None:
+                if self._spec is not None:
+                    # Registered by name : the operations reference it by this name
+                    ComponentRegistry.for_spec(self._spec).bind(model, name)
+                return dict(schema)
 
-            if "definitions" in schema:
-                del schema["definitions"]
+            registry = ComponentRegistry.for_spec(spec)
+            registry.bind(model, name)
+            names = {}
+            for key, nested_schema in definitions.items():
+                nested = types.get(key)
+                if nested is model:
+                    # Recursive model : the component is the schema of its definition
+                    schema = nested_schema
+                    names[key] = name
+                elif nested is not None:
+                    # Registered once per spec, under a unique name
+                    is_model = issubclass(nested, BaseModel)
+                    names[key] = registry.register(
+                        nested, None if is_model else nested_schema
+                    )
+                elif key not in spec.components.schemas:
+                    spec.components.schema(key, nested_schema)
 
-            return schema
+            renamed = {key: value for key, value in names.items() if key != value}
+            if renamed:
+                schema = _rename_refs(schema, renamed)
+            return dict(schema)
 
         return None
@@ -1,12 +1,13 @@
-from chalice.app import Chalice
-from chalice_spec.runtime.converter.bedrock_agent_event_to_apigw import (
-    BedrockAgentEventToApiGateway,
+from chalice_spec.runtime.converter import ConversionContext
+from chalice_spec.runtime.registry import (
+    RuntimeDefinition,
+    register_runtime,
+    runtime_registry,
 )
+from chalice_spec.runtime.rest_api_handler import InProcessRestAPIEventHandler
 from enum import Enum
-from typing import List, Optional
-
-from chalice_spec.runtime.model_utility.apigw import is_api_gateway_event
-from chalice_spec.runtime.model_utility.bedrock_agent import is_bedrock_agent_event
+import threading
+from typing import Any, List, Optional, Union
 
 
 class APIRuntime(Enum):
@@ -16,6 +17,12 @@ class APIRuntime(Enum):
 
     APIGateway = "api-gateway"
     BedrockAgent = "bedrock-agent"
+    BedrockAgentFunction = "bedrock-agent-function"
+    HttpApi = "http-api"
+    ApplicationLoadBalancer = "alb"
+    Batch = "batch"
+    AppSyncBatch = "appsync-batch"
+    Rpc = "rpc"
 
 
 """
@@ -26,23 +33,204 @@ Runtime Constants
 APIRuntimeApiGateway = [APIRuntime.APIGateway]
 # Allow to call from Bedrock Agent
 APIRuntimeBedrockAgent = [APIRuntime.BedrockAgent]
+# Allow to call from Bedrock Agent action groups defined with function details
+APIRuntimeBedrockAgentFunction = [APIRuntime.BedrockAgentFunction]
+# Allow to call from Bedrock Agent action groups of either style
+APIRuntimeBedrockAgentAll = [APIRuntime.BedrockAgent, APIRuntime.BedrockAgentFunction]
+# Allow to call from API Gateway HTTP API (payload v2.0) or Lambda Function URL
+APIRuntimeHttpApi = [APIRuntime.HttpApi]
+# Allow to call from Application Load Balancer
+APIRuntimeApplicationLoadBalancer = [APIRuntime.ApplicationLoadBalancer]
+# Allow to call from SQS, Kinesis or DynamoDB Streams batches
+APIRuntimeBatch = [APIRuntime.Batch]
+# Allow to call from AppSync batch resolvers (BatchInvoke)
+APIRuntimeAppSyncBatch = [APIRuntime.AppSyncBatch]
+# Allow to invoke operations directly : {operationId, params, body}
+APIRuntimeRpc = [APIRuntime.Rpc]
 # Allow to call from API Gateway or Bedrock Agent or run local
 APIRuntimeAll = [APIRuntime.APIGateway, APIRuntime.BedrockAgent]
 
 
+# Runtime : APIRuntime member, or name of a registered runtime
+Runtime = Union[APIRuntime, str]
+
+"""
+Built-in runtimes
+Converters are imported the first time a matching event arrives.
+"""
+
+register_runtime(
+    APIRuntime.APIGateway.value,
+    detector="chalice_spec.runtime.model_utility.apigw:is_api_gateway_event",
+)
+register_runtime(
+    APIRuntime.BedrockAgent.value,
+    detector="chalice_spec.runtime.model_utility.bedrock_agent:is_bedrock_agent_event",
+    converter=(
+        "chalice_spec.runtime.converter.bedrock_agent_event_to_apigw"
+        ":BedrockAgentEventToApiGateway"
+    ),
+)
+register_runtime(
+    APIRuntime.BedrockAgentFunction.value,
+    detector=(
+        "chalice_spec.runtime.model_utility.bedrock_agent"
+        ":is_bedrock_agent_function_event"
+    ),
+    converter=(
+        "chalice_spec.runtime.converter.bedrock_agent_function_event_to_apigw"
+        ":BedrockAgentFunctionEventToApiGateway"
+    ),
+)
+register_runtime(
+    APIRuntime.HttpApi.value,
+    detector="chalice_spec.runtime.model_utility.http_api:is_http_api_event",
+    converter=(
+        "chalice_spec.runtime.converter.http_api_event_to_apigw"
+        ":HttpApiEventToApiGateway"
+    ),
+)
+register_runtime(
+    APIRuntime.ApplicationLoadBalancer.value,
+    detector="chalice_spec.runtime.model_utility.alb:is_alb_event",
+    converter="chalice_spec.runtime.converter.alb_event_to_apigw:ALBEventToApiGateway",
+)
+register_runtime(
+    APIRuntime.Batch.value,
+    detector="chalice_spec.runtime.model_utility.batch:is_batch_event",
+    converter="chalice_spec.runtime.converter.batch_event_to_apigw:BatchEventToApiGateway",
+)
+register_runtime(
+    APIRuntime.AppSyncBatch.value,
+    detector="chalice_spec.runtime.model_utility.appsync:is_appsync_batch_event",
+    converter=(
+        "chalice_spec.runtime.converter.appsync_batch_event_to_apigw"
+        ":AppSyncBatchEventToApiGateway"
+    ),
+)
+register_runtime(
+    APIRuntime.Rpc.value,
+    detector="chalice_spec.runtime.model_utility.rpc:is_rpc_event",
+    converter="chalice_spec.runtime.converter.rpc_event_to_view:RpcEventToView",
+)
+
+
+def get_runtime_definition(runtime: Runtime) -> RuntimeDefinition:
+    """
+    Get the registered definition of a runtime.
+
+    :param runtime: APIRuntime member, or runtime name
+    :return: runtime definition
+    """
+    if isinstance(runtime, APIRuntime):
+        runtime = runtime.value
+    return runtime_registry.get(runtime)
+
+
+def classify_event(
+    event: dict,
+    runtime: List[Runtime],
+    strict: bool = False,
+    conversion: Optional[ConversionContext] = None,
+) -> Optional[Runtime]:
+    """
+    Decide which runtime sent the event.
+
+    Each allowed runtime is tried in order, and the first one whose detector
+    accepts the event is returned. Detectors look at a few discriminating keys
+    only, unless strict is set, in which case the event is validated as well.
+
+    :param event: lambda event
+    :param runtime: allowed runtimes
+    :param strict: validate the event with the runtime model
+    :param conversion: conversion context that keeps the validated models
+    :return: runtime that sent the event, or None
+    """
+    for item in runtime:
+        if get_runtime_definition(item).detect(event, strict, conversion):
+            return item
+    return None
+
+
 class APIRuntimeHandler:
     """
     Mixin : add __call__ method
+
+    current_request and lambda_context are kept per thread, so that runtimes
+    can dispatch several requests of one invocation concurrently.
     """
 
-    _runtime: Optional[List[APIRuntime]] = None
+    _runtime: Optional[List[Runtime]] = None
+    _strict_event_detection: bool = False
 
-    def set_runtime_handler(self, runtime: List[APIRuntime]):
+    def set_runtime_handler(
+        self, runtime: List[Runtime], strict_event_detection: bool = False
+    ):
         """
         Set Runtime Handler
         Default is invoke by API Gateway
+
+        :param runtime: allowed runtimes, APIRuntime members or registered names
+        :param strict_event_detection: validate the whole event on detection
         """
         self._runtime = runtime
+        self._strict_event_detection = strict_event_detection
+
+    def _request_state(self) -> threading.local:
+        state = self.__dict__.get("_chalice_spec_request_state")
+        if state is None:
+            state = self.__dict__.setdefault(
+                "_chalice_spec_request_state", threading.local()
+            )
+        return state
+
+    @property
+    def current_request(self):
+        return getattr(self._request_state(), "current_request", None)
+
+    @current_request.setter
+    def current_request(self, value) -> None:
+        self._request_state().current_request = value
+
+    @property
+    def lambda_context(self):
+        return getattr(self._request_state(), "lambda_context", None)
+
+    @lambda_context.setter
+    def lambda_context(self, value) -> None:
+        self._request_state().lambda_context = value
+
+    def invoke_rest_api(
+        self,
+        event: dict,
+        context: dict,
+        json_body: Optional[Any] = None,
+        session: Optional[Any] = None,
+    ) -> dict:
+        """
+        Invoke the Chalice REST API handler in-process.
+
+        Same as Chalice.__call__, but json_body is handed to the handler as-is
+        and pydantic models returned by handlers are serialized once.
+
+        :param event: api gateway event
+        :param context: lambda context
+        :param json_body: request JSON body built by a converter
+        :param session: session state of the caller, current_request.session
+        :return: api gateway response
+        """
+        self.lambda_context = context
+        handler = InProcessRestAPIEventHandler(
+            self.routes,
+            self.api,
+            self.log,
+            self.debug,
+            middleware_handlers=self._get_middleware_handlers("http"),
+            json_body=json_body,
+            session=session,
+        )
+        self.current_request = handler.create_request_object(event, context)
+        return handler(event, context)
 
     def __call__(self, event: dict, context: dict):
         """
@@ -52,25 +240,24 @@ class APIRuntimeHandler:
         # Not set runtime
         if self._runtime is None:
             # Default Runtime
-            return Chalice.__call__(self, event, context)
-
-        converter = None
-        # Called by Bedrock Agent
-        if (APIRuntime.BedrockAgent in self._runtime) and is_bedrock_agent_event(event):
-            converter = BedrockAgentEventToApiGateway()
+            return self.invoke_rest_api(event, context)
 
-        # Called by API Gateway
-        if (APIRuntime.APIGateway in self._runtime) and is_api_gateway_event(event):
-            return Chalice.__call__(self, event, context)
+        # Shared by detection and conversion of this invocation
+        conversion = ConversionContext(event, self)
+        runtime = classify_event(
+            event, self._runtime, self._strict_event_detection, conversion
+        )
 
         # Unknown, or default caller
-        if converter is None:
+        if runtime is None:
             # Not found converter
             raise Exception("Not found converter")
 
-        # Invoke parent __call__ method
-        api_gateway_response = Chalice.__call__(
-            self, event=converter.convert_request(event), context=context
-        )
-        # Return lambda result
-        return converter.convert_response(event, api_gateway_response)
+        # Called by API Gateway : no conversion
+        definition = get_runtime_definition(runtime)
+        if not definition.has_converter:
+            return self.invoke_rest_api(event, context)
+
+        # Convert the event, invoke chalice and return lambda result
+        converter = definition.create_converter()
+        return converter.dispatch(self, event, context, conversion)
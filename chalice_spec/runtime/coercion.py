@@ -0,0 +1,208 @@
+import json
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from chalice_spec.runtime.routing import cached_for_app
+
+Coercer = Callable[[str], Any]
+
+# Values of booleans sent as strings
+_TRUE_VALUES = frozenset(["true", "1", "yes"])
+_FALSE_VALUES = frozenset(["false", "0", "no"])
+
+
+def _to_bool(value: str) -> bool:
+    lowered = value.strip().lower()
+    if lowered in _TRUE_VALUES:
+        return True
+    if lowered in _FALSE_VALUES:
+        return False
+    raise ValueError(value)
+
+
+def _to_int(value: str) -> int:
+    try:
+        return int(value)
+    except ValueError:
+        number = float(value)
+        if not number.is_integer():
+            raise
+        return int(number)
+
+
+def _array_coercer(item_coercer: Optional[Coercer]) -> Coercer:
+    def to_array(value: str) -> list:
+        try:
+            items = json.loads(value)
+        except ValueError:
+            # Agents also send arrays unquoted, e.g. [a, b]
+            stripped = value.strip()
+            if stripped.startswith("[") and stripped.endswith("]"):
+                stripped = stripped[1:-1]
+            items = [item.strip().strip("\"'") for item in stripped.split(",")]
+            items = [item for item in items if item]
+        if not isinstance(items, list):
+            raise ValueError(value)
+        if item_coercer is None:
+            return items
+        return [
+            _coerce(item_coercer, item) if isinstance(item, str) else item
+            for item in items
+        ]
+
+    return to_array
+
+
+def _to_object(value: str) -> Any:
+    parsed = json.loads(value)
+    if not isinstance(parsed, dict):
+        raise ValueError(value)
+    return parsed
+
+
+# Coercer of each OpenAPI type, None : kept as string
+TYPE_COERCERS: Dict[Optional[str], Optional[Coercer]] = {
+    "string": None,
+    "integer": _to_int,
+    "number": float,
+    "boolean": _to_bool,
+    "array": _array_coercer(None),
+    "object": _to_object,
+}
+
+
+def _coerce(coercer: Coercer, value: str) -> Any:
+    try:
+        return coercer(value)
+    except (TypeError, ValueError):
+        # Not convertible : the handler validates the value as sent
+        return value
+
+
+def coercer_for_schema(schema: dict, definitions: dict) -> Optional[Coercer]:
+    """
+    Build the coercer of a JSON schema.
+
+    :param schema: JSON schema of a property
+    :param definitions: definitions referenced by the schema
+    :return: coercer, or None if values are kept as strings
+    """
+    if "$ref" in schema:
+        name = schema["$ref"].rsplit("/", 1)[-1]
+        return coercer_for_schema(definitions.get(name, {}), definitions)
+    for key in ("allOf", "anyOf", "oneOf"):
+        if schema.get(key):
+            # First alternative, e.g. Optional[int] or a single $ref
+            return coercer_for_schema(schema[key][0], definitions)
+    schema_type = schema.get("type")
+    if schema_type == "array":
+        return _array_coercer(
+            coercer_for_schema(schema.get("items") or {}, definitions)
+        )
+    if schema_type is None and "properties" in schema:
+        schema_type = "object"
+    return TYPE_COERCERS.get(schema_type)
+
+
+class CoercionPlan:
+    """
+    Conversion of the string values sent by Bedrock agents, for one route.
+
+    The plan is built once from the JSON schema of the request model. Values
+    of properties that are not in the schema are converted according to the
+    type declared with the value. Values that can not be converted are kept
+    as strings, for the handler to validate.
+    """
+
+    def __init__(self, coercers: Optional[Dict[str, Optional[Coercer]]] = None):
+        """
+        constructor.
+
+        :param coercers: coercer of each property, None : kept as string
+        """
+        self._coercers = coercers or {}
+
+    @classmethod
+    def from_schema(cls, schema: dict) -> "CoercionPlan":
+        """
+        build the plan of a request JSON schema.
+
+        :param schema: JSON schema of the request body
+        :return: coercion plan
+        """
+        # Definitions of pydantic v1 schemas, or of JSON schema 2020-12
+        definitions = schema.get("definitions") or schema.get("$defs") or {}
+        return cls(
+            {
+                name: coercer_for_schema(property_schema, definitions)
+                for name, property_schema in schema.get("properties", {}).items()
+            }
+        )
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._coercers
+
+    def coerce(self, name: str, value: Any, declared_type: Optional[str] = None) -> Any:
+        """
+        convert a value.
+
+        :param name: property name
+        :param value: property value, as sent
+        :param declared_type: type sent with the value, e.g. integer
+        :return: converted value
+        """
+        if value.__class__ is not str:
+            return value
+        coercers = self._coercers
+        if name in coercers:
+            coercer = coercers[name]
+        else:
+            coercer = TYPE_COERCERS.get(declared_type)
+        if coercer is None:
+            return value
+        try:
+            return coercer(value)
+        except (TypeError, ValueError):
+            # Not convertible : the handler validates the value as sent
+            return value
+
+
+class CoercionPlans:
+    """
+    Coercion plans of the routes of an app, each built on first use.
+    """
+
+    def __init__(self, app):
+        self._app = app
+        self._plans: Dict[Tuple[str, str], CoercionPlan] = {}
+
+    def get(self, path: str, method: str) -> CoercionPlan:
+        """
+        coercion plan of a route.
+
+        :param path: route path, e.g. /items/{id}
+        :param method: http method
+        :return: plan of the request model of the route, or an empty plan
+        """
+        key = (path, method.upper())
+        plan = self._plans.get(key)
+        if plan is None:
+            get_route_operation = getattr(self._app, "get_route_operation", None)
+            operation = get_route_operation(*key) if get_route_operation else None
+            if operation is not None and operation.request is not None:
+                from chalice_spec.compat import model_json_schema
+
+                plan = CoercionPlan.from_schema(model_json_schema(operation.request))
+            else:
+                plan = CoercionPlan()
+            self._plans[key] = plan
+        return plan
+
+    @classmethod
+    def for_app(cls, app) -> "CoercionPlans":
+        """
+        coercion plans of a Chalice app, see cached_for_app.
+
+        :param app: Chalice app
+        :return: coercion plans
+        """
+        return cached_for_app(app, "_chalice_spec_coercion_plans", cls)
@@ -0,0 +1,231 @@
+import json
+import math
+import time
+from typing import Any, List, Optional, Type
+
+from pydantic import BaseModel
+
+from chalice_spec.compat import model_fields, root_field
+
+# Default size budget of a Bedrock agent response : the Lambda response
+# payload of an action group is limited to 25 KB
+DEFAULT_MAX_RESPONSE_BYTES = 25 * 1024
+# Key of the item that replaces the items removed from a truncated array
+TRUNCATED_KEY = "_truncated"
+# Namespace of the CloudWatch metrics
+METRIC_NAMESPACE = "chalice-spec"
+
+
+def embedded_size(text: str) -> int:
+    """
+    Size of a string embedded in a JSON document, as Lambda serializes it.
+    """
+    return len(json.dumps(text)) - 2
+
+
+def _json_size(value: Any) -> int:
+    return embedded_size(json.dumps(value, separators=(",", ":")))
+
+
+class CompactionResult:
+    """
+    Result of the compaction of a response body.
+    """
+
+    def __init__(
+        self, body: str, original_bytes: int, compacted_bytes: int, steps: List[str]
+    ):
+        # Compacted body
+        self.body = body
+        # Size of the body, embedded in the JSON response
+        self.original_bytes = original_bytes
+        self.compacted_bytes = compacted_bytes
+        # Compaction steps applied, e.g. minify, truncate_arrays
+        self.steps = steps
+
+    @property
+    def compacted(self) -> bool:
+        return bool(self.steps)
+
+
+def _field_model(model: Optional[type]) -> Optional[type]:
+    if isinstance(model, type) and issubclass(model, BaseModel):
+        return model
+    return None
+
+
+def drop_optional_fields(value: Any, model: Optional[Type[BaseModel]]) -> Any:
+    """
+    Remove the fields that are not required by the response model.
+
+    :param value: JSON value
+    :param model: response model of the value, or None
+    :return: value without optional fields
+    """
+    model = _field_model(model)
+    if model is None:
+        return value
+    root = root_field(model)
+    if root is not None:
+        return drop_optional_fields(value, root.type_)
+    if isinstance(value, list):
+        return [drop_optional_fields(item, model) for item in value]
+    if not isinstance(value, dict):
+        return value
+    fields = {field.alias: field for field in model_fields(model).values()}
+    result = {}
+    for name, item in value.items():
+        field = fields.get(name)
+        if field is None:
+            result[name] = item
+        elif field.required:
+            result[name] = drop_optional_fields(item, field.type_)
+    return result
+
+
+def _largest_array(value: Any, largest: list) -> None:
+    """
+    find the largest array that can be truncated : largest is [size, array].
+    """
+    if isinstance(value, dict):
+        for item in value.values():
+            _largest_array(item, largest)
+    elif isinstance(value, list):
+        items = value[:-1] if _is_marker(value[-1:]) else value
+        if len(items) > 1:
+            size = _json_size(value)
+            if size > largest[0]:
+                largest[0] = size
+                largest[1] = value
+        for item in value:
+            _largest_array(item, largest)
+
+
+def _is_marker(items: list) -> bool:
+    return (
+        len(items) == 1
+        and isinstance(items[0], dict)
+        and set(items[0]) == {TRUNCATED_KEY}
+    )
+
+
+def truncate_arrays(value: Any, max_bytes: int) -> Any:
+    """
+    Remove the last items of the largest arrays until the value fits.
+
+    Removed items are replaced with a {"_truncated": <count>} item.
+
+    :param value: JSON value, updated in place
+    :param max_bytes: size budget
+    :return: value
+    """
+    size = _json_size(value)
+    while size > max_bytes:
+        largest: list = [0, None]
+        _largest_array(value, largest)
+        array = largest[1]
+        if array is None:
+            break
+        removed = 0
+        if _is_marker(array[-1:]):
+            removed = array.pop()[TRUNCATED_KEY]
+        # Remove the estimated number of items, at least one
+        item_size = largest[0] / len(array)
+        count = min(len(array) - 1, max(1, math.ceil((size - max_bytes) / item_size)))
+        del array[len(array) - count :]
+        array.append({TRUNCATED_KEY: removed + count})
+        size = _json_size(value)
+    return value
+
+
+def compact_body(
+    body: str, max_bytes: int, model: Optional[Type[BaseModel]] = None
+) -> CompactionResult:
+    """
+    Compact a response body to fit a size budget.
+
+    JSON bodies are minified first, then the fields that are not required by
+    the response model are removed, then arrays are truncated. Bodies that
+    still do not fit are replaced with an error. Other bodies are truncated.
+
+    :param body: response body
+    :param max_bytes: size budget of the body, embedded in the JSON response
+    :param model: response model, to find the optional fields
+    :return: compaction result
+    """
+    original_bytes = embedded_size(body)
+    if original_bytes <= max_bytes:
+        return CompactionResult(body, original_bytes, original_bytes, [])
+
+    steps = []
+    try:
+        value = json.loads(body)
+    except ValueError:
+        # Plain text : keep the head
+        cut = min(len(body), max_bytes)
+        while cut > 0 and embedded_size(body[:cut]) + 3 > max_bytes:
+            cut -= max(1, embedded_size(body[:cut]) + 3 - max_bytes)
+        compacted = body[: max(cut, 0)] + "..."
+        return CompactionResult(
+            compacted, original_bytes, embedded_size(compacted), ["truncate_text"]
+        )
+
+    for step, compact in (
+        ("minify", lambda v: v),
+        ("drop_optional_fields", lambda v: drop_optional_fields(v, model)),
+        ("truncate_arrays", lambda v: truncate_arrays(v, max_bytes)),
+    ):
+        if step == "drop_optional_fields" and model is None:
+            continue
+        value = compact(value)
+        steps.append(step)
+        size = _json_size(value)
+        if size <= max_bytes:
+            compacted = json.dumps(value, separators=(",", ":"))
+            return CompactionResult(compacted, original_bytes, size, steps)
+
+    steps.append("error")
+    compacted = json.dumps(
+        {
+            "Code": "ResponseTooLarge",
+            "Message": f"The response is larger than {max_bytes} bytes",
+        },
+        separators=(",", ":"),
+    )
+    return CompactionResult(compacted, original_bytes, embedded_size(compacted), steps)
+
+
+def emit_compaction_metric(result: CompactionResult, operation: str) -> None:
+    """
+    Print the compaction of a response as a CloudWatch embedded metric.
+
+    Opt-in hook of the Bedrock agent converters (on_compaction). The metric
+    is printed to stdout, where Lambda sends it to CloudWatch Logs as a raw
+    JSON line, as the embedded metric format requires.
+
+    :param result: compaction result
+    :param operation: compacted operation, e.g. GET /items
+    """
+    print(
+        json.dumps(
+            {
+                "_aws": {
+                    "Timestamp": int(time.time() * 1000),
+                    "CloudWatchMetrics": [
+                        {
+                            "Namespace": METRIC_NAMESPACE,
+                            "Dimensions": [["Operation"]],
+                            "Metrics": [
+                                {"Name": "ResponseCompacted", "Unit": "Count"},
+                                {"Name": "ResponseBytesSaved", "Unit": "Bytes"},
+                            ],
+                        }
+                    ],
+                },
+                "Operation": operation,
+                "ResponseCompacted": 1,
+                "ResponseBytesSaved": result.original_bytes - result.compacted_bytes,
+                "CompactionSteps": ",".join(result.steps),
+            }
+        )
+    )
@@ -0,0 +1,25 @@
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List, Sequence, TypeVar
+
+Item = TypeVar("Item")
+Result = TypeVar("Result")
+
+
+def map_concurrently(
+    function: Callable[[Item], Result], items: Sequence[Item], max_workers: int
+) -> List[Result]:
+    """
+    Apply function to every item on a bounded thread pool.
+
+    Results are returned in the order of the items. A single item is
+    processed on the calling thread.
+
+    :param function: function to apply, it must not raise
+    :param items: items
+    :param max_workers: maximum number of threads
+    :return: results
+    """
+    if len(items) <= 1 or max_workers <= 1:
+        return [function(item) for item in items]
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(items))) as executor:
+        return list(executor.map(function, items))
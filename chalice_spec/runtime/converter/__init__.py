@@ -1,19 +1,140 @@
+from typing import Any, Dict, Optional
+
+
+class ConversionContext:
+    """
+    Per-invocation conversion state.
+
+    One context is created for every lambda invocation. Detection, request
+    conversion and response conversion share it, so the raw event is parsed
+    into each model, or wrapped into each lazy view, only once.
+
+    A converter may also set json_body: the request JSON body as python
+    objects. The API Gateway event body is then left empty, and the objects
+    reach the Chalice handler in-process through current_request.json_body.
+    Likewise, session is handed to the handler as current_request.session.
+    Converters that match the event against the routes of the app keep the
+    match in route, so that it is matched once per invocation.
+    """
+
+    def __init__(self, event: dict, app: Optional[Any] = None):
+        """
+        constructor.
+
+        :param event: raw lambda event
+        :param app: Chalice app that is invoked, for converters that need its routes
+        """
+        self.event = event
+        self.app = app
+        self.json_body: Optional[Any] = None
+        self.session: Optional[Any] = None
+        # Route matched by the converter, None if no route matches
+        self.route: Optional[Any] = None
+        self.route_matched = False
+        self._parsed: Dict[type, Any] = {}
+
+    def parse(self, model: type) -> Any:
+        """
+        parse the event with model, once per invocation.
+
+        :param model: pydantic model of the event
+        :return: parsed event
+        """
+        parsed = self._parsed.get(model)
+        if parsed is None:
+            from chalice_spec.compat import parse_model
+
+            parsed = parse_model(model, self.event)
+            self._parsed[model] = parsed
+        return parsed
+
+    def view(self, view_class: type) -> Any:
+        """
+        lazy view of the event, once per invocation.
+
+        If the event was already validated with the model of the view (e.g. by
+        strict detection), the parsed model is returned instead.
+
+        :param view_class: LazyEventView subclass
+        :return: view, or parsed event
+        """
+        parsed = self._parsed.get(view_class.__model__)
+        if parsed is None:
+            parsed = self._parsed.get(view_class)
+        if parsed is None:
+            parsed = view_class(self.event)
+            self._parsed[view_class] = parsed
+        return parsed
+
+
+def parses_as(
+    event: dict, model: type, conversion: Optional[ConversionContext] = None
+) -> bool:
+    """
+    check the event validates with model, for the strict event detection.
+
+    :param event: raw lambda event
+    :param model: pydantic model of the event
+    :param conversion: conversion context that keeps the parsed model, or None
+    :return: bool
+    """
+    if conversion is None:
+        conversion = ConversionContext(event)
+    try:
+        conversion.parse(model)
+        return True
+    except Exception:
+        # throw pydantic -> event is not of the model
+        return False
+
+
 class EventConverter:
-    def convert_request(self, event: dict) -> dict:
+    def convert_request(
+        self, event: dict, conversion: Optional[ConversionContext] = None
+    ) -> dict:
         """
         parse event input to other type parameter.
 
         :param event: dict api gateway event
+        :param conversion: conversion context of the invocation
         :return: other type event
         """
         return event
 
-    def convert_response(self, event: dict, response: dict) -> dict:
+    def convert_response(
+        self,
+        event: dict,
+        response: dict,
+        conversion: Optional[ConversionContext] = None,
+    ) -> dict:
         """
         parse event response to other type response.
 
         :param event: dict api gateway event
         :param response: dict api gateway response
+        :param conversion: conversion context of the invocation
         :return: other type response
         """
         return response
+
+    def dispatch(
+        self, app: Any, event: dict, context: Any, conversion: ConversionContext
+    ) -> Any:
+        """
+        invoke the app with the event, and return lambda result.
+
+        The event is converted to an api gateway event, handled by Chalice
+        in-process, and the response is converted back. Runtimes that do not
+        map one event to one request (e.g. batches) override this method.
+
+        :param app: ChaliceWithSpec app
+        :param event: lambda event
+        :param context: lambda context
+        :param conversion: conversion context of the invocation
+        :return: lambda result
+        """
+        api_gateway_event = self.convert_request(event, conversion)
+        api_gateway_response = app.invoke_rest_api(
+            api_gateway_event, context, conversion.json_body, conversion.session
+        )
+        return self.convert_response(event, api_gateway_response, conversion)
@@ -0,0 +1,127 @@
+from typing import Dict, List, Optional
+from urllib.parse import unquote_plus
+
+from chalice_spec.runtime.model_utility.alb import (
+    ALB_RESPONSE_TEMPLATE,
+    alb_status_description,
+)
+from chalice_spec.runtime.model_utility.apigw import build_api_gateway_event
+from chalice_spec.runtime.routing import RouteTrie
+from . import ConversionContext, EventConverter
+
+# Header key constant : Set-Cookie
+HEADER_KEY_SET_COOKIE = "set-cookie"
+
+
+class ALBEventToApiGateway(EventConverter):
+    """
+    Convert Application Load Balancer events to REST API events, and
+    responses back.
+
+    Target groups send either single-value or multi-value headers and query
+    strings. The response is built in the same mode as the request.
+    """
+
+    @staticmethod
+    def _is_multi_value(event: dict) -> bool:
+        return "multiValueHeaders" in event
+
+    @staticmethod
+    def _decode_query(query: Optional[Dict[str, List[str]]]):
+        """
+        decode query string parameters : the load balancer does not decode them.
+        """
+        if not query:
+            return None
+        return {
+            unquote_plus(name): [unquote_plus(value) for value in values]
+            for name, values in query.items()
+        }
+
+    def convert_request(
+        self, event: dict, conversion: Optional[ConversionContext] = None
+    ) -> dict:
+        """
+        parse event input to other type parameter.
+
+        :param event: ALB Event
+        :param conversion: conversion context of the invocation
+        :return: Api Gateway Event
+        """
+        path = event["path"]
+        resource_path, path_parameters = path, None
+        if conversion is not None and conversion.app is not None:
+            matched = RouteTrie.for_app(conversion.app).match(path)
+            if matched is not None:
+                resource_path, path_parameters = matched
+
+        if self._is_multi_value(event):
+            multi_value_headers = event.get("multiValueHeaders") or {}
+            headers = {name: values[-1] for name, values in multi_value_headers.items()}
+            query = self._decode_query(event.get("multiValueQueryStringParameters"))
+        else:
+            headers = dict(event.get("headers") or {})
+            multi_value_headers = {name: [value] for name, value in headers.items()}
+            single_query = event.get("queryStringParameters")
+            query = self._decode_query(
+                {name: [value] for name, value in single_query.items()}
+                if single_query
+                else None
+            )
+
+        apigw_event = build_api_gateway_event(
+            http_method=event["httpMethod"],
+            resource_path=resource_path,
+            headers=headers,
+            body=event.get("body"),
+        )
+        apigw_event["path"] = path
+        apigw_event["multiValueHeaders"] = multi_value_headers
+        apigw_event["queryStringParameters"] = (
+            {name: values[-1] for name, values in query.items()} if query else None
+        )
+        apigw_event["multiValueQueryStringParameters"] = query
+        apigw_event["pathParameters"] = path_parameters or None
+        apigw_event["isBase64Encoded"] = event.get("isBase64Encoded", False)
+        apigw_event["requestContext"]["path"] = path
+        return apigw_event
+
+    def convert_response(
+        self,
+        event: dict,
+        response: dict,
+        conversion: Optional[ConversionContext] = None,
+    ) -> dict:
+        """
+        parse event response to other type response.
+
+        In single-value mode, multi-value headers are joined with commas,
+        except Set-Cookie where the last cookie is kept.
+
+        :param event: ALB Event
+        :param response: Api Gateway Event that is created by Chalice
+        :param conversion: conversion context of the invocation
+        :return: ALB Response
+        """
+        headers = response.get("headers") or {}
+        multi_value_headers = response.get("multiValueHeaders") or {}
+
+        result = dict(ALB_RESPONSE_TEMPLATE)
+        result["statusCode"] = response["statusCode"]
+        result["statusDescription"] = alb_status_description(response["statusCode"])
+        result["body"] = response.get("body", "")
+        result["isBase64Encoded"] = response.get("isBase64Encoded", False)
+
+        if self._is_multi_value(event):
+            merged = {name: [value] for name, value in headers.items()}
+            merged.update(multi_value_headers)
+            result["multiValueHeaders"] = merged
+        else:
+            merged = dict(headers)
+            for name, values in multi_value_headers.items():
+                if name.lower() == HEADER_KEY_SET_COOKIE:
+                    merged[name] = values[-1]
+                else:
+                    merged[name] = ",".join(values)
+            result["headers"] = merged
+        return result
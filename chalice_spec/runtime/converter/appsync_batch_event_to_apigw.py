@@ -0,0 +1,124 @@
+import json
+from typing import Any, List
+
+from chalice_spec.runtime.concurrency import map_concurrently
+from chalice_spec.runtime.model_utility.apigw import build_api_gateway_event
+from chalice_spec.runtime.routing import OperationIndex
+from . import ConversionContext, EventConverter
+
+# Header key constant : Content-Type
+HEADER_KEY_CONTENT_TYPE = "content-type"
+# Methods whose arguments are sent as query strings instead of a body
+QUERY_METHODS = frozenset(["GET", "HEAD", "DELETE", "OPTIONS"])
+
+
+class AppSyncBatchEventToApiGateway(EventConverter):
+    """
+    Dispatch AppSync BatchInvoke resolver contexts to routes.
+
+    Each resolver context is routed by its field name, which is matched
+    against the operationId of the documented Operations, then against the
+    names of the view functions. Arguments named after path parameters fill
+    the path, the other arguments are sent as query strings (GET, HEAD,
+    DELETE, OPTIONS) or as the JSON body.
+
+    Items are dispatched concurrently on a bounded thread pool, and the
+    results are returned in order: {"data": ...} for successful items,
+    {"data": None, "errorMessage": ..., "errorType": ...} for failed items.
+    """
+
+    # Default size of the thread pool
+    DEFAULT_MAX_WORKERS = 8
+
+    def __init__(self, max_workers: int = DEFAULT_MAX_WORKERS):
+        """
+        constructor.
+
+        :param max_workers: maximum number of items dispatched concurrently
+        """
+        super().__init__()
+        self._max_workers = max_workers
+
+    @staticmethod
+    def _error(message: str, error_type: str) -> dict:
+        return {"data": None, "errorMessage": message, "errorType": error_type}
+
+    @staticmethod
+    def _parse_body(body: Any) -> Any:
+        if isinstance(body, str):
+            try:
+                return json.loads(body)
+            except ValueError:
+                return body
+        return body
+
+    def _dispatch_item(self, app: Any, item: dict, context: Any) -> dict:
+        """
+        dispatch one resolver context to its route.
+
+        :return: result of the item
+        """
+        field_name = item["info"]["fieldName"]
+        try:
+            route = OperationIndex.for_app(app).get(field_name)
+            if route is None:
+                return self._error(f"No route for field {field_name}", "NotFound")
+            path, method = route
+            view_args = app.routes[path][method].view_args
+
+            arguments = dict(item.get("arguments") or {})
+            path_parameters = {
+                name: str(arguments.pop(name))
+                for name in view_args
+                if name in arguments
+            }
+            api_gateway_event = build_api_gateway_event(
+                http_method=method,
+                resource_path=path,
+                headers={HEADER_KEY_CONTENT_TYPE: "application/json"},
+                body=None,
+            )
+            api_gateway_event["pathParameters"] = path_parameters or None
+            json_body = None
+            if method in QUERY_METHODS:
+                query = {
+                    name: value if isinstance(value, list) else [value]
+                    for name, value in arguments.items()
+                }
+                api_gateway_event["multiValueQueryStringParameters"] = {
+                    name: [str(value) for value in values]
+                    for name, values in query.items()
+                } or None
+            else:
+                json_body = arguments
+
+            response = app.invoke_rest_api(api_gateway_event, context, json_body)
+            data = self._parse_body(response.get("body"))
+            if 200 <= response["statusCode"] < 300:
+                return {"data": data}
+            if isinstance(data, dict) and "Code" in data:
+                return self._error(str(data.get("Message", "")), data["Code"])
+            return self._error(str(data), f"HTTP{response['statusCode']}")
+        except Exception as e:
+            app.log.error("Failed to resolve field %s", field_name, exc_info=True)
+            return self._error(str(e), e.__class__.__name__)
+
+    def dispatch(
+        self, app: Any, event: list, context: Any, conversion: ConversionContext
+    ) -> List[dict]:
+        """
+        dispatch every resolver context, and return ordered results.
+
+        :param app: ChaliceWithSpec app
+        :param event: AppSync BatchInvoke event
+        :param context: lambda context
+        :param conversion: conversion context of the invocation
+        :return: results, in the order of the event
+        """
+        # Build the index once, before the workers share it
+        OperationIndex.for_app(app)
+        return map_concurrently(
+            lambda item: self._dispatch_item(app, item, context),
+            event,
+            self._max_workers,
+        )
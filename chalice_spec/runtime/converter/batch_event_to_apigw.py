@@ -0,0 +1,167 @@
+import base64
+import json
+from typing import Any, Optional
+
+from chalice_spec.compat import parse_model
+from chalice_spec.runtime.concurrency import map_concurrently
+from chalice_spec.runtime.model_utility.apigw import build_api_gateway_event
+from chalice_spec.runtime.models.batch import BatchMessageModel
+from chalice_spec.runtime.routing import RouteTrie
+from . import ConversionContext, EventConverter
+
+# Header key constant : Content-Type
+HEADER_KEY_CONTENT_TYPE = "content-type"
+
+
+def deserialize_dynamodb(value: dict) -> Any:
+    """
+    deserialize DynamoDB attribute value, e.g. {"S": "hello"} -> "hello".
+    """
+    ((type_, data),) = value.items()
+    if type_ == "S" or type_ == "B":
+        return data
+    if type_ == "N":
+        return float(data) if any(c in data for c in ".eE") else int(data)
+    if type_ == "BOOL":
+        return data
+    if type_ == "NULL":
+        return None
+    if type_ == "M":
+        return {key: deserialize_dynamodb(item) for key, item in data.items()}
+    if type_ == "L":
+        return [deserialize_dynamodb(item) for item in data]
+    if type_ == "SS" or type_ == "BS":
+        return list(data)
+    if type_ == "NS":
+        return [deserialize_dynamodb({"N": item}) for item in data]
+    raise ValueError(f"Unknown DynamoDB type: {type_}")
+
+
+class BatchEventToApiGateway(EventConverter):
+    """
+    Dispatch the records of SQS, Kinesis and DynamoDB Streams batches to
+    documented routes.
+
+    Each record carries a message: {"method": ..., "path": ..., "body": ...}.
+    SQS messages are the JSON record body, Kinesis messages the JSON record
+    data, DynamoDB Streams messages the new image of the item.
+
+    Records are dispatched concurrently on a bounded thread pool. The result
+    is a partial batch response: records that could not be routed, whose body
+    does not match the request model of the route, or whose handler did not
+    return a 2xx status are reported in batchItemFailures.
+    """
+
+    # Default size of the thread pool
+    DEFAULT_MAX_WORKERS = 8
+
+    def __init__(self, max_workers: int = DEFAULT_MAX_WORKERS):
+        """
+        constructor.
+
+        :param max_workers: maximum number of records dispatched concurrently
+        """
+        super().__init__()
+        self._max_workers = max_workers
+
+    @staticmethod
+    def _item_identifier(record: dict) -> str:
+        source = record.get("eventSource")
+        if source == "aws:kinesis":
+            return record["kinesis"]["sequenceNumber"]
+        if source == "aws:dynamodb":
+            return record["dynamodb"]["SequenceNumber"]
+        return record["messageId"]
+
+    @staticmethod
+    def _read_message(record: dict) -> Optional[dict]:
+        """
+        read the message of a record, None if there is nothing to dispatch.
+        """
+        source = record.get("eventSource")
+        if source == "aws:kinesis":
+            return json.loads(base64.b64decode(record["kinesis"]["data"]))
+        if source == "aws:dynamodb":
+            image = record["dynamodb"].get("NewImage")
+            if image is None:
+                # Removed items have no new image
+                return None
+            return deserialize_dynamodb({"M": image})
+        return json.loads(record["body"])
+
+    def _dispatch_record(self, app: Any, record: dict, context: Any) -> bool:
+        """
+        dispatch one record to its route.
+
+        :return: True if the record was processed
+        """
+        try:
+            message = self._read_message(record)
+            if message is None:
+                return True
+            message = parse_model(BatchMessageModel, message)
+            matched = RouteTrie.for_app(app).match(message.path)
+            if matched is None:
+                app.log.error("No route for batch record path %s", message.path)
+                return False
+            resource_path, path_parameters = matched
+            method = message.method.upper()
+
+            # Records are dispatched to documented routes only
+            operation = app.get_route_operation(resource_path, method)
+            if operation is None:
+                app.log.error(
+                    "No documented route for batch record %s %s",
+                    method,
+                    resource_path,
+                )
+                return False
+            if operation.request is not None:
+                parse_model(operation.request, message.body)
+
+            headers = {HEADER_KEY_CONTENT_TYPE: "application/json"}
+            if message.headers:
+                headers.update(message.headers)
+            api_gateway_event = build_api_gateway_event(
+                http_method=method,
+                resource_path=resource_path,
+                headers=headers,
+                body=None,
+            )
+            api_gateway_event["path"] = message.path
+            api_gateway_event["pathParameters"] = path_parameters or None
+            response = app.invoke_rest_api(
+                api_gateway_event, context, json_body=message.body
+            )
+            return 200 <= response["statusCode"] < 300
+        except Exception:
+            app.log.error("Failed to process batch record", exc_info=True)
+            return False
+
+    def dispatch(
+        self, app: Any, event: dict, context: Any, conversion: ConversionContext
+    ) -> dict:
+        """
+        dispatch every record, and return partial batch response.
+
+        :param app: ChaliceWithSpec app
+        :param event: SQS, Kinesis or DynamoDB Streams event
+        :param context: lambda context
+        :param conversion: conversion context of the invocation
+        :return: partial batch response
+        """
+        records = event["Records"]
+        # Build the route trie once, before the workers share it
+        RouteTrie.for_app(app)
+        processed = map_concurrently(
+            lambda record: self._dispatch_record(app, record, context),
+            records,
+            self._max_workers,
+        )
+        return {
+            "batchItemFailures": [
+                {"itemIdentifier": self._item_identifier(record)}
+                for record, ok in zip(records, processed)
+                if not ok
+            ]
+        }
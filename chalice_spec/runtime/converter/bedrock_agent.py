@@ -0,0 +1,243 @@
+from chalice_spec.runtime.models.bedrock_agent import BedrockAgentPropertyModel
+import json
+from abc import ABC, abstractmethod
+from chalice_spec.runtime.coercion import CoercionPlan, CoercionPlans
+from chalice_spec.runtime.compaction import (
+    DEFAULT_MAX_RESPONSE_BYTES,
+    CompactionResult,
+    compact_body,
+)
+from chalice_spec.runtime.session import (
+    DEFAULT_CACHE_MAX_BYTES,
+    DEFAULT_CACHE_TTL,
+    SessionState,
+)
+from typing import Any, Callable, Dict, Optional, Tuple
+from urllib.parse import quote
+from . import ConversionContext, EventConverter
+
+# Header key constant : Content-Type
+HEADER_KEY_CONTENT_TYPE = "content-type"
+# Header key constant : Cookie
+HEADER_KEY_COOKIE = "cookie"
+# Characters of a cookie value that are not percent-encoded (RFC 6265 cookie-octet)
+COOKIE_VALUE_SAFE = "!#$&'()*+-./:<=>?@[]^_`{|}~"
+
+
+class BedrockAgentConverter(EventConverter, ABC):
+    """
+    Base of the converters of Bedrock agent events, of action groups defined
+    with an OpenAPI schema or with function details.
+
+    Subclasses parse the event and match it against the routes of the app,
+    once per invocation. The base converts the values sent by the agent,
+    hands the session attributes over to the handler and back, and keeps the
+    responses within their size budget.
+    """
+
+    # Content type of the request body sent to the routes
+    _content_type: str
+    # Convert the string values sent by the agent to the types of the spec
+    _coerce_types: bool
+    # Size budget of the responses, None is unlimited
+    _max_response_bytes: Optional[int]
+
+    def __init__(
+        self,
+        content_type: str = "application/json",
+        coerce_types=True,
+        max_response_bytes: Optional[int] = DEFAULT_MAX_RESPONSE_BYTES,
+        on_compaction: Optional[Callable[[CompactionResult, str], None]] = None,
+        session_cache_max_bytes: int = DEFAULT_CACHE_MAX_BYTES,
+        session_cache_ttl: float = DEFAULT_CACHE_TTL,
+    ):
+        """
+        constructor.
+
+        :param content_type: Content type of the request body sent to the routes
+        :param coerce_types: convert values to the types of the request schema
+        :param max_response_bytes: size budget of the responses, Operation may override it
+        :param on_compaction: called with each compacted response and its operation,
+            e.g. emit_compaction_metric
+        :param session_cache_max_bytes: size budget of the session cache
+        :param session_cache_ttl: default time to live of session cache entries
+        """
+        super().__init__()
+        self._content_type = content_type
+        self._coerce_types = coerce_types
+        self._max_response_bytes = max_response_bytes
+        self._on_compaction = on_compaction
+        self._session_cache_max_bytes = session_cache_max_bytes
+        self._session_cache_ttl = session_cache_ttl
+
+    def _parse_value(self, property: BedrockAgentPropertyModel):
+        """
+        parse Bedrock Agent Property Model to value.
+
+        :param property: Bedrock Agent Property Model
+        :return: value
+        """
+        return property.value
+
+    @abstractmethod
+    def _match_route(self, app: Any, agent_event: Any) -> Optional[Any]:
+        """
+        match the event against the routes of the app.
+
+        :param app: Chalice app
+        :param agent_event: Bedrock agent event
+        :return: matched route, or None
+        """
+
+    def _matched_route(
+        self, app: Any, agent_event: Any, conversion: Optional[ConversionContext]
+    ) -> Optional[Any]:
+        """
+        match the event against the routes of the app, once per invocation.
+
+        :param app: Chalice app, or None
+        :param agent_event: Bedrock agent event
+        :param conversion: conversion context of the invocation
+        :return: matched route, or None
+        """
+        if app is None:
+            return None
+        if conversion is None:
+            return self._match_route(app, agent_event)
+        if not conversion.route_matched:
+            conversion.route = self._match_route(app, agent_event)
+            conversion.route_matched = True
+        return conversion.route
+
+    def _coercion_plan(
+        self, app: Any, route: Optional[Tuple[str, str]]
+    ) -> Optional[CoercionPlan]:
+        """
+        coercion plan of the values, from the request schema of the route.
+
+        :param app: Chalice app, or None
+        :param route: route path and method, or None
+        :return: coercion plan, or None if values are kept as strings
+        """
+        if not self._coerce_types:
+            return None
+        if app is None or route is None:
+            # Declared types of the values only
+            return CoercionPlan()
+        return CoercionPlans.for_app(app).get(*route)
+
+    def _open_session(
+        self, agent_event: Any, conversion: Optional[ConversionContext]
+    ) -> None:
+        """
+        hand the session attributes of the event over to the handler.
+
+        :param agent_event: Bedrock agent event
+        :param conversion: conversion context of the invocation
+        """
+        if conversion is not None:
+            conversion.session = SessionState(
+                agent_event.session_attributes,
+                agent_event.prompt_session_attributes,
+                cache_max_bytes=self._session_cache_max_bytes,
+                cache_ttl=self._session_cache_ttl,
+            )
+
+    def _close_session(
+        self, agent_response: dict, conversion: Optional[ConversionContext]
+    ) -> None:
+        """
+        return the session attributes with the response, as the handler left them.
+
+        :param agent_response: Bedrock agent response, updated in place
+        :param conversion: conversion context of the invocation
+        """
+        session = conversion.session if conversion is not None else None
+        if session is not None:
+            agent_response["sessionAttributes"] = session.dump_session_attributes()
+            agent_response["promptSessionAttributes"] = dict(
+                session.prompt_session_attributes
+            )
+
+    def _map_path(
+        self,
+        api_gateway_event: dict,
+        route: str,
+        path_parameters: Dict[str, str],
+        query_parameters: Dict[str, str],
+    ) -> None:
+        """
+        set the route, path parameters and query strings of the Api Gateway Event.
+
+        :param api_gateway_event: Api Gateway Event, updated in place
+        :param route: route path, e.g. /items/{item_id}
+        :param path_parameters: path parameters, by name
+        :param query_parameters: query strings, by name
+        """
+        path = route
+        for name, value in path_parameters.items():
+            path = path.replace("{" + name + "}", quote(value, safe=""))
+        request_context = api_gateway_event["requestContext"]
+        api_gateway_event["resource"] = request_context["resourcePath"] = route
+        api_gateway_event["path"] = request_context["path"] = path
+        api_gateway_event["pathParameters"] = path_parameters or None
+        api_gateway_event["queryStringParameters"] = query_parameters or None
+        api_gateway_event["multiValueQueryStringParameters"] = {
+            name: [value] for name, value in query_parameters.items()
+        } or None
+
+    def _map_cookies(self, headers: Dict[str, str], cookies: Dict[str, str]) -> None:
+        """
+        send the cookie parameters as the Cookie header of the Api Gateway Event.
+
+        :param headers: headers of the Api Gateway Event, updated in place
+        :param cookies: values of the cookie parameters, by name
+        """
+        if cookies:
+            headers[HEADER_KEY_COOKIE] = "; ".join(
+                f"{name}={quote(str(value), safe=COOKIE_VALUE_SAFE)}"
+                for name, value in cookies.items()
+            )
+
+    def _guard_response_size(
+        self,
+        app: Any,
+        route: Optional[Tuple[str, str]],
+        agent_response: dict,
+        content: dict,
+        status_code: int,
+        operation_name: str,
+    ) -> None:
+        """
+        compact the body of the response if the response is over its size budget.
+
+        :param app: Chalice app, or None
+        :param route: route path and method, or None
+        :param agent_response: Bedrock agent response, updated in place
+        :param content: the dict of the response that holds the body
+        :param status_code: status code of the Chalice response
+        :param operation_name: operation reported to on_compaction
+        """
+        body = content["body"]
+        if not isinstance(body, str):
+            return
+        operation = None
+        if route is not None and hasattr(app, "get_route_operation"):
+            operation = app.get_route_operation(*route)
+        max_bytes = self._max_response_bytes
+        if operation is not None and operation.max_response_bytes is not None:
+            max_bytes = operation.max_response_bytes
+        # JSON escapes a character in 12 bytes at most
+        if max_bytes is None or len(body) * 12 + 1024 <= max_bytes:
+            return
+
+        content["body"] = ""
+        envelope_bytes = len(json.dumps(agent_response))
+        model = None
+        if operation is not None:
+            documented = (operation.responses or {}).get(status_code)
+            model = documented.model if documented is not None else None
+        result = compact_body(body, max_bytes - envelope_bytes, model)
+        content["body"] = result.body
+        if result.compacted and self._on_compaction is not None:
+            self._on_compaction(result, operation_name)
@@ -1,39 +1,36 @@
 from chalice_spec.runtime.models.bedrock_agent import (
     BedrockAgentEventModel,
-    BedrockAgentPropertyModel,
+    BedrockAgentEventView,
 )
 import json
-from chalice_spec.runtime.model_utility.apigw import empty_api_gateway_event
+from chalice_spec.runtime.model_utility.apigw import build_api_gateway_event
 from chalice_spec.runtime.model_utility.bedrock_agent import (
-    empty_bedrock_agent_response,
+    build_bedrock_agent_response,
 )
-from . import EventConverter
+from chalice_spec.runtime.routing import ActionGroupIndex, ParameterIndex, RouteTrie
+from typing import Any, Dict, Optional, Tuple, Union
+from . import ConversionContext
+from .bedrock_agent import HEADER_KEY_CONTENT_TYPE, BedrockAgentConverter
 
-# Header key constant : Content-Type
-HEADER_KEY_CONTENT_TYPE = "content-type"
 
+class BedrockAgentEventToApiGateway(BedrockAgentConverter):
+    """
+    Converter of the events of action groups defined with an OpenAPI schema.
+    """
 
-class BedrockAgentEventToApiGateway(EventConverter):
-    # Content type of the Bedrock Agent event
-    _content_type: str
-
-    def __init__(self, content_type: str = "application/json"):
-        """
-        constructor.
-
-        :param content_type: Content type of the Bedrock Agent event
-        """
-        super().__init__()
-        self._content_type = content_type
-
-    def _parse_value(self, property: BedrockAgentPropertyModel):
+    def _parse_event(
+        self, event: dict, conversion: Optional[ConversionContext]
+    ) -> Union[BedrockAgentEventModel, BedrockAgentEventView]:
         """
-        parse Bedrock Agent Property Model to value.
+        parse event to Bedrock Agent Event lazy view, shared through the conversion context.
 
-        :param property: Bedrock Agent Property Model
-        :return: value
+        :param event: Bedrock Agent Event
+        :param conversion: conversion context of the invocation
+        :return: Bedrock Agent Event view, or model if the event is already validated
         """
-        return property.value
+        if conversion is None:
+            conversion = ConversionContext(event)
+        return conversion.view(BedrockAgentEventView)
 
     def _is_contains_properties(self, agent_event: BedrockAgentEventModel):
         """
@@ -50,53 +47,202 @@ class BedrockAgentEventToApiGateway(EventConverter):
             return True
         return False
 
-    def convert_request(self, event: dict) -> dict:
+    def _match_route(
+        self,
+        app: Any,
+        agent_event: Union[BedrockAgentEventModel, BedrockAgentEventView],
+    ) -> Optional[Tuple[str, Dict[str, str]]]:
+        """
+        match the event against the routes of the app.
+
+        Events of an action group that routes are bound to are matched among
+        the routes of the group, other events against all the routes.
+
+        :param app: Chalice app
+        :param agent_event: Bedrock Agent Event
+        :return: route path and path parameters, or None
+        """
+        action_groups = ActionGroupIndex.for_app(app)
+        if agent_event.action_group in action_groups:
+            return action_groups.match(
+                agent_event.action_group, agent_event.api_path, agent_event.http_method
+            )
+        return RouteTrie.for_app(app).match(agent_event.api_path)
+
+    def _route(
+        self,
+        agent_event: Union[BedrockAgentEventModel, BedrockAgentEventView],
+        match: Optional[Tuple[str, Dict[str, str]]],
+    ) -> Optional[Tuple[str, str]]:
+        """
+        route path and method of a match.
+
+        :param agent_event: Bedrock Agent Event
+        :param match: matched route and path parameters, or None
+        :return: route path and method, or None
+        """
+        return (match[0], agent_event.http_method) if match is not None else None
+
+    def _map_parameters(
+        self,
+        app: Any,
+        agent_event: Union[BedrockAgentEventModel, BedrockAgentEventView],
+        match: Tuple[str, Dict[str, str]],
+        api_gateway_event: dict,
+    ) -> None:
+        """
+        map the parameters of the Bedrock Agent Event to path parameters,
+        query strings, headers and cookies, according to their "in" in the spec.
+
+        :param app: Chalice app
+        :param agent_event: Bedrock Agent Event
+        :param match: route matched by apiPath and its path parameters
+        :param api_gateway_event: Api Gateway Event, updated in place
+        """
+        route, path_parameters = match
+        # The match is kept for the invocation
+        path_parameters = dict(path_parameters)
+        locations = ParameterIndex.for_app(app).locations(
+            route, agent_event.http_method
+        )
+        query_parameters = {}
+        cookies = {}
+        headers = api_gateway_event["headers"]
+        for parameter in agent_event.parameters or []:
+            # Parameters not declared in the spec are sent as query strings
+            location = locations.get(parameter.name, "query")
+            value = self._parse_value(parameter)
+            if location == "path":
+                path_parameters[parameter.name] = value
+            elif location == "header":
+                headers[parameter.name.lower()] = value
+            elif location == "query":
+                query_parameters[parameter.name] = value
+            elif location == "cookie":
+                cookies[parameter.name] = value
+
+        self._map_cookies(headers, cookies)
+        self._map_path(api_gateway_event, route, path_parameters, query_parameters)
+
+    def convert_request(
+        self, event: dict, conversion: Optional[ConversionContext] = None
+    ) -> dict:
         """
         parse event input to other type parameter.
 
         :param event: Bedrock Agent Event
+        :param conversion: conversion context of the invocation
         :return: Api Gateway Event
         """
         # Event dict convert to pydanerics model
-        agent_event = BedrockAgentEventModel.parse_obj(event)
-        # Setup pydantic empty model for api gateway event
-        apigw_event = empty_api_gateway_event()
-        apigw_event.requestContext.httpMethod = agent_event.http_method
-        apigw_event.requestContext.resourcePath = agent_event.api_path
-        apigw_event.headers[HEADER_KEY_CONTENT_TYPE] = self._content_type
+        agent_event = self._parse_event(event, conversion)
+        # Match apiPath against the routes of the app
+        app = conversion.app if conversion is not None else None
+        match = self._matched_route(app, agent_event, conversion)
         # Set event body for chalice
+        properties = {}
         if self._is_contains_properties(agent_event):
-            apigw_event.body = json.dumps(
-                {
-                    prop.name: self._parse_value(prop)
-                    for prop in agent_event.request_body.content[
-                        self._content_type
-                    ].properties
-                }
-            )
-        # Return api gateway event
-        return apigw_event.dict(by_alias=True)
+            props = agent_event.request_body.content[self._content_type].properties
+            plan = self._coercion_plan(app, self._route(agent_event, match))
+            if plan is None:
+                properties = {prop.name: self._parse_value(prop) for prop in props}
+            else:
+                for prop in props:
+                    name = prop.name
+                    # The declared type is read only for properties not in the schema
+                    properties[name] = plan.coerce(
+                        name,
+                        self._parse_value(prop),
+                        None if name in plan else prop.type_,
+                    )
+        if conversion is not None:
+            # Hand over the body in-process, without a JSON round trip
+            conversion.json_body = properties
+            body = None
+            # Session attributes, returned with the response
+            self._open_session(agent_event, conversion)
+        else:
+            body = json.dumps(properties)
+        # Api gateway event, built from the template
+        api_gateway_event = build_api_gateway_event(
+            http_method=agent_event.http_method,
+            resource_path=agent_event.api_path,
+            headers={HEADER_KEY_CONTENT_TYPE: self._content_type},
+            body=body,
+        )
+        # Path parameters and query strings, from the routes of the app
+        if match is not None:
+            self._map_parameters(app, agent_event, match, api_gateway_event)
+        return api_gateway_event
 
-    def convert_response(self, event: dict, response: dict) -> dict:
+    def convert_response(
+        self,
+        event: dict,
+        response: dict,
+        conversion: Optional[ConversionContext] = None,
+    ) -> dict:
         """
         parse event response to other type response.
 
         :param event: Bedrock Agent Event
         :param response: Api Gateway Event that is created by Chalice
+        :param conversion: conversion context of the invocation
         :return: Bedrock Agent Response
         """
         # Event dict convert to pydanerics model
-        agent_event = BedrockAgentEventModel.parse_obj(event)
-        # Setup pydantic empty model for bedrock agent response
-        result = empty_bedrock_agent_response()
-        result.message_version = "1.0"
-        # set from request event
-        result.response.action_group = agent_event.action_group
-        result.response.api_path = agent_event.api_path
-        result.response.http_method = agent_event.http_method
-        # set from chalice response
-        result.response.http_status_code = response["statusCode"]
-        result.response.add_response_body(
-            content_type=self._content_type, body=response["body"]
+        agent_event = self._parse_event(event, conversion)
+        # Bedrock agent response, built from the template
+        agent_response = build_bedrock_agent_response(
+            # set from request event
+            action_group=agent_event.action_group,
+            api_path=agent_event.api_path,
+            http_method=agent_event.http_method,
+            # set from chalice response
+            http_status_code=response["statusCode"],
+            content_type=self._content_type,
+            body=response["body"],
+        )
+        # Return the session attributes, as the handler left them
+        self._close_session(agent_response, conversion)
+        # Keep the response within the payload limit of Bedrock agents
+        app = conversion.app if conversion is not None else None
+        self._guard_response_size(
+            app,
+            self._route(agent_event, self._matched_route(app, agent_event, conversion)),
+            agent_response,
+            agent_response["response"]["responseBody"][self._content_type],
+            response["statusCode"],
+            f"{agent_event.http_method} {agent_event.api_path}",
         )
-        return result.dict(by_alias=True)
+        return agent_response
+
+    def dispatch(
+        self, app: Any, event: dict, context: Any, conversion: ConversionContext
+    ) -> dict:
+        """
+        invoke the app with the event, and return Bedrock Agent Response.
+
+        Events of an action group that routes are bound to are answered with
+        404 when no route of the group matches, instead of being dispatched to
+        a route of another group.
+
+        :param app: ChaliceWithSpec app
+        :param event: Bedrock Agent Event
+        :param context: lambda context
+        :param conversion: conversion context of the invocation
+        :return: Bedrock Agent Response
+        """
+        agent_event = self._parse_event(event, conversion)
+        # Matched once, for the conversions of the request and the response
+        match = self._matched_route(app, agent_event, conversion)
+        if match is None and agent_event.action_group in ActionGroupIndex.for_app(app):
+            # The session attributes are returned as sent
+            self._open_session(agent_event, conversion)
+            body = {
+                "Code": "NotFoundError",
+                "Message": f"Not found in action group {agent_event.action_group}",
+            }
+            return self.convert_response(
+                event, {"statusCode": 404, "body": json.dumps(body)}, conversion
+            )
+        return super().dispatch(app, event, context, conversion)
@@ -0,0 +1,228 @@
+from chalice_spec.runtime.models.bedrock_agent import (
+    BedrockAgentFunctionEventModel,
+    BedrockAgentFunctionEventView,
+)
+import json
+from chalice_spec.runtime.model_utility.apigw import build_api_gateway_event
+from chalice_spec.runtime.model_utility.bedrock_agent import (
+    FUNCTION_RESPONSE_FAILURE,
+    FUNCTION_RESPONSE_REPROMPT,
+    build_bedrock_agent_function_response,
+)
+from chalice_spec.runtime.routing import (
+    ActionGroupIndex,
+    OperationIndex,
+    ParameterIndex,
+)
+from typing import Any, Optional, Tuple, Union
+from . import ConversionContext
+from .bedrock_agent import HEADER_KEY_CONTENT_TYPE, BedrockAgentConverter
+
+# Methods whose parameters not declared in the spec are sent as query strings
+QUERY_METHODS = frozenset(["GET", "HEAD", "DELETE", "OPTIONS"])
+
+
+class BedrockAgentFunctionEventToApiGateway(BedrockAgentConverter):
+    """
+    Converter of the events of action groups defined with function details.
+
+    The function name is resolved to a route like an operationId (see
+    OperationIndex): the operationId of the documented Operation, the
+    generated operationId, or the name of the view function.
+    """
+
+    def _parse_event(
+        self, event: dict, conversion: Optional[ConversionContext]
+    ) -> Union[BedrockAgentFunctionEventModel, BedrockAgentFunctionEventView]:
+        """
+        parse event to Bedrock Agent Function Event lazy view, shared through the conversion context.
+
+        :param event: Bedrock Agent Function Event
+        :param conversion: conversion context of the invocation
+        :return: Bedrock Agent Function Event view, or model if the event is already validated
+        """
+        if conversion is None:
+            conversion = ConversionContext(event)
+        return conversion.view(BedrockAgentFunctionEventView)
+
+    def _match_route(
+        self,
+        app: Any,
+        agent_event: Union[
+            BedrockAgentFunctionEventModel, BedrockAgentFunctionEventView
+        ],
+    ) -> Optional[Tuple[str, str]]:
+        """
+        resolve the function of the event to a route of the app.
+
+        Functions of an action group that routes are bound to are resolved
+        among the routes of the group only.
+
+        :param app: Chalice app
+        :param agent_event: Bedrock Agent Function Event
+        :return: route path and method, or None
+        """
+        route = OperationIndex.for_app(app).get(agent_event.function)
+        if route is None:
+            return None
+        action_groups = ActionGroupIndex.for_app(app)
+        if agent_event.action_group in action_groups and not action_groups.binds(
+            agent_event.action_group, *route
+        ):
+            return None
+        return route
+
+    def convert_request(
+        self, event: dict, conversion: Optional[ConversionContext] = None
+    ) -> dict:
+        """
+        parse event input to other type parameter.
+
+        Each parameter is sent where the spec of the route declares it: path
+        parameter, query string, header or cookie. Other parameters are
+        properties of the JSON body, or query strings for routes that take no
+        body.
+
+        :param event: Bedrock Agent Function Event
+        :param conversion: conversion context of the invocation
+        :return: Api Gateway Event
+        """
+        agent_event = self._parse_event(event, conversion)
+        app = conversion.app if conversion is not None else None
+        route = self._matched_route(app, agent_event, conversion)
+        path, method = route if route is not None else ("/", "POST")
+        locations = (
+            ParameterIndex.for_app(app).locations(path, method)
+            if route is not None
+            else {}
+        )
+        plan = self._coercion_plan(app, route)
+
+        path_parameters = {}
+        query_parameters = {}
+        headers = {HEADER_KEY_CONTENT_TYPE: self._content_type}
+        cookies = {}
+        properties = {}
+        for parameter in agent_event.parameters or []:
+            name = parameter.name
+            value = self._parse_value(parameter)
+            location = locations.get(name)
+            if location is None:
+                if plan is not None and name in plan:
+                    location = "body"
+                else:
+                    location = "query" if method in QUERY_METHODS else "body"
+            if location == "path":
+                path_parameters[name] = value
+            elif location == "header":
+                headers[name.lower()] = value
+            elif location == "query":
+                query_parameters[name] = value
+            elif location == "cookie":
+                cookies[name] = value
+            elif location == "body":
+                if plan is not None:
+                    # The declared type is read only for parameters not in the schema
+                    value = plan.coerce(
+                        name, value, None if name in plan else parameter.type_
+                    )
+                properties[name] = value
+
+        self._map_cookies(headers, cookies)
+        if conversion is not None:
+            # Hand over the body in-process, without a JSON round trip
+            conversion.json_body = properties
+            body = None
+            # Session attributes, returned with the response
+            self._open_session(agent_event, conversion)
+        else:
+            body = json.dumps(properties)
+        # Api gateway event, built from the template
+        api_gateway_event = build_api_gateway_event(
+            http_method=method, resource_path=path, headers=headers, body=body
+        )
+        self._map_path(api_gateway_event, path, path_parameters, query_parameters)
+        return api_gateway_event
+
+    def convert_response(
+        self,
+        event: dict,
+        response: dict,
+        conversion: Optional[ConversionContext] = None,
+    ) -> dict:
+        """
+        parse event response to other type response.
+
+        Client errors ask the user again (REPROMPT), server errors end the
+        conversation (FAILURE).
+
+        :param event: Bedrock Agent Function Event
+        :param response: Api Gateway Event that is created by Chalice
+        :param conversion: conversion context of the invocation
+        :return: Bedrock Agent Function Response
+        """
+        agent_event = self._parse_event(event, conversion)
+        status_code = response["statusCode"]
+        response_state = None
+        if status_code >= 500:
+            response_state = FUNCTION_RESPONSE_FAILURE
+        elif status_code >= 400:
+            response_state = FUNCTION_RESPONSE_REPROMPT
+        agent_response = build_bedrock_agent_function_response(
+            action_group=agent_event.action_group,
+            function=agent_event.function,
+            body=response["body"],
+            response_state=response_state,
+        )
+        # Return the session attributes, as the handler left them
+        self._close_session(agent_response, conversion)
+        # Keep the response within the payload limit of Bedrock agents
+        app = conversion.app if conversion is not None else None
+        self._guard_response_size(
+            app,
+            self._matched_route(app, agent_event, conversion),
+            agent_response,
+            agent_response["response"]["functionResponse"]["responseBody"]["TEXT"],
+            status_code,
+            agent_event.function,
+        )
+        return agent_response
+
+    def dispatch(
+        self, app: Any, event: dict, context: Any, conversion: ConversionContext
+    ) -> dict:
+        """
+        invoke the app with the event, and return Bedrock Agent Function Response.
+
+        Functions that resolve to no route, or to several routes, are answered
+        with FAILURE, instead of being dispatched to a default route.
+
+        :param app: ChaliceWithSpec app
+        :param event: Bedrock Agent Function Event
+        :param context: lambda context
+        :param conversion: conversion context of the invocation
+        :return: Bedrock Agent Function Response
+        """
+        agent_event = self._parse_event(event, conversion)
+        # Resolved once, for the conversions of the request and the response
+        try:
+            route = self._matched_route(app, agent_event, conversion)
+            body = {
+                "Code": "NotFoundError",
+                "Message": f"Unknown function {agent_event.function}",
+            }
+        except ValueError as e:
+            route = None
+            body = {"Code": "BadRequestError", "Message": str(e)}
+        if route is None:
+            agent_response = build_bedrock_agent_function_response(
+                action_group=agent_event.action_group,
+                function=agent_event.function,
+                body=json.dumps(body),
+                response_state=FUNCTION_RESPONSE_FAILURE,
+            )
+            # The session attributes are returned as sent
+            self._open_session(agent_event, conversion)
+            self._close_session(agent_response, conversion)
+            return agent_response
+        return super().dispatch(app, event, context, conversion)
@@ -0,0 +1,140 @@
+from typing import Optional
+from urllib.parse import parse_qs
+
+from chalice_spec.runtime.model_utility.apigw import build_api_gateway_event
+from chalice_spec.runtime.routing import RouteTrie
+from . import ConversionContext, EventConverter
+
+# Route key of HTTP API default routes and Lambda Function URLs
+DEFAULT_ROUTE_KEY = "$default"
+# Header key constant : Cookie, Set-Cookie
+HEADER_KEY_COOKIE = "cookie"
+HEADER_KEY_SET_COOKIE = "set-cookie"
+
+
+class HttpApiEventToApiGateway(EventConverter):
+    """
+    Convert API Gateway HTTP API (payload format version 2.0) and
+    Lambda Function URL events to REST API events, and responses back.
+
+    Bodies are passed through as-is, without any JSON work.
+    """
+
+    def _resolve_route(self, event: dict, conversion: Optional[ConversionContext]):
+        """
+        resolve the Chalice route path and path parameters of the event.
+
+        The route key is used when it names a Chalice route, otherwise the raw
+        path is matched against the routes of the app.
+
+        :param event: HTTP API event
+        :param conversion: conversion context of the invocation
+        :return: route path, path parameters
+        """
+        raw_path = event.get("rawPath") or event["requestContext"]["http"]["path"]
+        app = conversion.app if conversion is not None else None
+
+        route_key = event.get("routeKey", DEFAULT_ROUTE_KEY)
+        if route_key != DEFAULT_ROUTE_KEY:
+            route_path = route_key.partition(" ")[2]
+            if app is None or app.routes.get(route_path):
+                return route_path, event.get("pathParameters")
+
+        if app is not None:
+            matched = RouteTrie.for_app(app).match(raw_path)
+            if matched is not None:
+                return matched
+        return raw_path, event.get("pathParameters")
+
+    def convert_request(
+        self, event: dict, conversion: Optional[ConversionContext] = None
+    ) -> dict:
+        """
+        parse event input to other type parameter.
+
+        :param event: HTTP API Event
+        :param conversion: conversion context of the invocation
+        :return: Api Gateway Event
+        """
+        request_context = event["requestContext"]
+        http = request_context["http"]
+        raw_path = event.get("rawPath") or http["path"]
+        resource_path, path_parameters = self._resolve_route(event, conversion)
+
+        headers = dict(event.get("headers") or {})
+        cookies = event.get("cookies")
+        if cookies:
+            headers[HEADER_KEY_COOKIE] = "; ".join(cookies)
+
+        apigw_event = build_api_gateway_event(
+            http_method=http["method"],
+            resource_path=resource_path,
+            headers=headers,
+            body=event.get("body"),
+        )
+        apigw_event["path"] = raw_path
+        apigw_event["pathParameters"] = path_parameters or None
+        apigw_event["queryStringParameters"] = event.get("queryStringParameters")
+        raw_query_string = event.get("rawQueryString")
+        apigw_event["multiValueQueryStringParameters"] = (
+            parse_qs(raw_query_string, keep_blank_values=True)
+            if raw_query_string
+            else None
+        )
+        apigw_event["stageVariables"] = event.get("stageVariables")
+        apigw_event["isBase64Encoded"] = event.get("isBase64Encoded", False)
+
+        apigw_context = apigw_event["requestContext"]
+        apigw_context["path"] = raw_path
+        apigw_context["accountId"] = request_context.get("accountId", "")
+        apigw_context["apiId"] = request_context.get("apiId", "")
+        apigw_context["authorizer"] = request_context.get("authorizer") or {}
+        apigw_context["domainName"] = request_context.get("domainName")
+        apigw_context["protocol"] = http.get("protocol", "")
+        apigw_context["requestId"] = request_context.get("requestId", "")
+        apigw_context["requestTime"] = request_context.get("time", "")
+        apigw_context["requestTimeEpoch"] = request_context.get("timeEpoch", 0)
+        apigw_context["stage"] = request_context.get("stage", "")
+        apigw_context["identity"]["sourceIp"] = http.get("sourceIp", "0.0.0.0")
+        apigw_context["identity"]["userAgent"] = http.get("userAgent")
+        return apigw_event
+
+    def convert_response(
+        self,
+        event: dict,
+        response: dict,
+        conversion: Optional[ConversionContext] = None,
+    ) -> dict:
+        """
+        parse event response to other type response.
+
+        Multi-value headers are joined with commas, Set-Cookie headers are
+        returned as cookies.
+
+        :param event: HTTP API Event
+        :param response: Api Gateway Event that is created by Chalice
+        :param conversion: conversion context of the invocation
+        :return: HTTP API Response
+        """
+        headers = {}
+        cookies = []
+        for name, value in (response.get("headers") or {}).items():
+            if name.lower() == HEADER_KEY_SET_COOKIE:
+                cookies.append(value)
+            else:
+                headers[name] = value
+        for name, values in (response.get("multiValueHeaders") or {}).items():
+            if name.lower() == HEADER_KEY_SET_COOKIE:
+                cookies.extend(values)
+            else:
+                headers[name] = ",".join(values)
+
+        result = {
+            "statusCode": response["statusCode"],
+            "headers": headers,
+            "body": response.get("body", ""),
+            "isBase64Encoded": response.get("isBase64Encoded", False),
+        }
+        if cookies:
+            result["cookies"] = cookies
+        return result
@@ -0,0 +1,133 @@
+import json
+from types import MappingProxyType
+from typing import Any, Dict, Optional
+
+from chalice.app import BadRequestError, CaseInsensitiveMapping, MultiDict
+from chalice.app import NotFoundError, Response
+from pydantic import BaseModel
+
+from chalice_spec.compat import model_json
+from chalice_spec.runtime.rest_api_handler import PreparsedRequest
+from chalice_spec.runtime.routing import OperationIndex
+from . import ConversionContext, EventConverter
+
+# Headers of RPC requests : the body is JSON
+RPC_REQUEST_HEADERS = MappingProxyType({"content-type": "application/json"})
+
+
+class RpcRequest(PreparsedRequest):
+    """
+    Chalice request of a direct invocation.
+
+    Built from the route and the RPC params only: there is no API Gateway
+    event behind it, to_original_event() returns the RPC event.
+    """
+
+    def __init__(
+        self,
+        event: dict,
+        method: str,
+        path: str,
+        uri_params: Dict[str, str],
+        query_params: Dict[str, Any],
+        json_body: Optional[Any] = None,
+        lambda_context: Optional[Any] = None,
+    ):
+        # Request.__init__ reads an API Gateway event : set the fields directly
+        self.query_params = (
+            MultiDict(
+                {
+                    name: [str(item) for item in value]
+                    if isinstance(value, list)
+                    else [str(value)]
+                    for name, value in query_params.items()
+                }
+            )
+            if query_params
+            else None
+        )
+        self.headers = CaseInsensitiveMapping(RPC_REQUEST_HEADERS)
+        self.uri_params = uri_params or None
+        self.method = method
+        self._is_base64_encoded = False
+        self._body = None
+        self._json_body = json_body
+        self._raw_body = b""
+        self.context = {"httpMethod": method, "resourcePath": path}
+        self.stage_vars = None
+        self.path = path
+        self.lambda_context = lambda_context
+        self._event_dict = event
+
+
+def serialize_result(result: Any) -> Any:
+    """
+    serialize the value returned by a view to a lambda result.
+
+    Strings are JSON bodies, as on the REST path, e.g. a view returning
+    Model(...).json() : they are parsed, unless the Response declares another
+    content type or the string is not JSON.
+
+    :param result: pydantic model, chalice Response, or JSON serializable value
+    :return: JSON serializable value
+    """
+    content_type = "application/json"
+    if isinstance(result, Response):
+        headers = {key.lower(): value for key, value in (result.headers or {}).items()}
+        content_type = headers.get("content-type", content_type)
+        result = result.body
+    if isinstance(result, BaseModel):
+        return json.loads(model_json(result))
+    if isinstance(result, str) and content_type.split(";")[0].strip().endswith("json"):
+        try:
+            return json.loads(result)
+        except ValueError:
+            return result
+    return result
+
+
+class RpcEventToView(EventConverter):
+    """
+    Call the view of an operation directly, from {operationId, params, body}.
+
+    The view is resolved by operationId (documented, or generated from the
+    route, see default_operation_id) or by view function name. Params named
+    after path parameters are the view arguments, the other params are the
+    query strings. No API Gateway event is built, and Chalice middlewares
+    are not run. The result of the view is returned serialized; errors are
+    raised, so that callers (e.g. Step Functions) can catch them by type.
+    """
+
+    def dispatch(
+        self, app: Any, event: dict, context: Any, conversion: ConversionContext
+    ) -> Any:
+        """
+        call the view of the operation, and return its serialized result.
+
+        :param app: ChaliceWithSpec app
+        :param event: RPC event
+        :param context: lambda context
+        :param conversion: conversion context of the invocation
+        :return: serialized result of the view
+        """
+        operation_id = event["operationId"]
+        try:
+            route = OperationIndex.for_app(app).get(operation_id)
+        except ValueError as e:
+            raise BadRequestError(str(e))
+        if route is None:
+            raise NotFoundError(f"Unknown operationId: {operation_id}")
+        path, method = route
+        entry = app.routes[path][method]
+
+        params = dict(event.get("params") or {})
+        missing = [name for name in entry.view_args if name not in params]
+        if missing:
+            raise BadRequestError(f"Missing params: {', '.join(missing)}")
+        uri_params = {name: str(params.pop(name)) for name in entry.view_args}
+
+        app.lambda_context = context
+        app.current_request = RpcRequest(
+            event, method, path, uri_params, params, event.get("body"), context
+        )
+        return serialize_result(entry.view_function(**uri_params))
@@ -0,0 +1,56 @@
+from http import HTTPStatus
+from types import MappingProxyType
+from typing import Optional
+
+from chalice_spec.runtime.converter import ConversionContext, parses_as
+
+
+def is_alb_event(
+    event: dict, strict: bool = False, conversion: Optional[ConversionContext] = None
+) -> bool:
+    """
+    Check event is application load balancer event.
+
+    By default the event is classified from its shape only: the
+    requestContext of an ALB event has elb, and the event has httpMethod and
+    path. Set strict to validate the whole event with pydantic after the
+    shape check; the parsed model is kept in the conversion context for the
+    converters.
+    """
+    if not isinstance(event, dict) or "httpMethod" not in event or "path" not in event:
+        return False
+    request_context = event.get("requestContext")
+    if not isinstance(request_context, dict) or "elb" not in request_context:
+        return False
+    if not strict:
+        return True
+
+    from chalice_spec.runtime.models.alb import ALBEventModel
+
+    return parses_as(event, ALBEventModel, conversion)
+
+
+# Status description of each status code, e.g. 200 -> "200 OK"
+ALB_STATUS_DESCRIPTIONS = MappingProxyType(
+    {status.value: f"{status.value} {status.phrase}" for status in HTTPStatus}
+)
+
+# Immutable template of an application load balancer response
+ALB_RESPONSE_TEMPLATE = MappingProxyType(
+    {
+        "statusCode": 200,
+        "statusDescription": ALB_STATUS_DESCRIPTIONS[200],
+        "isBase64Encoded": False,
+        "body": "",
+    }
+)
+
+
+def alb_status_description(status_code: int) -> str:
+    """
+    Status description of the ALB response, e.g. 200 -> "200 OK".
+    """
+    description = ALB_STATUS_DESCRIPTIONS.get(status_code)
+    if description is None:
+        description = str(status_code)
+    return description
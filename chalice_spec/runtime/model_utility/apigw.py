@@ -1,37 +1,62 @@
-from chalice_spec.runtime.models.apigw import APIGatewayProxyEventModel
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Dict, Optional
 
+from chalice_spec.runtime.converter import ConversionContext, parses_as
 
-def is_api_gateway_event(event: dict) -> bool:
+# Models are imported on first use : detection by shape does not need pydantic
+if TYPE_CHECKING:
+    from chalice_spec.runtime.models.apigw import APIGatewayProxyEventModel
+
+
+def is_api_gateway_event(
+    event: dict, strict: bool = False, conversion: Optional[ConversionContext] = None
+) -> bool:
     """
     Check event is api gateway event.
+
+    By default the event is classified from its shape only: an API Gateway
+    (REST API) proxy event has a requestContext with httpMethod and
+    resourcePath, and carries headers. Set strict to validate the whole
+    event with pydantic after the shape check; the parsed model is kept in
+    the conversion context for the converters.
     """
-    try:
-        APIGatewayProxyEventModel.parse_obj(event)
-        return True
-    except Exception:
-        # throw pydantic -> event is not API Gateway Event
+    if not isinstance(event, dict) or "headers" not in event:
+        return False
+    request_context = event.get("requestContext")
+    if (
+        not isinstance(request_context, dict)
+        or "httpMethod" not in request_context
+        or "resourcePath" not in request_context
+    ):
         return False
+    if not strict:
+        return True
+    from chalice_spec.runtime.models.apigw import APIGatewayProxyEventModel
 
+    return parses_as(event, APIGatewayProxyEventModel, conversion)
 
-def empty_api_gateway_event() -> APIGatewayProxyEventModel:
-    """
-    Create empty api gateway event.
-    """
-    return APIGatewayProxyEventModel.parse_obj(
-        {
-            "resource": "",
-            "path": "",
-            "httpMethod": "GET",
-            "headers": {},
-            "multiValueHeaders": {},
-            "queryStringParameters": {},
-            "multiValueQueryStringParameters": {},
-            "requestContext": {
+
+# Immutable template of an API Gateway (REST API) proxy event.
+# Nested mappings are read-only too, build_api_gateway_event copies the parts
+# that are filled in per request.
+API_GATEWAY_EVENT_TEMPLATE = MappingProxyType(
+    {
+        "resource": "",
+        "path": "",
+        "httpMethod": "GET",
+        "headers": MappingProxyType({}),
+        "multiValueHeaders": MappingProxyType({}),
+        "queryStringParameters": MappingProxyType({}),
+        "multiValueQueryStringParameters": MappingProxyType({}),
+        "pathParameters": None,
+        "stageVariables": None,
+        "requestContext": MappingProxyType(
+            {
                 "accountId": "",
                 "apiId": "",
-                "authorizer": {},
+                "authorizer": MappingProxyType({}),
                 "httpMethod": "GET",
-                "identity": {"sourceIp": "0.0.0.0"},
+                "identity": MappingProxyType({"sourceIp": "0.0.0.0"}),
                 "path": "",
                 "protocol": "",
                 "requestId": "",
@@ -39,8 +64,54 @@ def empty_api_gateway_event() -> APIGatewayProxyEventModel:
                 "requestTimeEpoch": 0,
                 "resourcePath": "",
                 "stage": "",
-            },
-            "body": "{}",
-            "isBase64Encoded": False,
-        }
-    )
+            }
+        ),
+        "body": "{}",
+        "isBase64Encoded": False,
+    }
+)
+
+
+def build_api_gateway_event(
+    http_method: str = "GET",
+    resource_path: str = "",
+    headers: Optional[Dict[str, str]] = None,
+    body: Optional[str] = "{}",
+) -> dict:
+    """
+    Create api gateway event from the template with plain dict operations.
+
+    :param http_method: http method of the request
+    :param resource_path: resource path of the route, e.g. /posts/{id}
+    :param headers: request headers, the dict is used as-is
+    :param body: request body
+    :return: api gateway event
+    """
+    request_context = dict(API_GATEWAY_EVENT_TEMPLATE["requestContext"])
+    request_context["authorizer"] = {}
+    request_context["identity"] = dict(request_context["identity"])
+    request_context["httpMethod"] = http_method
+    request_context["resourcePath"] = resource_path
+    request_context["path"] = resource_path
+
+    event = dict(API_GATEWAY_EVENT_TEMPLATE)
+    event["resource"] = resource_path
+    event["path"] = resource_path
+    event["httpMethod"] = http_method
+    event["headers"] = {} if headers is None else headers
+    event["multiValueHeaders"] = {}
+    event["queryStringParameters"] = {}
+    event["multiValueQueryStringParameters"] = {}
+    event["requestContext"] = request_context
+    event["body"] = body
+    return event
+
+
+def empty_api_gateway_event() -> "APIGatewayProxyEventModel":
+    """
+    Create empty api gateway event.
+    """
+    from chalice_spec.compat import parse_model
+    from chalice_spec.runtime.models.apigw import APIGatewayProxyEventModel
+
+    return parse_model(APIGatewayProxyEventModel, build_api_gateway_event())
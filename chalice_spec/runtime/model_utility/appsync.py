@@ -0,0 +1,31 @@
+from typing import Optional
+
+from chalice_spec.runtime.converter import ConversionContext, parses_as
+
+
+def is_appsync_batch_event(
+    event: list, strict: bool = False, conversion: Optional[ConversionContext] = None
+) -> bool:
+    """
+    Check event is appsync batch invoke event.
+
+    By default the event is classified from its shape only: a BatchInvoke
+    event is a list of resolver contexts, with the arguments and the info of
+    the resolved field. Set strict to validate the whole event with pydantic
+    after the shape check; the parsed model is kept in the conversion context
+    for the converters.
+    """
+    if not isinstance(event, list) or not event:
+        return False
+    first = event[0]
+    if not isinstance(first, dict) or "arguments" not in first:
+        return False
+    info = first.get("info")
+    if not isinstance(info, dict) or "fieldName" not in info:
+        return False
+    if not strict:
+        return True
+
+    from chalice_spec.runtime.models.appsync import AppSyncBatchEventModel
+
+    return parses_as(event, AppSyncBatchEventModel, conversion)
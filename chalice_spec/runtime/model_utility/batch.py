@@ -0,0 +1,34 @@
+from typing import Optional
+
+from chalice_spec.runtime.converter import ConversionContext, parses_as
+
+# Event sources of the batch events
+BATCH_EVENT_SOURCES = frozenset(["aws:sqs", "aws:kinesis", "aws:dynamodb"])
+
+
+def is_batch_event(
+    event: dict, strict: bool = False, conversion: Optional[ConversionContext] = None
+) -> bool:
+    """
+    Check event is sqs, kinesis or dynamodb streams batch event.
+
+    By default the event is classified from its shape only: the first of the
+    Records comes from one of the batch event sources. Set strict to validate
+    the whole event with pydantic after the shape check; the parsed model is
+    kept in the conversion context for the converters.
+    """
+    if not isinstance(event, dict):
+        return False
+    records = event.get("Records")
+    if not isinstance(records, list) or not records:
+        return False
+    if not isinstance(records[0], dict):
+        return False
+    if records[0].get("eventSource") not in BATCH_EVENT_SOURCES:
+        return False
+    if not strict:
+        return True
+
+    from chalice_spec.runtime.models.batch import BatchEventModel
+
+    return parses_as(event, BatchEventModel, conversion)
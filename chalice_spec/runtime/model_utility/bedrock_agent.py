@@ -1,26 +1,82 @@
-from chalice_spec.runtime.models.bedrock_agent import (
-    BedrockAgentEventModel,
-    BedrockAgentResponseModel,
-)
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Optional
+
+from chalice_spec.runtime.converter import ConversionContext, parses_as
+
+# Models are imported on first use : detection by shape does not need pydantic
+if TYPE_CHECKING:
+    from chalice_spec.runtime.models.bedrock_agent import (
+        BedrockAgentEventModel,
+        BedrockAgentResponseModel,
+    )
+
+# Function response states : the agent stops, or asks the user again
+FUNCTION_RESPONSE_FAILURE = "FAILURE"
+FUNCTION_RESPONSE_REPROMPT = "REPROMPT"
 
 
-def is_bedrock_agent_event(event: dict) -> bool:
+def is_bedrock_agent_event(
+    event: dict, strict: bool = False, conversion: Optional[ConversionContext] = None
+) -> bool:
     """
     Check event is bedrock agent event.
+
+    By default the event is classified from its shape only: a Bedrock agent
+    event has messageVersion and actionGroup, plus the apiPath of the called
+    operation. Set strict to validate the whole event with pydantic after
+    the shape check; the parsed model is kept in the conversion context for
+    the converters.
     """
-    try:
-        BedrockAgentEventModel.parse_obj(event)
+    if (
+        not isinstance(event, dict)
+        or "messageVersion" not in event
+        or "actionGroup" not in event
+        or "apiPath" not in event
+    ):
+        return False
+    if not strict:
         return True
-    except Exception:
-        # throw pydantic -> event is not Bedrock Agent Event
+    from chalice_spec.runtime.models.bedrock_agent import BedrockAgentEventModel
+
+    return parses_as(event, BedrockAgentEventModel, conversion)
+
+
+def is_bedrock_agent_function_event(
+    event: dict, strict: bool = False, conversion: Optional[ConversionContext] = None
+) -> bool:
+    """
+    Check event is bedrock agent function details event.
+
+    By default the event is classified from its shape only: the event of an
+    action group defined with function details has messageVersion and
+    actionGroup, plus the name of the called function. Set strict to
+    validate the whole event with pydantic after the shape check.
+    """
+    if (
+        not isinstance(event, dict)
+        or "messageVersion" not in event
+        or "actionGroup" not in event
+        or "function" not in event
+    ):
         return False
+    if not strict:
+        return True
+    from chalice_spec.runtime.models.bedrock_agent import (
+        BedrockAgentFunctionEventModel,
+    )
+
+    return parses_as(event, BedrockAgentFunctionEventModel, conversion)
 
 
-def empty_bedrock_agent_event() -> BedrockAgentEventModel:
+def empty_bedrock_agent_event() -> "BedrockAgentEventModel":
     """
     Create empty bedrock agent event.
     """
-    return BedrockAgentEventModel.parse_obj(
+    from chalice_spec.compat import parse_model
+    from chalice_spec.runtime.models.bedrock_agent import BedrockAgentEventModel
+
+    return parse_model(
+        BedrockAgentEventModel,
         {
             "messageVersion": "1.0",
             "agent": {
@@ -36,23 +92,95 @@ def empty_bedrock_agent_event() -> BedrockAgentEventModel:
             "httpMethod": "",
             "parameters": [],
             "requestBody": {"content": {}},
-        }
+        },
     )
 
 
-def empty_bedrock_agent_response() -> BedrockAgentResponseModel:
-    """
-    Create empty bedrock agent response.
-    """
-    return BedrockAgentResponseModel.parse_obj(
-        {
-            "messageVersion": "1.0",
-            "response": {
+# Immutable template of a bedrock agent response
+BEDROCK_AGENT_RESPONSE_TEMPLATE = MappingProxyType(
+    {
+        "messageVersion": "1.0",
+        "response": MappingProxyType(
+            {
                 "actionGroup": "",
                 "apiPath": "",
                 "httpMethod": "",
                 "httpStatusCode": 0,
-                "responseBody": {},
-            },
-        }
+                "responseBody": MappingProxyType({}),
+                "sessionAttributes": None,
+                "promptSessionAttributes": None,
+            }
+        ),
+    }
+)
+
+
+def build_bedrock_agent_response(
+    action_group: str = "",
+    api_path: str = "",
+    http_method: str = "",
+    http_status_code: int = 0,
+    content_type: Optional[str] = None,
+    body: str = "",
+) -> dict:
+    """
+    Create bedrock agent response from the template with plain dict operations.
+
+    :param action_group: name of the action group
+    :param api_path: path to the API operation
+    :param http_method: method of the API operation
+    :param http_status_code: status code
+    :param content_type: content type of the response body, None is no body
+    :param body: response body
+    :return: bedrock agent response
+    """
+    response = dict(BEDROCK_AGENT_RESPONSE_TEMPLATE["response"])
+    response["actionGroup"] = action_group
+    response["apiPath"] = api_path
+    response["httpMethod"] = http_method
+    response["httpStatusCode"] = http_status_code
+    response["responseBody"] = (
+        {} if content_type is None else {content_type: {"body": body}}
     )
+
+    result = dict(BEDROCK_AGENT_RESPONSE_TEMPLATE)
+    result["response"] = response
+    return result
+
+
+def empty_bedrock_agent_response() -> "BedrockAgentResponseModel":
+    """
+    Create empty bedrock agent response.
+    """
+    from chalice_spec.compat import parse_model
+    from chalice_spec.runtime.models.bedrock_agent import BedrockAgentResponseModel
+
+    return parse_model(BedrockAgentResponseModel, build_bedrock_agent_response())
+
+
+def build_bedrock_agent_function_response(
+    action_group: str = "",
+    function: str = "",
+    body: str = "",
+    response_state: Optional[str] = None,
+) -> dict:
+    """
+    Create bedrock agent function details response.
+
+    :param action_group: name of the action group
+    :param function: name of the function
+    :param body: response body, sent to the agent as TEXT
+    :param response_state: FAILURE or REPROMPT, None on success
+    :return: bedrock agent response
+    """
+    function_response = {"responseBody": {"TEXT": {"body": body}}}
+    if response_state is not None:
+        function_response["responseState"] = response_state
+    return {
+        "messageVersion": "1.0",
+        "response": {
+            "actionGroup": action_group,
+            "function": function,
+            "functionResponse": function_response,
+        },
+    }
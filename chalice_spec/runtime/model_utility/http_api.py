@@ -0,0 +1,30 @@
+from typing import Optional
+
+from chalice_spec.runtime.converter import ConversionContext, parses_as
+
+
+def is_http_api_event(
+    event: dict, strict: bool = False, conversion: Optional[ConversionContext] = None
+) -> bool:
+    """
+    Check event is api gateway http api (payload v2.0) or lambda function url event.
+
+    By default the event is classified from its shape only: the payload
+    version is 2.0, and the requestContext has an http method. Set strict to
+    validate the whole event with pydantic after the shape check; the parsed
+    model is kept in the conversion context for the converters.
+    """
+    if not isinstance(event, dict) or event.get("version") != "2.0":
+        return False
+    request_context = event.get("requestContext")
+    if not isinstance(request_context, dict):
+        return False
+    http = request_context.get("http")
+    if not isinstance(http, dict) or "method" not in http:
+        return False
+    if not strict:
+        return True
+
+    from chalice_spec.runtime.models.http_api import HttpApiProxyEventModel
+
+    return parses_as(event, HttpApiProxyEventModel, conversion)
@@ -0,0 +1,29 @@
+from typing import Optional
+
+from chalice_spec.runtime.converter import ConversionContext, parses_as
+
+# Keys of an RPC event
+RPC_EVENT_KEYS = frozenset(["operationId", "params", "body"])
+
+
+def is_rpc_event(
+    event: dict, strict: bool = False, conversion: Optional[ConversionContext] = None
+) -> bool:
+    """
+    Check event is direct invoke (RPC) event.
+
+    By default the event is classified from its shape only: an RPC event has
+    a string operationId, and only the keys operationId, params and body.
+    Set strict to validate the whole event with pydantic after the shape
+    check; the parsed model is kept in the conversion context.
+    """
+    if not isinstance(event, dict) or not isinstance(event.get("operationId"), str):
+        return False
+    if not RPC_EVENT_KEYS.issuperset(event):
+        return False
+    if not strict:
+        return True
+
+    from chalice_spec.runtime.models.rpc import RpcEventModel
+
+    return parses_as(event, RpcEventModel, conversion)
@@ -0,0 +1,40 @@
+from typing import Dict, List, Optional
+
+from pydantic import BaseModel, Field
+
+from chalice_spec.runtime.models.lazy import LazyEventView
+
+
+class ALBRequestContextElb(BaseModel):
+    targetGroupArn: str
+
+
+class ALBRequestContext(BaseModel):
+    elb: ALBRequestContextElb
+
+
+class ALBEventModel(BaseModel):
+    """
+    Application Load Balancer event.
+
+    headers and queryStringParameters are set by target groups in single-value
+    mode, multiValueHeaders and multiValueQueryStringParameters in multi-value mode.
+    """
+
+    requestContext: ALBRequestContext
+    httpMethod: str
+    path: str
+    headers: Optional[Dict[str, str]] = None
+    multiValueHeaders: Optional[Dict[str, List[str]]] = None
+    queryStringParameters: Optional[Dict[str, str]] = None
+    multiValueQueryStringParameters: Optional[Dict[str, List[str]]] = None
+    body: Optional[str] = None
+    isBase64Encoded: bool = Field(False)
+
+
+class ALBEventView(LazyEventView):
+    """
+    Lazy, read-only view of ALBEventModel
+    """
+
+    __model__ = ALBEventModel
@@ -1,7 +1,10 @@
 from datetime import datetime
 from typing import Any, Dict, List, Optional, Type, Union
 
-from pydantic import BaseModel, root_validator, Field
+from pydantic import BaseModel, Field
+
+from chalice_spec.compat import empty_string_as, model_check
+from chalice_spec.runtime.models.lazy import LazyEventView
 
 
 class ApiGatewayUserCertValidity(BaseModel):
@@ -65,14 +68,13 @@ class APIGatewayEventRequestContext(BaseModel):
     routeKey: Optional[str] = None
     operationName: Optional[str] = None
 
-    @root_validator(allow_reuse=True, skip_on_failure=True)
+    @model_check
     def check_message_id(cls, values):
         message_id, event_type = values.get("messageId"), values.get("eventType")
         if message_id is not None and event_type != "MESSAGE":
             raise ValueError(
                 "messageId is available only when the `eventType` is `MESSAGE`"
             )
-        return values
 
 
 class APIGatewayProxyEventModel(BaseModel):
@@ -86,6 +88,14 @@ class APIGatewayProxyEventModel(BaseModel):
     multiValueQueryStringParameters: Optional[Dict[str, List[str]]] = None
     requestContext: APIGatewayEventRequestContext
     pathParameters: Optional[Dict[str, str]] = None
-    stageVariables: Optional[Dict[str, str]] = None
+    stageVariables: empty_string_as(Optional[Dict[str, str]], dict) = None
     isBase64Encoded: bool = Field(False)
     body: Optional[Union[str, Type[BaseModel]]] = None
+
+
+class APIGatewayProxyEventView(LazyEventView):
+    """
+    Lazy, read-only view of APIGatewayProxyEventModel
+    """
+
+    __model__ = APIGatewayProxyEventModel
@@ -0,0 +1,46 @@
+from typing import Any, Dict, List, Optional
+
+from pydantic import BaseModel, Field
+
+from chalice_spec.compat import PYDANTIC_V2, RootModel
+
+
+class AppSyncInfoModel(BaseModel):
+    # Name of the resolved field
+    fieldName: str
+    # Name of the parent type of the field, e.g. Query, Mutation
+    parentTypeName: str
+    variables: Dict[str, Any] = Field({})
+    selectionSetList: List[str] = Field([])
+    selectionSetGraphQL: Optional[str] = None
+
+
+class AppSyncResolverEventModel(BaseModel):
+    """
+    Resolver context of AppSync direct lambda resolvers
+    """
+
+    arguments: Dict[str, Any] = Field({})
+    identity: Optional[Dict[str, Any]] = None
+    source: Optional[Dict[str, Any]] = None
+    request: Optional[Dict[str, Any]] = None
+    prev: Optional[Dict[str, Any]] = None
+    info: AppSyncInfoModel
+    stash: Dict[str, Any] = Field({})
+
+
+if PYDANTIC_V2:
+
+    class AppSyncBatchEventModel(RootModel[List[AppSyncResolverEventModel]]):
+        """
+        AppSync BatchInvoke event : a list of resolver contexts
+        """
+
+else:
+
+    class AppSyncBatchEventModel(BaseModel):
+        """
+        AppSync BatchInvoke event : a list of resolver contexts
+        """
+
+        __root__: List[AppSyncResolverEventModel]
@@ -0,0 +1,37 @@
+from typing import Any, Dict, List, Optional
+
+from pydantic import BaseModel, Field
+
+
+class BatchEventRecordModel(BaseModel):
+    """
+    Record of an SQS, Kinesis or DynamoDB Streams batch
+    """
+
+    # aws:sqs, aws:kinesis or aws:dynamodb
+    eventSource: str
+
+
+class BatchEventModel(BaseModel):
+    """
+    SQS, Kinesis or DynamoDB Streams batch event
+    """
+
+    Records: List[BatchEventRecordModel]
+
+
+class BatchMessageModel(BaseModel):
+    """
+    Message carried by each record of a batch : the request to a documented route.
+
+    The body is validated with the request model of the route's Operation.
+    """
+
+    # http method of the route
+    method: str = Field("POST")
+    # route path, e.g. /orders/{id}, or concrete path, e.g. /orders/1
+    path: str
+    # request body
+    body: Any = None
+    # request headers
+    headers: Optional[Dict[str, str]] = None
@@ -2,6 +2,8 @@ from typing import Dict, List, Optional
 
 from pydantic import BaseModel, Field
 
+from chalice_spec.runtime.models.lazy import LazyEventView
+
 
 class BedrockAgentModel(BaseModel):
     name: str
@@ -111,3 +113,47 @@ class BedrockAgentResponseModel(BaseModel):
     message_version: str = Field(..., alias="messageVersion")
     # Contains the following information about the API response.
     response: BedrockAgentResponseParameterModel
+    # (Optional) sessionAttributes – Session attributes of the next turns.
+    session_attributes: Optional[Dict[str, str]] = Field(
+        None, alias="sessionAttributes"
+    )
+    # (Optional) promptSessionAttributes – Prompt attributes of the next turn.
+    prompt_session_attributes: Optional[Dict[str, str]] = Field(
+        None, alias="promptSessionAttributes"
+    )
+
+
+class BedrockAgentEventView(LazyEventView):
+    """
+    Lazy, read-only view of BedrockAgentEventModel
+    """
+
+    __model__ = BedrockAgentEventModel
+
+
+class BedrockAgentFunctionEventModel(BaseModel):
+    """
+    Bedrock agent event of an action group defined with function details
+    """
+
+    message_version: str = Field(..., alias="messageVersion")
+    input_text: str = Field(..., alias="inputText")
+    session_id: str = Field(..., alias="sessionId")
+    action_group: str = Field(..., alias="actionGroup")
+    # function – The name of the function, as defined in the function details.
+    function: str
+    session_attributes: Dict[str, str] = Field({}, alias="sessionAttributes")
+    prompt_session_attributes: Dict[str, str] = Field(
+        {}, alias="promptSessionAttributes"
+    )
+    agent: BedrockAgentModel
+    # parameters – The name, type, and value of the parameters of the function.
+    parameters: Optional[List[BedrockAgentPropertyModel]] = None
+
+
+class BedrockAgentFunctionEventView(LazyEventView):
+    """
+    Lazy, read-only view of BedrockAgentFunctionEventModel
+    """
+
+    __model__ = BedrockAgentFunctionEventModel
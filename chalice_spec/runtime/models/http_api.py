@@ -0,0 +1,54 @@
+from typing import Any, Dict, List, Optional
+
+from pydantic import BaseModel, Field
+
+from chalice_spec.runtime.models.lazy import LazyEventView
+
+
+class HttpApiRequestContextHttp(BaseModel):
+    method: str
+    path: str
+    protocol: Optional[str] = None
+    sourceIp: Optional[str] = None
+    userAgent: Optional[str] = None
+
+
+class HttpApiRequestContext(BaseModel):
+    accountId: Optional[str] = None
+    apiId: Optional[str] = None
+    authorizer: Optional[Dict[str, Any]] = None
+    domainName: Optional[str] = None
+    domainPrefix: Optional[str] = None
+    http: HttpApiRequestContextHttp
+    requestId: Optional[str] = None
+    routeKey: Optional[str] = None
+    stage: Optional[str] = None
+    time: Optional[str] = None
+    timeEpoch: Optional[int] = None
+
+
+class HttpApiProxyEventModel(BaseModel):
+    """
+    API Gateway HTTP API (payload format version 2.0) and Lambda Function URL event
+    """
+
+    version: str
+    routeKey: str = Field("$default")
+    rawPath: str
+    rawQueryString: str = Field("")
+    cookies: Optional[List[str]] = None
+    headers: Dict[str, str] = Field({})
+    queryStringParameters: Optional[Dict[str, str]] = None
+    pathParameters: Optional[Dict[str, str]] = None
+    stageVariables: Optional[Dict[str, str]] = None
+    requestContext: HttpApiRequestContext
+    body: Optional[str] = None
+    isBase64Encoded: bool = Field(False)
+
+
+class HttpApiProxyEventView(LazyEventView):
+    """
+    Lazy, read-only view of HttpApiProxyEventModel
+    """
+
+    __model__ = HttpApiProxyEventModel
@@ -0,0 +1,117 @@
+from functools import lru_cache
+from typing import Any, Dict, Type
+
+from pydantic import BaseModel
+
+from chalice_spec.compat import ModelField, model_fields, parse_model
+
+
+class LazyEventView:
+    """
+    Read-only view over a raw lambda event.
+
+    The view exposes the fields of a pydantic model, by name or by alias, but
+    validates a field only the first time it is read. Nested models are
+    returned as views too, so identity, authorizer or client certificate
+    information is never validated unless a handler reads it.
+
+    Root validators of the model are not run, use to_model() for a fully
+    validated model.
+
+    Example:
+        class APIGatewayProxyEventView(LazyEventView):
+            __model__ = APIGatewayProxyEventModel
+
+        view = APIGatewayProxyEventView(event)
+        view.requestContext.httpMethod
+    """
+
+    # pydantic model that defines the fields of the view
+    __model__: Type[BaseModel] = BaseModel
+
+    def __init__(self, raw: Dict[str, Any]):
+        """
+        constructor.
+
+        :param raw: raw lambda event, or nested part of it
+        """
+        object.__setattr__(self, "_raw", raw)
+
+    def __getattr__(self, name: str) -> Any:
+        field = _fields_by_name(self.__model__).get(name)
+        if field is None:
+            raise AttributeError(
+                f"'{type(self).__name__}' object has no attribute '{name}'"
+            )
+        value = self._validate_field(field)
+        # Cache on the instance : the next access skips __getattr__
+        self.__dict__[field.name] = value
+        self.__dict__[field.alias] = value
+        return value
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError(f"'{type(self).__name__}' is read-only")
+
+    def __delattr__(self, name: str) -> None:
+        raise AttributeError(f"'{type(self).__name__}' is read-only")
+
+    def _validate_field(self, field: ModelField) -> Any:
+        """
+        validate one field of the raw event.
+
+        :param field: field of the model
+        :return: validated value
+        """
+        if field.alias not in self._raw:
+            if field.required:
+                raise field.missing_error()
+            return field.get_default()
+
+        value = self._raw[field.alias]
+        if isinstance(value, dict) and _is_model(field.annotation):
+            return lazy_view(field.annotation)(value)
+
+        return field.validate(value)
+
+    def to_model(self) -> BaseModel:
+        """
+        validate the whole event.
+
+        :return: pydantic model
+        """
+        return parse_model(self.__model__, self._raw)
+
+    def to_raw(self) -> Dict[str, Any]:
+        """
+        raw event of the view.
+
+        :return: raw lambda event
+        """
+        return self._raw
+
+
+def _is_model(type_: Any) -> bool:
+    return isinstance(type_, type) and issubclass(type_, BaseModel)
+
+
+@lru_cache(maxsize=None)
+def _fields_by_name(model: Type[BaseModel]) -> Dict[str, ModelField]:
+    """
+    fields of the model, by field name and by alias.
+    """
+    fields = {}
+    for field in model_fields(model).values():
+        fields[field.alias] = field
+        fields[field.name] = field
+    return fields
+
+
+@lru_cache(maxsize=None)
+def lazy_view(model: Type[BaseModel]) -> Type[LazyEventView]:
+    """
+    Create the lazy view class of a pydantic model.
+
+    :param model: pydantic model
+    :return: view class
+    """
+    return type(f"{model.__name__}View", (LazyEventView,), {"__model__": model})
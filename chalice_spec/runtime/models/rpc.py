@@ -0,0 +1,25 @@
+from typing import Any, Dict
+
+from pydantic import BaseModel, Field
+
+from chalice_spec.compat import PYDANTIC_V2
+
+
+class RpcEventModel(BaseModel):
+    """
+    Direct invocation of an operation: {operationId, params, body}
+    """
+
+    # operationId of the route, or name of its view function
+    operationId: str
+    # Path parameters and query strings of the operation
+    params: Dict[str, Any] = Field({})
+    # Request JSON body of the operation
+    body: Any = None
+
+    if PYDANTIC_V2:
+        model_config = {"extra": "forbid"}
+    else:
+
+        class Config:
+            extra = "forbid"
@@ -0,0 +1,147 @@
+from importlib import import_module
+from typing import Any, Callable, Dict, Optional, Type, Union
+
+from chalice_spec.runtime.converter import ConversionContext, EventConverter
+
+# Entry point group for third-party runtimes.
+# Each entry point is named after the runtime, and loads a RuntimeDefinition.
+#
+#   [tool.poetry.plugins."chalice_spec.runtimes"]
+#   "my-runtime" = "my_package.runtime:my_runtime_definition"
+ENTRY_POINT_GROUP = "chalice_spec.runtimes"
+
+# Event detector : (event, strict, conversion) -> bool
+EventDetector = Callable[[dict, bool, Optional[ConversionContext]], bool]
+
+
+def _import_object(path: str) -> Any:
+    """
+    import object from "package.module:attribute" path.
+    """
+    module_name, _, attribute = path.partition(":")
+    return getattr(import_module(module_name), attribute)
+
+
+def _entry_points(group: str):
+    try:
+        from importlib.metadata import entry_points
+    except ImportError:  # pragma: no cover (Python 3.7)
+        try:
+            from importlib_metadata import entry_points
+        except ImportError:
+            return []
+    found = entry_points()
+    if hasattr(found, "select"):
+        return found.select(group=group)
+    return found.get(group, [])
+
+
+class RuntimeDefinition:
+    """
+    A runtime that can invoke a chalice-spec app: a detector that recognizes
+    its events, and an EventConverter subclass that converts them from and to
+    API Gateway events.
+
+    Detector and converter may be given as "package.module:attribute" paths,
+    so that they are imported only the first time they are needed.
+    A runtime without converter receives API Gateway events as-is.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        detector: Union[str, EventDetector],
+        converter: Union[str, Type[EventConverter], None] = None,
+    ):
+        """
+        constructor.
+
+        :param name: runtime name
+        :param detector: event detector, or import path of it
+        :param converter: EventConverter subclass, or import path of it
+        """
+        self.name = name
+        self._detector = detector
+        self._converter = converter
+
+    def detect(
+        self,
+        event: dict,
+        strict: bool = False,
+        conversion: Optional[ConversionContext] = None,
+    ) -> bool:
+        """
+        check event is sent by this runtime.
+        """
+        if isinstance(self._detector, str):
+            self._detector = _import_object(self._detector)
+        return self._detector(event, strict, conversion)
+
+    @property
+    def has_converter(self) -> bool:
+        return self._converter is not None
+
+    def create_converter(self) -> EventConverter:
+        """
+        create converter for one invocation, import it on first use.
+        """
+        if self._converter is None:
+            return EventConverter()
+        if isinstance(self._converter, str):
+            self._converter = _import_object(self._converter)
+        return self._converter()
+
+
+class RuntimeRegistry:
+    """
+    Registry of the runtimes, by name.
+
+    Runtimes that are not registered are looked up in the
+    "chalice_spec.runtimes" entry point group.
+    """
+
+    def __init__(self):
+        self._runtimes: Dict[str, RuntimeDefinition] = {}
+
+    def register(self, definition: RuntimeDefinition) -> RuntimeDefinition:
+        """
+        register runtime, replace the runtime of the same name.
+        """
+        self._runtimes[definition.name] = definition
+        return definition
+
+    def get(self, name: str) -> RuntimeDefinition:
+        """
+        get runtime by name.
+
+        :param name: runtime name
+        :return: runtime definition
+        """
+        definition = self._runtimes.get(name)
+        if definition is None:
+            for entry_point in _entry_points(ENTRY_POINT_GROUP):
+                if entry_point.name == name:
+                    definition = self.register(entry_point.load())
+                    break
+            else:
+                raise KeyError(f"Unknown runtime: {name}")
+        return definition
+
+
+runtime_registry = RuntimeRegistry()
+
+
+def register_runtime(
+    name: str,
+    detector: Union[str, EventDetector],
+    converter: Union[str, Type[EventConverter], None] = None,
+) -> RuntimeDefinition:
+    """
+    Register a runtime in the default registry.
+
+    :param name: runtime name, to use in ChaliceWithSpec(runtime=[name])
+    :param detector: event detector, or import path of it
+    :param converter: EventConverter subclass, or import path of it
+    :return: runtime definition
+    """
+    return runtime_registry.register(RuntimeDefinition(name, detector, converter))
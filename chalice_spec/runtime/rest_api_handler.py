@@ -0,0 +1,75 @@
+import json
+from typing import Any, Optional
+
+from chalice.app import Request, RestAPIEventHandler, Response
+from pydantic import BaseModel
+
+from chalice_spec.compat import model_json
+
+
+class PreparsedRequest(Request):
+    """
+    Chalice request whose JSON body was built in-process by a converter.
+
+    json_body returns the converted objects as-is, without a JSON
+    serialize / parse round trip. The raw body is serialized only if a
+    handler reads it. session is the session state of the caller, e.g. the
+    SessionState of a Bedrock agent conversation, or None.
+    """
+
+    def __init__(
+        self,
+        event_dict: dict,
+        lambda_context: Optional[Any] = None,
+        json_body: Optional[Any] = None,
+        session: Optional[Any] = None,
+    ):
+        super().__init__(event_dict, lambda_context)
+        self._json_body = json_body
+        # Private : to_dict() serializes the public attributes
+        self._session = session
+
+    @property
+    def session(self) -> Optional[Any]:
+        return self._session
+
+    @property
+    def raw_body(self):
+        if not self._raw_body and self._body is None and self._json_body is not None:
+            self._raw_body = json.dumps(self._json_body).encode("utf-8")
+        return super().raw_body
+
+
+class InProcessRestAPIEventHandler(RestAPIEventHandler):
+    """
+    Chalice REST API event handler for converted events.
+
+    - The request JSON body is handed to the handler in-process.
+    - Pydantic models returned by handlers are serialized exactly once.
+    """
+
+    def __init__(
+        self,
+        *args: Any,
+        json_body: Optional[Any] = None,
+        session: Optional[Any] = None,
+        **kwargs: Any
+    ):
+        super().__init__(*args, **kwargs)
+        self._json_body = json_body
+        self._session = session
+
+    def create_request_object(self, event: Any, context: Any) -> Optional[Request]:
+        resource_path = event.get("requestContext", {}).get("resourcePath")
+        if resource_path is not None:
+            self.current_request = PreparsedRequest(
+                event, context, self._json_body, self._session
+            )
+            return self.current_request
+        return None
+
+    def _get_view_function_response(self, view_function, function_args) -> Response:
+        response = super()._get_view_function_response(view_function, function_args)
+        if isinstance(response.body, BaseModel):
+            response.body = model_json(response.body)
+        return response
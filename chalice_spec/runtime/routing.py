@@ -0,0 +1,342 @@
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple, TypeVar
+from urllib.parse import unquote
+
+from chalice_spec.docs import default_operation_id
+
+
+T = TypeVar("T")
+
+
+def app_revision(app) -> Tuple[int, int]:
+    """
+    revision of the routes of a Chalice app.
+
+    Routes and action group bindings are only ever added : their counts
+    change with each update.
+
+    :param app: Chalice app
+    :return: number of routes, number of routes bound to action groups
+    """
+    return (
+        sum(len(entries) for entries in app.routes.values()),
+        len(getattr(app, "_chalice_spec_action_groups", {})),
+    )
+
+
+def cached_for_app(app, key: str, build: Callable[[Any], T]) -> T:
+    """
+    value built from the routes of a Chalice app, kept on the app.
+
+    The value is built once, and rebuilt only when routes were added or bound
+    since (see app_revision).
+
+    :param app: Chalice app
+    :param key: attribute of the app that keeps the value
+    :param build: builds the value from the app
+    :return: value
+    """
+    revision = app_revision(app)
+    cached = app.__dict__.get(key)
+    if cached is not None and cached[0] == revision:
+        return cached[1]
+    value = build(app)
+    app.__dict__[key] = (revision, value)
+    return value
+
+
+class _RouteNode:
+    __slots__ = ("static", "param", "route", "param_names")
+
+    def __init__(self):
+        # Child nodes of literal segments
+        self.static: Dict[str, "_RouteNode"] = {}
+        # Child node of a {parameter} segment
+        self.param: Optional["_RouteNode"] = None
+        # Route path that ends on this node
+        self.route: Optional[str] = None
+        # Parameter names of the route, in path order : routes sharing the
+        # parameter node may name the parameter differently
+        self.param_names: Tuple[str, ...] = ()
+
+
+class RouteTrie:
+    """
+    Prebuilt trie of route paths, e.g. /items/{id}.
+
+    Matching a concrete path (/items/42) walks one node per path segment, so
+    the lookup cost depends on the depth of the path, not on the number of
+    routes. Literal segments take precedence over parameters.
+    """
+
+    def __init__(self, paths: Iterable[str] = ()):
+        self._root = _RouteNode()
+        for path in paths:
+            self.add(path)
+
+    @staticmethod
+    def _segments(path: str):
+        return [segment for segment in path.split("/") if segment]
+
+    def add(self, path: str) -> None:
+        """
+        add route path.
+
+        :param path: route path, e.g. /items/{id}
+        """
+        node = self._root
+        param_names = []
+        for segment in self._segments(path):
+            if segment.startswith("{") and segment.endswith("}"):
+                if node.param is None:
+                    node.param = _RouteNode()
+                param_names.append(segment[1:-1])
+                node = node.param
+            else:
+                node = node.static.setdefault(segment, _RouteNode())
+        node.route = path
+        node.param_names = tuple(param_names)
+
+    def match(self, path: str) -> Optional[Tuple[str, Dict[str, str]]]:
+        """
+        match concrete path against the routes.
+
+        :param path: concrete path, e.g. /items/42
+        :return: route path and decoded path parameters, or None
+        """
+        values: List[str] = []
+        node = self._match(self._root, self._segments(path), 0, values)
+        if node is None:
+            return None
+        return node.route, dict(zip(node.param_names, values))
+
+    def _match(self, node, segments, index, values) -> Optional[_RouteNode]:
+        if index == len(segments):
+            return node if node.route is not None else None
+        segment = segments[index]
+        child = node.static.get(segment)
+        if child is not None:
+            matched = self._match(child, segments, index + 1, values)
+            if matched is not None:
+                return matched
+        if node.param is not None:
+            values.append(unquote(segment))
+            matched = self._match(node.param, segments, index + 1, values)
+            if matched is not None:
+                return matched
+            values.pop()
+        return None
+
+    @classmethod
+    def for_app(cls, app) -> "RouteTrie":
+        """
+        trie of the routes of a Chalice app, see cached_for_app.
+
+        :param app: Chalice app
+        :return: route trie
+        """
+        return cached_for_app(app, "_chalice_spec_route_trie", cls._from_app)
+
+    @classmethod
+    def _from_app(cls, app) -> "RouteTrie":
+        return cls(path for path, methods in app.routes.items() if methods)
+
+
+class OperationIndex:
+    """
+    Index of the routes of an app by name.
+
+    A route is indexed by the operationId of its documented Operation, by
+    its generated operationId (see default_operation_id), and by the name of
+    its view function, in this order of precedence : a generated operationId
+    or a view name never hides a documented operationId.
+
+    Two routes with the same documented operationId raise a ValueError. A
+    generated operationId shared by two routes (e.g. /a-b and /a/b) is left
+    out of the index, asking for it raises a ValueError.
+    """
+
+    def __init__(self, app):
+        documented: Dict[str, Tuple[str, str]] = {}
+        generated: Dict[str, Tuple[str, str]] = {}
+        view_names: Dict[str, Tuple[str, str]] = {}
+        # Generated operationIds shared by routes : name -> routes
+        self._ambiguous: Dict[str, List[Tuple[str, str]]] = {}
+        get_route_operation = getattr(app, "get_route_operation", None)
+        for path, entries in app.routes.items():
+            for method, entry in entries.items():
+                route = (path, method)
+                view_names.setdefault(entry.view_name, route)
+                name = default_operation_id(path, method)
+                indexed = generated.setdefault(name, route)
+                if indexed != route:
+                    self._ambiguous.setdefault(name, [indexed]).append(route)
+                operation = (
+                    get_route_operation(path, method) if get_route_operation else None
+                )
+                if operation is not None and operation.operation_id:
+                    indexed = documented.setdefault(operation.operation_id, route)
+                    if indexed != route:
+                        raise ValueError(
+                            self._ambiguity(operation.operation_id, [indexed, route])
+                        )
+        for name in self._ambiguous:
+            del generated[name]
+        self._routes: Dict[str, Tuple[str, str]] = {
+            **view_names,
+            **generated,
+            **documented,
+        }
+
+    @staticmethod
+    def _ambiguity(name: str, routes: List[Tuple[str, str]]) -> str:
+        described = " and ".join(f"{method} {path}" for path, method in routes)
+        return (
+            f"operationId {name} is ambiguous: {described}, "
+            "set operation_id on their Operation"
+        )
+
+    def get(self, name: str) -> Optional[Tuple[str, str]]:
+        """
+        route of an operationId or view function name.
+
+        :param name: operationId, or view function name
+        :return: route path and method, or None
+        :raise ValueError: the name is a generated operationId of several routes
+        """
+        route = self._routes.get(name)
+        if route is None and name in self._ambiguous:
+            raise ValueError(self._ambiguity(name, self._ambiguous[name]))
+        return route
+
+    @classmethod
+    def for_app(cls, app) -> "OperationIndex":
+        """
+        index of the routes of a Chalice app, see cached_for_app.
+
+        :param app: Chalice app
+        :return: operation index
+        """
+        return cached_for_app(app, "_chalice_spec_operation_index", cls)
+
+
+class ParameterIndex:
+    """
+    Index of the location of the parameters of each route.
+
+    The location of a parameter is its OpenAPI "in" (path, query, header,
+    cookie), from the path of the route and the parameters declared on its
+    documented Operation.
+    """
+
+    def __init__(self, app):
+        self._locations: Dict[Tuple[str, str], Dict[str, str]] = {}
+        get_route_operation = getattr(app, "get_route_operation", None)
+        for path, entries in app.routes.items():
+            for method in entries:
+                locations = {}
+                operation = (
+                    get_route_operation(path, method) if get_route_operation else None
+                )
+                if operation is not None and operation.parameters:
+                    for parameter in operation.parameters:
+                        if "name" in parameter and "in" in parameter:
+                            locations[parameter["name"]] = parameter["in"]
+                for segment in RouteTrie._segments(path):
+                    if segment.startswith("{") and segment.endswith("}"):
+                        locations[segment[1:-1]] = "path"
+                self._locations[(path, method)] = locations
+
+    def locations(self, path: str, method: str) -> Dict[str, str]:
+        """
+        location of the parameters of a route.
+
+        :param path: route path, e.g. /items/{id}
+        :param method: http method
+        :return: parameter name -> location
+        """
+        return self._locations.get((path, method.upper()), {})
+
+    @classmethod
+    def for_app(cls, app) -> "ParameterIndex":
+        """
+        parameter index of the routes of a Chalice app, see cached_for_app.
+
+        :param app: Chalice app
+        :return: parameter index
+        """
+        return cached_for_app(app, "_chalice_spec_parameter_index", cls)
+
+
+class ActionGroupIndex:
+    """
+    Index of the routes bound to Bedrock agent action groups.
+
+    Routes are indexed by (action group, apiPath, METHOD). An apiPath that is
+    not a route template of the group (a concrete path) is matched against a
+    trie of the apiPaths of the group.
+    """
+
+    def __init__(self, app):
+        self._routes: Dict[Tuple[str, str, str], str] = {}
+        self._tries: Dict[str, RouteTrie] = {}
+        # apiPath of the routes of each group : (group, apiPath) -> {METHOD: path}
+        self._api_paths: Dict[Tuple[str, str], Dict[str, str]] = {}
+        # Routes of each group : (group, path, METHOD)
+        self._bound: Set[Tuple[str, str, str]] = set()
+        bindings = getattr(app, "_chalice_spec_action_groups", {})
+        for (path, method), (group, api_path) in bindings.items():
+            self._routes[(group, api_path, method)] = path
+            self._bound.add((group, path, method))
+            self._api_paths.setdefault((group, api_path), {})[method] = path
+            trie = self._tries.get(group)
+            if trie is None:
+                trie = self._tries[group] = RouteTrie()
+            trie.add(api_path)
+
+    def __contains__(self, action_group: str) -> bool:
+        return action_group in self._tries
+
+    def binds(self, action_group: str, path: str, method: str) -> bool:
+        """
+        check a route is bound to an action group.
+
+        :param action_group: name of the action group
+        :param path: route path, e.g. /items/{id}
+        :param method: http method
+        :return: bool
+        """
+        return (action_group, path, method.upper()) in self._bound
+
+    def match(
+        self, action_group: str, api_path: str, method: str
+    ) -> Optional[Tuple[str, Dict[str, str]]]:
+        """
+        match the apiPath of an event against the routes of its action group.
+
+        :param action_group: name of the action group
+        :param api_path: apiPath of the event
+        :param method: http method of the event
+        :return: route path and path parameters, or None
+        """
+        method = method.upper()
+        path = self._routes.get((action_group, api_path, method))
+        if path is not None:
+            return path, {}
+        trie = self._tries.get(action_group)
+        match = trie.match(api_path) if trie is not None else None
+        if match is None:
+            return None
+        path = self._api_paths[(action_group, match[0])].get(method)
+        if path is None:
+            return None
+        return path, match[1]
+
+    @classmethod
+    def for_app(cls, app) -> "ActionGroupIndex":
+        """
+        action group index of a Chalice app, see cached_for_app.
+
+        :param app: Chalice app
+        :return: action group index
+        """
+        return cached_for_app(app, "_chalice_spec_action_group_index", cls)
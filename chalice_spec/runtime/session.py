@@ -0,0 +1,181 @@
+import base64
+import json
+import time
+import zlib
+from typing import Any, Callable, Dict, Optional
+
+# Session attribute that keeps the cache
+DEFAULT_CACHE_KEY = "_chalice_spec_cache"
+# Size budget of the encoded cache
+DEFAULT_CACHE_MAX_BYTES = 4096
+# Default time to live of cached values, in seconds
+DEFAULT_CACHE_TTL = 300.0
+
+
+class SessionCache:
+    """
+    Cache kept in a session attribute, from one turn of a conversation to the next.
+
+    Entries are JSON values with an expiry time. The cache is stored as
+    compressed, base64 encoded JSON; it is decoded on first use, and entries
+    expiring first are evicted when the encoded cache is over its size budget.
+    """
+
+    def __init__(
+        self,
+        encoded: Optional[str] = None,
+        max_bytes: int = DEFAULT_CACHE_MAX_BYTES,
+        ttl: float = DEFAULT_CACHE_TTL,
+    ):
+        """
+        constructor.
+
+        :param encoded: encoded cache, from the session attributes
+        :param max_bytes: size budget of the encoded cache
+        :param ttl: default time to live of entries, in seconds
+        """
+        self._encoded = encoded
+        self._entries: Optional[Dict[str, list]] = None
+        self._modified = False
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+
+    @staticmethod
+    def decode(encoded: str) -> Dict[str, list]:
+        return json.loads(zlib.decompress(base64.b64decode(encoded)))
+
+    @staticmethod
+    def encode(entries: Dict[str, list]) -> str:
+        data = json.dumps(entries, separators=(",", ":")).encode("utf-8")
+        return base64.b64encode(zlib.compress(data, 9)).decode("ascii")
+
+    def _load(self) -> Dict[str, list]:
+        if self._entries is None:
+            entries = {}
+            if self._encoded:
+                try:
+                    entries = self.decode(self._encoded)
+                except (ValueError, zlib.error):
+                    # Not a cache : start over
+                    self._modified = True
+            now = time.time()
+            self._entries = {
+                key: entry for key, entry in entries.items() if entry[0] > now
+            }
+            self._modified = self._modified or len(self._entries) != len(entries)
+        return self._entries
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """
+        cached value of a key, or default if it is missing or expired.
+        """
+        entry = self._load().get(key)
+        if entry is None or entry[0] <= time.time():
+            return default
+        return entry[1]
+
+    def __contains__(self, key: str) -> bool:
+        entry = self._load().get(key)
+        return entry is not None and entry[0] > time.time()
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        """
+        cache a JSON value.
+
+        :param key: key
+        :param value: JSON serializable value
+        :param ttl: time to live in seconds, default is the ttl of the cache
+        """
+        self._load()[key] = [time.time() + (self.ttl if ttl is None else ttl), value]
+        self._modified = True
+
+    def delete(self, key: str) -> None:
+        if self._load().pop(key, None) is not None:
+            self._modified = True
+
+    def get_or_set(
+        self, key: str, factory: Callable[[], Any], ttl: Optional[float] = None
+    ) -> Any:
+        """
+        cached value of a key, computed with factory and cached if missing.
+        """
+        entry = self._load().get(key)
+        if entry is not None and entry[0] > time.time():
+            return entry[1]
+        value = factory()
+        self.set(key, value, ttl)
+        return value
+
+    def dumps(self) -> Optional[str]:
+        """
+        encode the cache, within its size budget.
+
+        :return: encoded cache, None if it is empty
+        """
+        entries = dict(self._load())
+        if not self._modified:
+            return self._encoded
+        encoded = self.encode(entries) if entries else None
+        while encoded is not None and len(encoded) > self.max_bytes:
+            # Evict the entry that expires first
+            del entries[min(entries, key=lambda key: entries[key][0])]
+            encoded = self.encode(entries) if entries else None
+        return encoded
+
+
+class SessionState:
+    """
+    Session attributes of a Bedrock agent conversation.
+
+    Handlers read and write session_attributes and prompt_session_attributes
+    (string values), and cache values from one turn to the next with cache.
+    The converter returns them to the agent with the response.
+    """
+
+    def __init__(
+        self,
+        session_attributes: Optional[Dict[str, str]] = None,
+        prompt_session_attributes: Optional[Dict[str, str]] = None,
+        cache_key: str = DEFAULT_CACHE_KEY,
+        cache_max_bytes: int = DEFAULT_CACHE_MAX_BYTES,
+        cache_ttl: float = DEFAULT_CACHE_TTL,
+    ):
+        """
+        constructor.
+
+        :param session_attributes: session attributes of the event
+        :param prompt_session_attributes: prompt session attributes of the event
+        :param cache_key: session attribute that keeps the cache
+        :param cache_max_bytes: size budget of the encoded cache
+        :param cache_ttl: default time to live of cached values, in seconds
+        """
+        self.session_attributes: Dict[str, str] = dict(session_attributes or {})
+        self.prompt_session_attributes: Dict[str, str] = dict(
+            prompt_session_attributes or {}
+        )
+        self._cache_key = cache_key
+        self._cache_max_bytes = cache_max_bytes
+        self._cache_ttl = cache_ttl
+        self._cache: Optional[SessionCache] = None
+
+    @property
+    def cache(self) -> SessionCache:
+        if self._cache is None:
+            self._cache = SessionCache(
+                self.session_attributes.pop(self._cache_key, None),
+                self._cache_max_bytes,
+                self._cache_ttl,
+            )
+        return self._cache
+
+    def dump_session_attributes(self) -> Dict[str, str]:
+        """
+        session attributes to return to the agent, with the encoded cache.
+        """
+        if self._cache is None:
+            return self.session_attributes
+        attributes = dict(self.session_attributes)
+        encoded = self._cache.dumps()
+        if encoded is not None:
+            attributes[self._cache_key] = encoded
+        return attributes
@@ -2,10 +2,12 @@ import time
 import boto3
 import sys
 from pydantic import BaseModel, Field
+from typing import Optional
 from pathlib import Path
 import os
 from hashlib import md5
 from app import spec
+from chalice_spec.export import dumps_spec, minify_spec, spec_size_report
 import json
 import io
 
@@ -29,6 +31,10 @@ class AgentsForAmazonBedrockConfig(BaseModel):
     idle_session_ttl_in_seconds: int = Field(900)
     # LLM Model ID
     foundation_model: str = Field("anthropic.claude-v2")
+    # Strip examples from the OpenAPI Schema
+    strip_examples: bool = Field(False)
+    # Truncate longer descriptions of the OpenAPI Schema
+    max_description_length: Optional[int] = Field(None)
 
 
 def read_agents_for_amazon_bedrock_config():
@@ -176,6 +182,19 @@ def read_current_agent_info(
     )
 
 
+def export_schema(identity: CallerIdentity) -> bytes:
+    """
+    Export the minified OpenAPI Schema, and print its size report
+    """
+    schema = minify_spec(
+        spec,
+        strip_examples=identity.AgentConfig.strip_examples,
+        max_description_length=identity.AgentConfig.max_description_length,
+    )
+    print(f"- OpenAPI schema : {spec_size_report(spec, schema)}")
+    return dumps_spec(schema).encode("utf-8")
+
+
 def create_resource(identity: CallerIdentity, cfn):
     """
     Create Resource for Agent with CloudFormation
@@ -227,7 +246,7 @@ def init():
 
     # Upload OpenAPI Schema File
     bucket = identity.session.resource("s3").Bucket(identity.bucket_name)
-    with io.BytesIO(json.dumps(spec.to_dict()).encode("utf-8")) as fp:
+    with io.BytesIO(export_schema(identity)) as fp:
         bucket.upload_fileobj(fp, identity.AgentConfig.schema_file)
     print(
         f"- Uploaded OpenAPI schema file to {identity.bucket_name}/{identity.AgentConfig.schema_file}"
@@ -307,7 +326,7 @@ def sync():
 
     # Upload OpenAPI Schema File
     bucket = identity.session.resource("s3").Bucket(identity.bucket_name)
-    with io.BytesIO(json.dumps(spec.to_dict()).encode("utf-8")) as fp:
+    with io.BytesIO(export_schema(identity)) as fp:
         bucket.upload_fileobj(fp, identity.AgentConfig.schema_file)
     print(
         f"- Uploaded OpenAPI schema file to {identity.bucket_name}/{identity.AgentConfig.schema_file}"
@@ -415,7 +434,9 @@ def show():
 
     Show OpenAPI Schema
     """
-    print(json.dumps(spec.to_dict(), indent=2))
+    schema = minify_spec(spec)
+    print(json.dumps(schema, indent=2))
+    print(spec_size_report(spec, schema), file=sys.stderr)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,174 @@
+import json
+
+from chalice_spec.chalice import BlueprintWithSpec
+from chalice_spec.docs import Docs, Operation
+from chalice_spec.runtime.api_runtime import APIRuntimeBedrockAgent
+from chalice_spec.runtime.converter.bedrock_agent_event_to_apigw import (
+    BedrockAgentEventToApiGateway,
+)
+from chalice_spec.runtime.routing import ActionGroupIndex
+from tests.schema import TestSchema, AnotherSchema
+from tests.test_runtime import (
+    APIParameter,
+    parameter_agents_for_amazon_bedrock,
+    setup_test,
+)
+
+
+def setup_action_group_app():
+    app, spec = setup_test(APIRuntimeBedrockAgent)
+
+    orders = BlueprintWithSpec(__name__, action_group="Orders")
+
+    @orders.route(
+        "/items/{item_id}",
+        methods=["GET"],
+        docs=Docs(get=Operation(response=AnotherSchema)),
+    )
+    def get_order_item(item_id):
+        return AnotherSchema(nintendo="orders", atari=item_id)
+
+    users = BlueprintWithSpec(__name__)
+
+    @users.route(
+        "/items/{item_id}",
+        methods=["GET"],
+        docs=Docs(get=Operation(response=TestSchema)),
+    )
+    def get_user_item(item_id):
+        return TestSchema(hello="users", world=int(item_id))
+
+    app.register_blueprint(orders, url_prefix="/orders")
+    app.register_blueprint(users, url_prefix="/users", action_group="Users")
+
+    @app.route("/health", methods=["GET"], action_group="Users")
+    def health():
+        return {"status": "ok"}
+
+    @app.route("/items/{item_id}", methods=["GET"])
+    def get_item(item_id):
+        return {"item": item_id}
+
+    return app, spec
+
+
+def agent_event(action_group: str, api_path: str, item_id: str = None):
+    event = parameter_agents_for_amazon_bedrock(
+        APIParameter(httpMethod="GET", apiPath=api_path)
+    )
+    event["actionGroup"] = action_group
+    event["parameters"] = (
+        [{"name": "item_id", "type": "string", "value": item_id}] if item_id else []
+    )
+    return event
+
+
+def response_body(response: dict):
+    return json.loads(response["response"]["responseBody"]["application/json"]["body"])
+
+
+def test_dispatch_by_action_group():
+    """
+    Normally ::
+        The same apiPath is dispatched to the route of the action group
+    """
+    app, _ = setup_action_group_app()
+
+    response = app(agent_event("Orders", "/items/{item_id}", "1"), {})
+    assert response_body(response) == {"nintendo": "orders", "atari": "1"}
+    assert response["response"]["apiPath"] == "/items/{item_id}"
+
+    response = app(agent_event("Users", "/items/{item_id}", "2"), {})
+    assert response_body(response) == {"hello": "users", "world": 2}
+
+    # Concrete apiPath
+    response = app(agent_event("Users", "/items/3"), {})
+    assert response_body(response) == {"hello": "users", "world": 3}
+
+    # Action group without bound routes : all the routes
+    response = app(agent_event("Main", "/items/{item_id}", "4"), {})
+    assert response_body(response) == {"item": "4"}
+
+
+def test_dispatch_by_action_group_not_found():
+    """
+    Anomaly ::
+        apiPaths that are not routes of the action group are not dispatched
+    """
+    app, _ = setup_action_group_app()
+
+    response = app(agent_event("Orders", "/health"), {})
+    assert response["response"]["httpStatusCode"] == 404
+    assert response_body(response)["Code"] == "NotFoundError"
+    assert response["sessionAttributes"] == {"string": "string"}
+
+
+def test_dispatch_matches_route_once(monkeypatch):
+    """
+    Normally ::
+        An event is matched against the routes once per invocation
+    """
+    app, _ = setup_action_group_app()
+    matches = []
+    match_route = BedrockAgentEventToApiGateway._match_route
+
+    def counting_match_route(self, app, agent_event):
+        matches.append(agent_event.api_path)
+        return match_route(self, app, agent_event)
+
+    monkeypatch.setattr(
+        BedrockAgentEventToApiGateway, "_match_route", counting_match_route
+    )
+
+    response = app(agent_event("Orders", "/items/{item_id}", "1"), {})
+    assert response_body(response) == {"nintendo": "orders", "atari": "1"}
+    response = app(agent_event("Main", "/items/{item_id}", "4"), {})
+    assert response_body(response) == {"item": "4"}
+    response = app(agent_event("Orders", "/health"), {})
+    assert response["response"]["httpStatusCode"] == 404
+    assert matches == ["/items/{item_id}", "/items/{item_id}", "/health"]
+
+
+def test_action_group_index():
+    """
+    Normally ::
+        Routes are indexed by (action group, apiPath, method)
+    """
+    app, _ = setup_action_group_app()
+    index = ActionGroupIndex.for_app(app)
+    assert "Orders" in index
+    assert "Main" not in index
+    assert index.match("Orders", "/items/{item_id}", "get") == (
+        "/orders/items/{item_id}",
+        {},
+    )
+    assert index.match("Users", "/items/9", "GET") == (
+        "/users/items/{item_id}",
+        {"item_id": "9"},
+    )
+    assert index.match("Users", "/items/9", "POST") is None
+    assert ActionGroupIndex.for_app(app) is index
+    assert app.get_action_groups() == ["Orders", "Users"]
+
+
+def test_action_group_spec():
+    """
+    Normally ::
+        The spec of an action group has its routes under their apiPath,
+        and the schemas they reference only
+    """
+    app, spec = setup_action_group_app()
+
+    orders = app.action_group_spec("Orders")
+    assert list(orders["paths"]) == ["/items/{item_id}"]
+    assert orders["paths"]["/items/{item_id}"]["parameters"][0]["name"] == "item_id"
+    assert list(orders["components"]["schemas"]) == ["AnotherSchema"]
+
+    users = app.action_group_spec("Users")
+    # /health is not documented
+    assert list(users["paths"]) == ["/items/{item_id}"]
+    assert list(users["components"]["schemas"]) == ["TestSchema"]
+
+    # The spec of the app is left as is
+    assert "/orders/items/{item_id}" in spec.to_dict()["paths"]
+    assert app.action_group_spec("Unknown")["paths"] == {}
@@ -0,0 +1,189 @@
+import json
+import subprocess
+import sys
+from typing import Dict, List
+
+import pytest
+from pydantic import BaseModel, Field, constr, create_model
+
+from chalice_spec.artifact import StaleSpecArtifactWarning
+from chalice_spec.chalice import ChaliceWithSpec, LazyAPISpec
+from chalice_spec.cli import main
+from chalice_spec.compat import PYDANTIC_V2
+from chalice_spec.docs import Docs, Op
+from chalice_spec.pydantic import PydanticPlugin
+from tests.schema import AnotherSchema, NestedSchema, TestSchema
+
+
+def build_app(spec_artifact=None, response=NestedSchema):
+    spec = LazyAPISpec(
+        title="Test Schema",
+        openapi_version="3.0.1",
+        version="0.0.0",
+        plugins=[PydanticPlugin()],
+    )
+    app = ChaliceWithSpec(app_name="test", spec=spec, spec_artifact=spec_artifact)
+
+    @app.route(
+        "/posts/{post_id}",
+        methods=["GET", "PUT"],
+        docs=Docs(
+            get=response,
+            put=Op(request=TestSchema, response=AnotherSchema),
+        ),
+    )
+    def post(post_id):
+        """Post
+        A post of the blog
+        """
+
+    return app, spec
+
+
+# Target of the export command
+app, _ = build_app()
+
+
+def add_example(schema, model):
+    schema["example"] = {"name": "example"}
+
+
+class ExampleSchema(BaseModel):
+    name: str
+
+    if PYDANTIC_V2:
+        model_config = {"json_schema_extra": add_example}
+    else:
+
+        class Config:
+            schema_extra = add_example
+
+
+def test_export_and_load_artifact(tmp_path, monkeypatch):
+    """
+    Normally ::
+        The exported artifact is loaded without generating schemas
+    """
+    output = str(tmp_path / "openapi.json")
+    assert main(["export", "tests.test_artifact:app", "-o", output]) == 0
+    with open(output) as fp:
+        artifact = json.load(fp)
+    assert artifact["fingerprint"] == app.spec_fingerprint()
+
+    _, live_spec = build_app()
+    expected = live_spec.to_dict()
+
+    def fail(*args, **kwargs):
+        raise AssertionError("schemas are generated")
+
+    monkeypatch.setattr(PydanticPlugin, "schema_helper", fail)
+    monkeypatch.setattr(Docs, "build_operations", fail)
+    # Reading the spec loads the artifact
+    loaded_app, loaded_spec = build_app(spec_artifact=output)
+    assert loaded_spec.to_dict() == expected
+    assert loaded_app.materialize_spec() is loaded_spec
+    assert main(["export", "tests.test_artifact:app", "-o", output, "--check"]) == 0
+
+
+def test_stale_artifact(tmp_path):
+    """
+    Anomaly ::
+        A stale or missing artifact is detected, and the spec is generated
+    """
+    output = str(tmp_path / "openapi.json")
+    assert main(["export", "tests.test_artifact:app", "-o", output]) == 0
+
+    # The response model of a route changed since the export
+    stale_app, stale_spec = build_app(spec_artifact=output, response=TestSchema)
+    assert stale_app.spec_fingerprint() != app.spec_fingerprint()
+    with pytest.warns(StaleSpecArtifactWarning):
+        paths = stale_spec.to_dict()["paths"]
+    schema = paths["/posts/{post_id}"]["get"]["responses"]["200"]["content"]
+    assert schema["application/json"]["schema"]["$ref"].endswith("/TestSchema")
+
+    missing_app, missing_spec = build_app(spec_artifact=str(tmp_path / "none.json"))
+    with pytest.warns(StaleSpecArtifactWarning):
+        missing_app.materialize_spec()
+    assert "/posts/{post_id}" in missing_spec.to_dict()["paths"]
+    assert main(["export", "tests.test_artifact:app", "-o", "none", "--check"]) == 1
+
+
+def test_fingerprint_is_deterministic():
+    """
+    Normally ::
+        The same routes and models have the same fingerprint
+    """
+    first, _ = build_app()
+    second, _ = build_app()
+    assert first.spec_fingerprint() == second.spec_fingerprint()
+    assert (
+        first.spec_fingerprint()
+        != build_app(response=AnotherSchema)[0].spec_fingerprint()
+    )
+
+
+def test_fingerprint_of_generic_types():
+    """
+    Normally ::
+        The arguments of generic field types are part of the fingerprint
+    """
+
+    def fingerprint(annotation):
+        return build_app(response=create_model("Generic", values=(annotation, ...)))[
+            0
+        ].spec_fingerprint()
+
+    assert fingerprint(List[int]) == fingerprint(List[int])
+    assert fingerprint(List[int]) != fingerprint(List[str])
+    assert fingerprint(Dict[str, int]) != fingerprint(Dict[str, str])
+    assert fingerprint(List[NestedSchema]) != fingerprint(List[TestSchema])
+
+
+def test_fingerprint_of_constraints():
+    """
+    Normally ::
+        The constraints and examples of the fields are part of the fingerprint
+    """
+
+    def fingerprint(annotation, field):
+        return build_app(
+            response=create_model("Constrained", value=(annotation, field))
+        )[0].spec_fingerprint()
+
+    assert fingerprint(str, Field(..., max_length=3)) == fingerprint(
+        str, Field(..., max_length=3)
+    )
+    assert fingerprint(str, Field(..., max_length=3)) != fingerprint(
+        str, Field(..., max_length=4)
+    )
+    assert fingerprint(int, Field(..., ge=0)) != fingerprint(int, Field(..., gt=0))
+    assert fingerprint(constr(min_length=1), ...) != fingerprint(
+        constr(min_length=2), ...
+    )
+    assert fingerprint(List[constr(min_length=1)], ...) != fingerprint(
+        List[constr(min_length=2)], ...
+    )
+    assert fingerprint(str, Field(..., examples=["a"])) != fingerprint(
+        str, Field(..., examples=["b"])
+    )
+
+
+def test_fingerprint_is_stable_across_processes():
+    """
+    Normally ::
+        A callable schema extra is fingerprinted by name, not by its address
+    """
+    script = (
+        "from tests.test_artifact import ExampleSchema, build_app; "
+        "print(build_app(response=ExampleSchema)[0].spec_fingerprint())"
+    )
+    fingerprints = {
+        subprocess.run(
+            [sys.executable, "-c", script],
+            check=True,
+            stdout=subprocess.PIPE,
+            universal_newlines=True,
+        ).stdout.strip()
+        for _ in range(2)
+    }
+    assert fingerprints == {build_app(response=ExampleSchema)[0].spec_fingerprint()}
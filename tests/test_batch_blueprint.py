@@ -0,0 +1,171 @@
+import json
+import threading
+import time
+
+from chalice import AuthResponse, Response
+from chalice.test import Client
+
+from chalice_spec.blueprint import chalice_spec_batch_blueprint
+from chalice_spec.docs import Docs
+from chalice_spec.runtime.model_utility.apigw import build_api_gateway_event
+from tests.schema import TestSchema, AnotherSchema
+from tests.test_runtime import setup_test
+
+
+def setup_batch_app(**kwargs):
+    app, spec = setup_test(None)
+    events = []
+
+    @app.route("/posts/{post_id}", methods=["GET"], docs=Docs(get=AnotherSchema))
+    def get_post(post_id):
+        time.sleep(0.01)
+        events.append(("get", post_id, threading.current_thread().name))
+        query = app.current_request.query_params or {}
+        return AnotherSchema(nintendo=post_id, atari=query.get("atari", ""))
+
+    @app.route(
+        "/posts",
+        methods=["POST"],
+        docs=Docs(post=TestSchema),
+    )
+    def create_post():
+        events.append(("post", app.current_request.json_body["hello"], None))
+        return Response(body="created", status_code=201)
+
+    app.register_blueprint(chalice_spec_batch_blueprint(**kwargs))
+    return app, spec, events
+
+
+def post_batch(app, items):
+    with Client(app) as client:
+        return client.http.post(
+            "/batch",
+            headers={"content-type": "application/json"},
+            body=json.dumps(items),
+        )
+
+
+def test_batch_requests():
+    """
+    Normally ::
+        Sub-requests run in-process, safe ones concurrently, results keep order
+    """
+    app, _, events = setup_batch_app()
+    items = [{"method": "GET", "path": f"/posts/{i}?atari=a"} for i in range(4)]
+    items.append({"method": "POST", "path": "/posts", "body": {"hello": "h"}})
+    items.append({"path": "/posts/9"})
+
+    response = post_batch(app, items)
+
+    assert response.status_code == 200
+    results = response.json_body
+    assert [result["status"] for result in results] == [200] * 4 + [201, 200]
+    assert results[0]["body"] == {"nintendo": "0", "atari": "a"}
+    assert results[4]["body"] == "created"
+    assert results[5]["body"] == {"nintendo": "9", "atari": ""}
+    # The POST runs after the GETs before it, and before the GETs after it
+    assert [event[0] for event in events] == ["get"] * 4 + ["post", "get"]
+    assert len({event[2] for event in events[:4]}) > 1
+
+
+def test_batch_requests_errors():
+    """
+    Anomaly ::
+        Unknown routes and methods fail their own sub-request only, invalid
+        batches fail the whole request
+    """
+    app, _, _ = setup_batch_app(max_items=3)
+    response = post_batch(
+        app,
+        [
+            {"path": "/unknown"},
+            {"method": "DELETE", "path": "/posts/1"},
+            {"path": "/posts/1"},
+        ],
+    )
+    assert [result["status"] for result in response.json_body] == [404, 405, 200]
+
+    assert post_batch(app, [{"method": "GET"}]).status_code == 400
+    assert post_batch(app, [{"path": "/posts/1"}] * 4).status_code == 400
+
+
+def test_batch_spec():
+    """
+    Normally ::
+        POST /batch is documented in the spec
+    """
+    app, spec, _ = setup_batch_app()
+    spec_dict = spec.to_dict()
+    operation = spec_dict["paths"]["/batch"]["post"]
+    assert operation["summary"] == "Run many requests in one invocation."
+    assert operation["requestBody"]["content"]["application/json"]["schema"] == {
+        "$ref": "#/components/schemas/BatchRequest"
+    }
+    schemas = spec_dict["components"]["schemas"]
+    assert schemas["BatchRequest"]["type"] == "array"
+    assert schemas["BatchRequest"]["items"] == {
+        "$ref": "#/components/schemas/BatchRequestItem"
+    }
+    assert "BatchResponseItem" in schemas
+
+
+def test_batch_requests_authorization():
+    """
+    Anomaly ::
+        Sub-requests to routes with another authorizer or API key requirement,
+        or to the batch route itself, are rejected
+    """
+    app, _, _ = setup_batch_app()
+
+    @app.authorizer()
+    def private_authorizer(auth_request):
+        return AuthResponse(routes=["*"], principal_id="user")
+
+    @app.route("/private", methods=["GET"], authorizer=private_authorizer)
+    def private():
+        return {}
+
+    @app.route("/keyed", methods=["GET"], api_key_required=True)
+    def keyed():
+        return {}
+
+    response = post_batch(
+        app,
+        [
+            {"path": "/private"},
+            {"path": "/keyed"},
+            {"method": "POST", "path": "/batch", "body": [{"path": "/posts/1"}]},
+            {"path": "/posts/1"},
+        ],
+    )
+    results = response.json_body
+    assert [result["status"] for result in results] == [403, 403, 400, 200]
+    assert results[0]["body"] == {"Code": "ForbiddenError"}
+
+
+def test_batch_requests_caller():
+    """
+    Normally ::
+        Sub-requests run with the authorizer and identity of the batch request
+    """
+    app, _, _ = setup_batch_app()
+
+    @app.route("/caller", methods=["GET"])
+    def caller():
+        context = app.current_request.context
+        return {"authorizer": context["authorizer"], "identity": context["identity"]}
+
+    event = build_api_gateway_event(
+        http_method="POST",
+        resource_path="/batch",
+        headers={"content-type": "application/json"},
+        body=json.dumps([{"path": "/caller"}]),
+    )
+    event["requestContext"]["authorizer"] = {"principalId": "user"}
+    event["requestContext"]["identity"]["sourceIp"] = "10.0.0.1"
+
+    response = app(event, None)
+
+    result = json.loads(response["body"])[0]
+    assert result["body"]["authorizer"] == {"principalId": "user"}
+    assert result["body"]["identity"]["sourceIp"] == "10.0.0.1"
@@ -229,3 +229,72 @@ def test_two_blueprints():
             }
         },
     }
+
+
+def test_openapi_json_cached():
+    """
+    Normally ::
+        The spec is served serialized once, with an ETag, and 304 on a match
+    """
+    import gzip
+    import json
+
+    from chalice.test import Client
+
+    from chalice_spec.blueprint import chalice_spec_blueprint
+    from chalice_spec.docs import Docs
+    from tests.schema import TestSchema
+
+    app, spec = setup_test()
+    app.register_blueprint(chalice_spec_blueprint(spec, enable_yaml=True))
+
+    @app.route("/hello", methods=["GET"], docs=Docs(get=TestSchema))
+    def hello():
+        pass
+
+    calls = []
+    to_dict = spec.to_dict
+
+    def counting_to_dict():
+        calls.append(1)
+        return to_dict()
+
+    spec.to_dict = counting_to_dict
+
+    with Client(app) as client:
+        response = client.http.get("/openapi.json")
+        assert response.status_code == 200
+        assert json.loads(response.body) == to_dict()
+        etag = response.headers["ETag"]
+        assert response.headers["Cache-Control"] == "public, max-age=86400"
+
+        assert client.http.get("/openapi.json").headers["ETag"] == etag
+        assert len(calls) == 1
+
+        response = client.http.get("/openapi.json", headers={"If-None-Match": etag})
+        assert response.status_code == 304
+        assert response.body == b""
+
+        response = client.http.get("/openapi.yaml")
+        assert response.headers["Content-Type"] == "application/yaml"
+        assert b"/hello:" in response.body
+
+        # Routes added after the first serve invalidate the documents
+        @app.route("/world", methods=["GET"], docs=Docs(get=TestSchema))
+        def world():
+            pass
+
+        response = client.http.get("/openapi.json", headers={"If-None-Match": etag})
+        assert response.status_code == 200
+        assert "/world" in json.loads(response.body)["paths"]
+        assert response.headers["ETag"] != etag
+
+    # Compressed for apps that serve the spec as binary
+    app.api.binary_types.append("application/json")
+    with Client(app) as client:
+        response = client.http.get(
+            "/openapi.json",
+            headers={"Accept": "application/json", "Accept-Encoding": "gzip, br;q=0"},
+        )
+        assert response.headers["Content-Encoding"] == "gzip"
+        assert json.loads(gzip.decompress(response.body)) == to_dict()
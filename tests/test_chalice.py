@@ -1,8 +1,11 @@
 import pytest
 from apispec import APISpec
+from chalice.test import Client
 
-from chalice_spec.chalice import ChaliceWithSpec
+from chalice_spec.blueprint import chalice_spec_blueprint
+from chalice_spec.chalice import ChaliceWithSpec, LazyAPISpec
 from chalice_spec.docs import Docs, Resp, Op
+from chalice_spec.export import function_definitions_from_spec, minify_spec
 from chalice_spec.pydantic import PydanticPlugin
 from tests.schema import TestSchema, AnotherSchema
 
@@ -631,3 +634,140 @@ def test_security():
             "securitySchemes": {"BearerAuth": {"type": "http", "scheme": "bearer"}},
         },
     }
+
+
+# Test 11: generated operationIds
+def test_generate_operation_ids():
+    spec = APISpec(
+        title="Test Schema",
+        openapi_version="3.0.1",
+        version="0.0.0",
+        plugins=[PydanticPlugin()],
+    )
+    app = ChaliceWithSpec(app_name="test", spec=spec, generate_operation_ids=True)
+
+    @app.route(
+        "/users/{user_id}",
+        methods=["GET", "PUT"],
+        docs=Docs(
+            get=AnotherSchema,
+            put=Op(request=TestSchema, response=AnotherSchema, operation_id="putUser"),
+        ),
+    )
+    def user(user_id):
+        pass
+
+    operations = spec.to_dict()["paths"]["/users/{user_id}"]
+    assert operations["get"]["operationId"] == "get_users_user_id"
+    assert operations["put"]["operationId"] == "putUser"
+
+    # /a-b and /a/b generate the same operationId : the second one is left out
+    @app.route("/a-b", methods=["GET"], docs=Docs(get=AnotherSchema))
+    def dashed():
+        pass
+
+    with pytest.warns(UserWarning, match="get_a_b"):
+
+        @app.route("/a/b", methods=["GET"], docs=Docs(get=AnotherSchema))
+        def nested():
+            pass
+
+    paths = spec.to_dict()["paths"]
+    assert paths["/a-b"]["get"]["operationId"] == "get_a_b"
+    assert "operationId" not in paths["/a/b"]["get"]
+
+    # A documented operationId is not generated for another route
+    @app.route(
+        "/items",
+        methods=["GET"],
+        docs=Docs(get=Op(response=AnotherSchema, operation_id="get_catalog")),
+    )
+    def items():
+        pass
+
+    with pytest.warns(UserWarning, match="get_catalog"):
+
+        @app.route("/catalog", methods=["GET"], docs=Docs(get=AnotherSchema))
+        def catalog():
+            pass
+
+    assert "operationId" not in spec.to_dict()["paths"]["/catalog"]["get"]
+
+    # Documented operationIds are unique
+    with pytest.raises(ValueError, match="putUser"):
+
+        @app.route(
+            "/users",
+            methods=["PUT"],
+            docs=Docs(put=Op(response=AnotherSchema, operation_id="putUser")),
+        )
+        def users():
+            pass
+
+
+# Test 12: lazy spec
+def test_lazy_spec():
+    def build(lazy_spec):
+        spec = (LazyAPISpec if lazy_spec else APISpec)(
+            title="Test Schema",
+            openapi_version="3.0.1",
+            version="0.0.0",
+            plugins=[PydanticPlugin()],
+        )
+        app = ChaliceWithSpec(app_name="test", spec=spec, lazy_spec=lazy_spec)
+
+        @app.route("/users/{user_id}", methods=["GET"], docs=Docs(get=AnotherSchema))
+        def user(user_id):
+            """Get a user"""
+
+        return app, spec
+
+    eager_app, eager_spec = build(False)
+    lazy_app, lazy_spec = build(True)
+
+    # Nothing is generated until the spec is read
+    assert lazy_spec.components.schemas == {}
+    assert lazy_app.get_route_operation("/users/{user_id}", "get") is not None
+    assert lazy_spec.to_dict() == eager_spec.to_dict()
+    assert "AnotherSchema" in lazy_spec.components.schemas
+    assert lazy_app.materialize_spec() is lazy_spec
+
+    # Readers of the spec object see the recorded routes
+    paths = eager_spec.to_dict()["paths"]
+    assert minify_spec(build(True)[1])["paths"].keys() == paths.keys()
+    assert function_definitions_from_spec(build(True)[1]) == (
+        function_definitions_from_spec(eager_spec)
+    )
+    assert "/users/{user_id}" in build(True)[1].to_yaml()
+
+    # Routes added after a read are documented on the next one
+    @lazy_app.route(
+        "/posts",
+        methods=["POST"],
+        docs=Docs(post=Op(request=TestSchema, response=AnotherSchema)),
+    )
+    def post():
+        pass
+
+    assert "/posts" in lazy_spec.to_dict()["paths"]
+    assert "/posts" in lazy_spec.to_yaml()
+
+    # The docs blueprint materializes the spec
+    docs_app, docs_spec = build(True)
+    docs_app.register_blueprint(chalice_spec_blueprint(docs_spec))
+    with Client(docs_app) as client:
+        paths = client.http.get("/openapi.json").json_body["paths"]
+    assert "/users/{user_id}" in paths
+
+    # Docs errors are raised when the route is declared
+    with pytest.raises(TypeError):
+
+        @lazy_app.route(
+            "/items", methods=["GET", "POST"], docs=Docs(response=AnotherSchema)
+        )
+        def items():
+            pass
+
+    # The recorded routes are added by a LazyAPISpec only
+    with pytest.raises(TypeError, match="LazyAPISpec"):
+        ChaliceWithSpec(app_name="test", spec=eager_spec, lazy_spec=True)
@@ -0,0 +1,221 @@
+from enum import Enum
+from typing import Dict, List, Optional
+
+from pydantic import BaseModel
+
+from chalice_spec.compat import model_json_schema
+from chalice_spec.docs import Docs
+from chalice_spec.runtime.api_runtime import APIRuntimeBedrockAgent
+from chalice_spec.runtime.coercion import CoercionPlan, CoercionPlans
+from tests.schema import AnotherSchema
+from tests.test_runtime import (
+    APIParameter,
+    parameter_agents_for_amazon_bedrock,
+    setup_test,
+)
+
+
+class Address(BaseModel):
+    city: str
+
+
+class Order(BaseModel):
+    name: str
+    quantity: int
+    price: float
+    gift: bool
+    tags: List[str]
+    sizes: List[int]
+    address: Address
+    options: Dict[str, str]
+    discount: Optional[int] = None
+
+
+class Size(int, Enum):
+    SMALL = 1
+    LARGE = 2
+
+
+class Color(str, Enum):
+    RED = "red"
+    BLUE = "blue"
+
+
+class Shipment(BaseModel):
+    grid: List[List[int]]
+    addresses: List[Address]
+    routes: Dict[str, List[str]]
+    size: Size
+    color: Color
+    sizes: List[Size]
+    weight: Optional[float] = None
+    address: Optional[Address] = None
+    labels: Optional[List[str]] = None
+
+
+def test_coercion_plan_from_schema():
+    """
+    Normally :: Values are converted to the types of the request schema
+
+    Expects:
+        Unknown properties are converted to their declared type,
+        values that can not be converted are kept as strings
+    """
+    plan = CoercionPlan.from_schema(Order.schema())
+    assert plan.coerce("name", "12") == "12"
+    assert plan.coerce("quantity", "3") == 3
+    assert plan.coerce("quantity", "3.0") == 3
+    assert plan.coerce("price", "1.5") == 1.5
+    assert plan.coerce("gift", "True") is True
+    assert plan.coerce("gift", "false") is False
+    assert plan.coerce("tags", '["a", "b"]') == ["a", "b"]
+    assert plan.coerce("tags", "[a, b]") == ["a", "b"]
+    assert plan.coerce("sizes", "[1, 2]") == [1, 2]
+    assert plan.coerce("sizes", "['1', '2']") == [1, 2]
+    assert plan.coerce("address", '{"city": "Tokyo"}') == {"city": "Tokyo"}
+    assert plan.coerce("options", '{"a": "b"}') == {"a": "b"}
+    assert plan.coerce("discount", "5") == 5
+    assert plan.coerce("unknown", "7", "integer") == 7
+    assert plan.coerce("unknown", "7", "string") == "7"
+    assert plan.coerce("unknown", "7") == "7"
+
+    # Anomaly : kept as sent
+    assert plan.coerce("quantity", "three") == "three"
+    assert plan.coerce("quantity", "1.5") == "1.5"
+    assert plan.coerce("gift", "maybe") == "maybe"
+    assert plan.coerce("address", "[1]") == "[1]"
+    assert plan.coerce("quantity", 3) == 3
+
+
+def test_coercion_plan_anomalies():
+    """
+    Anomaly :: Values that can not be converted are kept as strings
+
+    Expects:
+        The handler validates them as sent
+    """
+    plan = CoercionPlan.from_schema(model_json_schema(Order))
+    assert plan.coerce("price", "cheap") == "cheap"
+    assert plan.coerce("price", "") == ""
+    assert plan.coerce("quantity", "") == ""
+    assert plan.coerce("quantity", "1e400") == "1e400"
+    assert plan.coerce("gift", "") == ""
+    assert plan.coerce("tags", '{"a": "b"}') == '{"a": "b"}'
+    assert plan.coerce("sizes", "[1, two]") == [1, "two"]
+    assert plan.coerce("address", "not json") == "not json"
+    assert plan.coerce("address", '"Tokyo"') == '"Tokyo"'
+    assert plan.coerce("options", "{a: b}") == "{a: b}"
+    assert plan.coerce("discount", "none") == "none"
+    assert plan.coerce("unknown", "seven", "integer") == "seven"
+    assert plan.coerce("unknown", "7", "unknown type") == "7"
+    assert plan.coerce("gift", None) is None
+    assert plan.coerce("tags", ["a"]) == ["a"]
+
+
+def test_coercion_plan_nested_enums_and_optionals():
+    """
+    Normally :: Nested arrays and objects, enums and optional values are
+    converted to their declared types
+    """
+    plan = CoercionPlan.from_schema(model_json_schema(Shipment))
+    assert plan.coerce("grid", "[[1, 2], [3]]") == [[1, 2], [3]]
+    assert plan.coerce("grid", "[]") == []
+    assert plan.coerce("addresses", '[{"city": "Osaka"}]') == [{"city": "Osaka"}]
+    assert plan.coerce("routes", '{"a": ["b", "c"]}') == {"a": ["b", "c"]}
+    assert plan.coerce("size", "2") == 2
+    assert plan.coerce("color", "red") == "red"
+    assert plan.coerce("sizes", "[1, 2]") == [1, 2]
+    assert plan.coerce("sizes", "['1', '2']") == [1, 2]
+    assert plan.coerce("weight", "2.5") == 2.5
+    assert plan.coerce("address", '{"city": "Nara"}') == {"city": "Nara"}
+    assert plan.coerce("labels", "[a, b]") == ["a", "b"]
+
+    # Anomaly : kept as sent
+    assert plan.coerce("size", "large") == "large"
+    assert plan.coerce("sizes", "[1, large]") == [1, "large"]
+    assert plan.coerce("weight", "heavy") == "heavy"
+    assert plan.coerce("addresses", '{"city": "Osaka"}') == '{"city": "Osaka"}'
+
+
+def test_invoke_from_agents_for_amazon_bedrock_coerced_body():
+    """
+    Normally :: Properties reach the handler with the types of the request schema
+    """
+    app, spec = setup_test(APIRuntimeBedrockAgent)
+    received = {}
+
+    @app.route(
+        "/orders",
+        methods=["POST"],
+        docs=Docs(request=Order, response=AnotherSchema),
+    )
+    def create_order():
+        received.update(app.current_request.json_body)
+        return AnotherSchema(nintendo="a", atari="b")
+
+    event = parameter_agents_for_amazon_bedrock(
+        APIParameter(httpMethod="POST", apiPath="/orders")
+    )
+    event["requestBody"]["content"]["application/json"]["properties"] = [
+        {"name": "name", "type": "string", "value": "42"},
+        {"name": "quantity", "type": "integer", "value": "2"},
+        {"name": "price", "type": "number", "value": "9.5"},
+        {"name": "gift", "type": "boolean", "value": "true"},
+        {"name": "tags", "type": "array", "value": "[x, y]"},
+        {"name": "sizes", "type": "array", "value": "[1, 2]"},
+        {"name": "address", "type": "object", "value": '{"city": "Kyoto"}'},
+        {"name": "options", "type": "object", "value": "{}"},
+        {"name": "note", "type": "boolean", "value": "false"},
+    ]
+    response = app(event, {})
+
+    assert response["response"]["httpStatusCode"] == 200
+    assert received == {
+        "name": "42",
+        "quantity": 2,
+        "price": 9.5,
+        "gift": True,
+        "tags": ["x", "y"],
+        "sizes": [1, 2],
+        "address": {"city": "Kyoto"},
+        "options": {},
+        "note": False,
+    }
+    plans = CoercionPlans.for_app(app)
+    assert plans.get("/orders", "post") is plans.get("/orders", "POST")
+
+
+def test_invoke_from_agents_for_amazon_bedrock_without_request_model():
+    """
+    Normally :: Without a request model, values are converted to the types
+    sent with them
+    """
+    app, spec = setup_test(APIRuntimeBedrockAgent)
+    received = {}
+
+    @app.route("/notes", methods=["POST"], docs=Docs(response=AnotherSchema))
+    def create_note():
+        received.update(app.current_request.json_body)
+        return AnotherSchema(nintendo="a", atari="b")
+
+    event = parameter_agents_for_amazon_bedrock(
+        APIParameter(httpMethod="POST", apiPath="/notes")
+    )
+    event["requestBody"]["content"]["application/json"]["properties"] = [
+        {"name": "text", "type": "string", "value": "12"},
+        {"name": "count", "type": "integer", "value": "3"},
+        {"name": "pinned", "type": "boolean", "value": "yes"},
+        {"name": "tags", "type": "array", "value": "[a, b]"},
+        {"name": "size", "type": "number", "value": "large"},
+    ]
+    response = app(event, {})
+
+    assert response["response"]["httpStatusCode"] == 200
+    assert received == {
+        "text": "12",
+        "count": 3,
+        "pinned": True,
+        "tags": ["a", "b"],
+        "size": "large",
+    }
+    assert "count" not in CoercionPlans.for_app(app).get("/notes", "POST")
@@ -0,0 +1,172 @@
+import json
+from typing import List, Optional
+
+from pydantic import BaseModel
+
+from chalice_spec.docs import Docs, Operation
+from chalice_spec.runtime.api_runtime import APIRuntimeBedrockAgent
+from chalice_spec.runtime.converter import ConversionContext
+from chalice_spec.runtime.converter.bedrock_agent_event_to_apigw import (
+    BedrockAgentEventToApiGateway,
+)
+from chalice_spec.runtime.compaction import (
+    TRUNCATED_KEY,
+    compact_body,
+    drop_optional_fields,
+    embedded_size,
+    emit_compaction_metric,
+    truncate_arrays,
+)
+from tests.test_runtime import (
+    APIParameter,
+    parameter_agents_for_amazon_bedrock,
+    setup_test,
+)
+
+
+class Item(BaseModel):
+    name: str
+    note: Optional[str] = None
+
+
+class ItemList(BaseModel):
+    items: List[Item]
+    total: int
+    comment: str = ""
+
+
+def setup_compaction_app():
+    app, spec = setup_test(APIRuntimeBedrockAgent)
+
+    @app.route(
+        "/items",
+        methods=["GET"],
+        docs=Docs(get=Operation(response=ItemList, max_response_bytes=1024)),
+    )
+    def list_items():
+        return ItemList(
+            items=[Item(name=f"item{i}", note="note") for i in range(100)], total=100
+        )
+
+    @app.route("/small", methods=["GET"])
+    def small():
+        return {"ok": True}
+
+    return app
+
+
+def test_compact_body_steps():
+    """
+    Normally ::
+        Bodies are minified, then optional fields dropped, then arrays truncated
+    """
+    small = json.dumps({"a": 1})
+    assert compact_body(small, 100).steps == []
+    assert compact_body(small, 100).body is small
+
+    spaced = json.dumps({"items": [{"name": "a"}], "total": 1}, indent=4)
+    result = compact_body(spaced, 50)
+    assert result.steps == ["minify"]
+    assert json.loads(result.body) == json.loads(spaced)
+
+    value = {
+        "items": [{"name": f"item{i}", "note": "x" * 20} for i in range(10)],
+        "total": 10,
+        "comment": "c" * 20,
+    }
+    body = json.dumps(value)
+    result = compact_body(body, 300, ItemList)
+    assert result.steps == ["minify", "drop_optional_fields"]
+    assert json.loads(result.body) == {
+        "items": [{"name": f"item{i}"} for i in range(10)],
+        "total": 10,
+    }
+
+    result = compact_body(body, 150, ItemList)
+    assert result.steps == ["minify", "drop_optional_fields", "truncate_arrays"]
+    compacted = json.loads(result.body)
+    assert result.compacted_bytes == embedded_size(result.body) <= 150
+    assert compacted["items"][-1][TRUNCATED_KEY] + len(compacted["items"]) - 1 == 10
+    assert result.original_bytes == embedded_size(body)
+
+
+def test_compact_body_anomaly():
+    """
+    Anomaly ::
+        Bodies that can not fit are replaced with an error, text is truncated
+    """
+    result = compact_body(json.dumps({"text": "x" * 500}), 100)
+    assert result.steps[-1] == "error"
+    assert json.loads(result.body)["Code"] == "ResponseTooLarge"
+
+    result = compact_body("y" * 500, 100)
+    assert result.steps == ["truncate_text"]
+    assert result.body.endswith("...")
+    assert embedded_size(result.body) <= 100
+
+
+def test_truncate_arrays_and_drop_optional_fields():
+    """
+    Normally ::
+        The largest arrays are truncated first, nested models are followed
+    """
+    value = {"big": list(range(100)), "small": [1, 2]}
+    truncated = truncate_arrays(value, 60)
+    assert truncated["small"] == [1, 2]
+    assert truncated["big"][-1][TRUNCATED_KEY] == 101 - len(truncated["big"])
+
+    assert drop_optional_fields(
+        [{"items": [{"name": "a", "note": "n", "extra": 1}], "total": 1}], ItemList
+    ) == [{"items": [{"name": "a", "extra": 1}], "total": 1}]
+    assert drop_optional_fields({"a": 1}, None) == {"a": 1}
+
+
+def test_bedrock_agent_response_compaction(capsys):
+    """
+    Normally ::
+        Oversized responses are compacted per the Operation budget, silently
+    """
+    app = setup_compaction_app()
+
+    event = parameter_agents_for_amazon_bedrock(
+        APIParameter(httpMethod="GET", apiPath="/items")
+    )
+    response = app(event, {})
+
+    assert len(json.dumps(response)) <= 1024
+    body = json.loads(response["response"]["responseBody"]["application/json"]["body"])
+    assert body["total"] == 100
+    assert body["items"][0] == {"name": "item0"}
+    assert TRUNCATED_KEY in body["items"][-1]
+    assert capsys.readouterr().out == ""
+
+    event = parameter_agents_for_amazon_bedrock(
+        APIParameter(httpMethod="GET", apiPath="/small")
+    )
+    response = app(event, {})
+    assert response["response"]["responseBody"]["application/json"]["body"] == (
+        '{"ok":true}'
+    )
+
+
+def test_bedrock_agent_response_compaction_metric(capsys):
+    """
+    Normally ::
+        With emit_compaction_metric, each compaction is printed as a metric
+    """
+    app = setup_compaction_app()
+    converter = BedrockAgentEventToApiGateway(on_compaction=emit_compaction_metric)
+
+    for api_path in ("/items", "/small"):
+        event = parameter_agents_for_amazon_bedrock(
+            APIParameter(httpMethod="GET", apiPath=api_path)
+        )
+        converter.dispatch(app, event, {}, ConversionContext(event, app))
+
+    lines = capsys.readouterr().out.strip().splitlines()
+    assert len(lines) == 1
+    metric = json.loads(lines[0])
+    assert metric["Operation"] == "GET /items"
+    assert metric["ResponseCompacted"] == 1
+    assert metric["CompactionSteps"] == "minify,drop_optional_fields,truncate_arrays"
+    assert metric["_aws"]["CloudWatchMetrics"][0]["Namespace"] == "chalice-spec"
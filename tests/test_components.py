@@ -0,0 +1,183 @@
+import gc
+import weakref
+from typing import List, Optional
+
+from apispec import APISpec
+from pydantic import BaseModel, create_model
+
+from chalice_spec.chalice import ChaliceWithSpec
+from chalice_spec.components import ComponentRegistry
+from chalice_spec.docs import Docs, Op
+from chalice_spec.pydantic import PydanticPlugin
+from tests.schema import DeeplyNestedSchema, NestedSchema
+
+
+def build_spec():
+    return APISpec(
+        title="Test Schema",
+        openapi_version="3.0.1",
+        version="0.0.0",
+        plugins=[PydanticPlugin()],
+    )
+
+
+def content_schema(operation: dict) -> dict:
+    return operation["content"]["application/json"]["schema"]
+
+
+def test_models_with_the_same_name():
+    """
+    Normally ::
+        Models with the same class name are distinct components
+    """
+    order_item = create_model("Item", sku=(str, ...))
+    order_item.__module__ = "orders"
+    stock_item = create_model("Item", quantity=(int, ...))
+    stock_item.__module__ = "stock"
+    transfer = create_model(
+        "Transfer", source=(order_item, ...), target=(stock_item, ...)
+    )
+
+    spec = build_spec()
+    app = ChaliceWithSpec(app_name="test", spec=spec)
+
+    @app.route(
+        "/items",
+        methods=["POST"],
+        docs=Docs(post=Op(request=order_item, response=stock_item)),
+    )
+    def items():
+        pass
+
+    @app.route(
+        "/transfers",
+        methods=["POST"],
+        docs=Docs(post=Op(request=transfer, response=order_item)),
+    )
+    def transfers():
+        pass
+
+    result = spec.to_dict()
+    schemas = result["components"]["schemas"]
+    assert sorted(schemas) == ["Item", "Transfer", "stock__Item"]
+    assert schemas["Item"]["properties"] == {"sku": {"title": "Sku", "type": "string"}}
+    assert schemas["stock__Item"]["properties"] == {
+        "quantity": {"title": "Quantity", "type": "integer"}
+    }
+    assert schemas["Transfer"]["properties"] == {
+        "source": {"$ref": "#/components/schemas/Item"},
+        "target": {"$ref": "#/components/schemas/stock__Item"},
+    }
+    post = result["paths"]["/items"]["post"]
+    assert content_schema(post["requestBody"]) == {"$ref": "#/components/schemas/Item"}
+    assert content_schema(post["responses"]["200"]) == {
+        "$ref": "#/components/schemas/stock__Item"
+    }
+
+    registry = ComponentRegistry.for_spec(spec)
+    assert registry.name_of(order_item) == "Item"
+    assert registry.name_of(stock_item) == "stock__Item"
+
+
+def test_models_are_generated_once(monkeypatch):
+    """
+    Normally ::
+        A model reachable from many operations and models is registered once
+    """
+    registered = []
+    schema_helper = PydanticPlugin.schema_helper
+
+    def counting_schema_helper(self, name, definition, **kwargs):
+        if kwargs.get("model") is not None:
+            registered.append(kwargs["model"])
+        return schema_helper(self, name, definition, **kwargs)
+
+    monkeypatch.setattr(PydanticPlugin, "schema_helper", counting_schema_helper)
+
+    spec = build_spec()
+    app = ChaliceWithSpec(app_name="test", spec=spec)
+
+    @app.route(
+        "/nested", methods=["GET", "PUT"], docs=Docs(get=NestedSchema, put=NestedSchema)
+    )
+    def nested():
+        pass
+
+    @app.route("/deeply", methods=["GET"], docs=Docs(get=DeeplyNestedSchema))
+    def deeply():
+        pass
+
+    result = spec.to_dict()
+    assert sorted(model.__name__ for model in registered) == [
+        "DeeplyNestedSchema",
+        "MoreDeeplyNestedSchema",
+        "NestedSchema",
+    ]
+    for path, method in (("/nested", "get"), ("/nested", "put"), ("/deeply", "get")):
+        response = result["paths"][path][method]["responses"]["200"]
+        assert "$ref" in content_schema(response)
+
+
+def test_recursive_and_named_models():
+    """
+    Normally ::
+        Recursive models are components, models registered by name keep their name
+    """
+
+    class Node(BaseModel):
+        value: int
+        children: List["Node"] = []
+        parent: Optional["Node"] = None
+
+    if hasattr(Node, "model_rebuild"):
+        Node.model_rebuild()
+    else:
+        Node.update_forward_refs()
+
+    spec = build_spec()
+    spec.components.schema("Nested", model=NestedSchema)
+    app = ChaliceWithSpec(app_name="test", spec=spec)
+
+    @app.route(
+        "/nodes",
+        methods=["POST"],
+        docs=Docs(post=Op(request=Node, response=NestedSchema)),
+    )
+    def nodes():
+        pass
+
+    result = spec.to_dict()
+    schemas = result["components"]["schemas"]
+    assert "NestedSchema" not in schemas
+    assert schemas["Node"]["properties"]["children"]["items"] == {
+        "$ref": "#/components/schemas/Node"
+    }
+    post = result["paths"]["/nodes"]["post"]
+    assert content_schema(post["requestBody"]) == {"$ref": "#/components/schemas/Node"}
+    assert content_schema(post["responses"]["200"]) == {
+        "$ref": "#/components/schemas/Nested"
+    }
+
+
+def test_registry_is_dropped_with_the_spec():
+    """
+    Normally ::
+        The registry of a spec is not kept on the spec, and does not keep it alive
+    """
+    spec = build_spec()
+    registry = ComponentRegistry.for_spec(spec)
+    assert ComponentRegistry.for_spec(spec) is registry
+    assert registry.register(NestedSchema) == "NestedSchema"
+    assert "_chalice_spec_components" not in vars(spec)
+
+    collected = weakref.ref(spec)
+    del spec
+    gc.collect()
+    assert collected() is None
+
+    namespace = {}
+    exec("from chalice_spec.components import *", namespace)
+    assert sorted(set(namespace) - {"__builtins__"}) == [
+        "ComponentRegistry",
+        "long_model_name",
+    ]
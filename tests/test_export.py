@@ -0,0 +1,170 @@
+import json
+from typing import List, Optional
+
+from pydantic import BaseModel, Field
+
+from chalice_spec.docs import Docs, Operation
+from chalice_spec.export import (
+    dumps_spec,
+    inline_single_use_components,
+    minify_spec,
+    prune_components,
+    spec_size_report,
+)
+from tests.schema import TestSchema, AnotherSchema
+from tests.test_runtime import setup_test
+
+
+class Address(BaseModel):
+    city: str = Field(..., description="City name", example="Tokyo")
+
+
+class Node(BaseModel):
+    name: str
+    children: List["Node"] = []
+
+
+Node.update_forward_refs()
+
+
+class Customer(BaseModel):
+    """
+    A customer of the shop, with the address where orders are delivered.
+    """
+
+    name: str = Field(..., description="Full name of the customer")
+    address: Address = Field(..., description="Delivery address")
+    billing: Optional[Address] = None
+    tree: Optional[Node] = None
+
+
+def setup_export_app():
+    app, spec = setup_test(None)
+
+    @app.route(
+        "/customers",
+        methods=["POST"],
+        docs=Docs(post=Operation(request=Customer, response=AnotherSchema)),
+    )
+    def create_customer():
+        """
+        Create a customer.
+
+        The customer is created with its delivery address, and an optional
+        billing address.
+        """
+
+    return app, spec
+
+
+def test_prune_components():
+    """
+    Normally ::
+        Schemas that no path references, directly or not, are removed
+    """
+    spec = {
+        "paths": {"/a": {"get": {"schema": {"$ref": "#/components/schemas/A"}}}},
+        "components": {
+            "schemas": {
+                "A": {"properties": {"b": {"$ref": "#/components/schemas/B"}}},
+                "B": {"type": "string"},
+                "C": {"type": "string"},
+            }
+        },
+    }
+    assert list(prune_components(spec)["components"]["schemas"]) == ["A", "B"]
+
+
+def test_minify_spec():
+    """
+    Normally ::
+        The minified spec keeps paths, types and required fields, without
+        titles, unused schemas and allOf wrappers
+    """
+    app, spec = setup_export_app()
+    spec.components.schema("Unused", model=TestSchema, spec=spec)
+    original = spec.to_dict()
+
+    minified = minify_spec(spec, inline_components=False)
+
+    schemas = minified["components"]["schemas"]
+    assert sorted(schemas) == ["Address", "AnotherSchema", "Customer", "Node"]
+    customer = schemas["Customer"]
+    assert "title" not in customer
+    assert customer["required"] == ["name", "address"]
+    assert customer["properties"]["billing"] == {"$ref": "#/components/schemas/Address"}
+    # allOf with a description : $ref can not have siblings
+    assert customer["properties"]["address"] == {
+        "description": "Delivery address",
+        "allOf": [{"$ref": "#/components/schemas/Address"}],
+    }
+    assert schemas["Address"]["properties"]["city"]["example"] == "Tokyo"
+    assert minified["paths"]["/customers"]["post"]["summary"] == "Create a customer."
+    # The spec is left as is
+    assert spec.to_dict() == original
+    assert len(dumps_spec(minified)) < len(dumps_spec(original))
+
+
+def test_minify_spec_options():
+    """
+    Normally ::
+        Examples are stripped, descriptions truncated, single use schemas inlined
+    """
+    app, spec = setup_export_app()
+
+    minified = minify_spec(spec, strip_examples=True, max_description_length=20)
+
+    schemas = minified["components"]["schemas"]
+    # Address is used twice, Node is recursive
+    assert sorted(schemas) == ["Address", "Node"]
+    assert schemas["Address"]["properties"]["city"] == {
+        "type": "string",
+        "description": "City name",
+    }
+    post = minified["paths"]["/customers"]["post"]
+    assert post["description"] == "The customer is..."
+    customer = post["requestBody"]["content"]["application/json"]["schema"]
+    assert customer["type"] == "object"
+    assert customer["description"] == "A customer of the..."
+    assert post["responses"]["200"]["content"]["application/json"]["schema"] == {
+        "type": "object",
+        "properties": {"nintendo": {"type": "string"}, "atari": {"type": "string"}},
+        "required": ["nintendo", "atari"],
+    }
+
+
+def test_inline_single_use_components():
+    """
+    Normally ::
+        Components referenced once are inlined, and removed
+    """
+    spec = {
+        "paths": {"/a": {"get": {"schema": {"$ref": "#/components/schemas/A"}}}},
+        "components": {"schemas": {"A": {"type": "string"}}},
+    }
+    assert inline_single_use_components(spec) == {
+        "paths": {"/a": {"get": {"schema": {"type": "string"}}}}
+    }
+
+
+def test_spec_size_report():
+    """
+    Normally ::
+        Sizes are reported against the budget
+    Anomaly ::
+        Over budget specs are reported
+    """
+    app, spec = setup_export_app()
+    minified = minify_spec(spec)
+
+    report = spec_size_report(spec, minified)
+    assert report.exported_bytes == len(json.dumps(minified, separators=(",", ":")))
+    assert report.original_bytes > report.exported_bytes
+    assert report.operations == 1
+    assert report.estimated_tokens == report.exported_bytes // 4
+    assert report.within_limits
+    assert "1 / 11 operations" in str(report)
+
+    report = spec_size_report(spec, minified, max_bytes=10)
+    assert not report.within_limits
+    assert str(report).endswith("OVER LIMITS")
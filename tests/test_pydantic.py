@@ -1,7 +1,7 @@
 from apispec import APISpec
 
 from chalice_spec.pydantic import PydanticPlugin
-from tests.schema import TestSchema, NestedSchema
+from tests.schema import DeeplyNestedSchema, NestedSchema, TestSchema
 
 
 def test_pydantic():
@@ -78,3 +78,54 @@ def test_deeply_nested_schemas():
             }
         },
     }
+
+
+def test_schema_cache():
+    import enum
+    import gc
+    import weakref
+    from typing import List, Optional
+
+    from pydantic import BaseModel, create_model
+
+    from chalice_spec.compat import model_json_schema
+    from chalice_spec.pydantic import REF_TEMPLATE, _schema_cache, model_schema
+
+    class Color(enum.Enum):
+        RED = "red"
+
+    class Leaf(BaseModel):
+        color: Color
+
+    class Branch(BaseModel):
+        leaves: List[Leaf]
+        nested: Optional[NestedSchema] = None
+
+    class Tree(BaseModel):
+        branch: Branch
+        leaf: Leaf
+        children: List["Tree"] = []
+
+    if hasattr(Tree, "model_rebuild"):
+        Tree.model_rebuild()
+    else:
+        Tree.update_forward_refs()
+
+    # Nested models are cached first, then reused by the models that reference them
+    for model in (DeeplyNestedSchema, Leaf, Tree, Branch, NestedSchema, TestSchema):
+        expected = model_json_schema(model, REF_TEMPLATE)
+        expected_definitions = expected.pop("definitions", {})
+        schema, definitions = model_schema(model)
+        assert schema == expected
+        assert definitions == expected_definitions
+        # Generated once per process
+        assert model_schema(model)[0] is schema
+
+    # Models are not kept alive by the cache
+    model = create_model("Transient", name=(str, ...))
+    model_schema(model)
+    assert model in _schema_cache
+    transient = weakref.ref(model)
+    del model
+    gc.collect()
+    assert transient() is None
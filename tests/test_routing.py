@@ -0,0 +1,250 @@
+import pytest
+
+from chalice_spec.chalice import ChaliceWithSpec, LazyAPISpec
+from chalice_spec.docs import Docs, Operation
+from chalice_spec.runtime.routing import (
+    ActionGroupIndex,
+    OperationIndex,
+    ParameterIndex,
+    RouteTrie,
+)
+from tests.schema import AnotherSchema
+from tests.test_runtime import setup_test
+
+
+def test_route_trie_match():
+    """
+    Normally :: Match concrete paths against route paths
+
+    Expects:
+        Literal segments take precedence, parameters are decoded
+    """
+    trie = RouteTrie(
+        ["/", "/items", "/items/{id}", "/items/new", "/items/{id}/tags/{tag}"]
+    )
+    assert trie.match("/") == ("/", {})
+    assert trie.match("/items") == ("/items", {})
+    assert trie.match("/items/") == ("/items", {})
+    assert trie.match("/items/new") == ("/items/new", {})
+    assert trie.match("/items/a%2Fb") == ("/items/{id}", {"id": "a/b"})
+    assert trie.match("/items/1/tags/x") == (
+        "/items/{id}/tags/{tag}",
+        {"id": "1", "tag": "x"},
+    )
+    assert trie.match("/items/1/tags") is None
+    assert trie.match("/unknown") is None
+
+
+def test_route_trie_backtracking():
+    """
+    Normally :: Fall back to a parameter when a literal branch does not match
+
+    Expects:
+        /items/new/tags matches the parameter route
+    """
+    trie = RouteTrie(["/items/new", "/items/{id}/tags"])
+    assert trie.match("/items/new/tags") == ("/items/{id}/tags", {"id": "new"})
+
+
+def test_route_trie_parameter_names():
+    """
+    Normally :: Routes sharing a parameter segment keep their own parameter names
+
+    Expects:
+        /users/{id} and /users/{user_id}/posts name the parameter of their route
+    """
+    trie = RouteTrie(["/users/{id}", "/users/{user_id}/posts/{post_id}"])
+    assert trie.match("/users/1") == ("/users/{id}", {"id": "1"})
+    assert trie.match("/users/1/posts/2") == (
+        "/users/{user_id}/posts/{post_id}",
+        {"user_id": "1", "post_id": "2"},
+    )
+    assert trie.match("/users/1/posts") is None
+
+
+def test_operation_index_precedence():
+    """
+    Normally :: Documented operationIds take precedence over generated ids and view names
+
+    Expects:
+        A generated id or a view name equal to a documented id does not hide it
+    """
+    app, spec = setup_test(None)
+
+    @app.route("/get_items", methods=["GET"], docs=Docs(get=AnotherSchema))
+    def list_items():
+        pass
+
+    @app.route(
+        "/items",
+        methods=["GET"],
+        docs=Docs(get=Operation(response=AnotherSchema, operation_id="get_get_items")),
+    )
+    def get_items():
+        pass
+
+    @app.route("/catalog", methods=["GET"], docs=Docs(get=AnotherSchema))
+    def get_items_catalog():
+        pass
+
+    index = OperationIndex(app)
+    assert index.get("get_get_items") == ("/items", "GET")
+    assert index.get("list_items") == ("/get_items", "GET")
+    assert index.get("get_catalog") == ("/catalog", "GET")
+
+
+def test_operation_index_collisions():
+    """
+    Anomaly :: Two routes with the same operationId
+
+    Expects:
+        Documented collisions raise when the index is built, generated
+        collisions raise only when asked for
+    """
+    app, spec = setup_test(None)
+
+    @app.route("/a-b", methods=["GET"], docs=Docs(get=AnotherSchema))
+    def dashed():
+        pass
+
+    @app.route("/a/b", methods=["GET"], docs=Docs(get=AnotherSchema))
+    def nested():
+        pass
+
+    index = OperationIndex(app)
+    assert index.get("dashed") == ("/a-b", "GET")
+    assert index.get("nested") == ("/a/b", "GET")
+    with pytest.raises(ValueError, match="get_a_b"):
+        index.get("get_a_b")
+
+    # Lazy : the spec would raise too, when materialized
+    spec = LazyAPISpec(title="Test Schema", openapi_version="3.0.1", version="0.0.0")
+    app = ChaliceWithSpec(app_name="test", spec=spec, lazy_spec=True)
+    for path in ("/first", "/second"):
+
+        @app.route(
+            path,
+            methods=["GET"],
+            name=path[1:],
+            docs=Docs(get=Operation(response=AnotherSchema, operation_id="getThing")),
+        )
+        def view():
+            pass
+
+    with pytest.raises(ValueError, match="getThing"):
+        OperationIndex(app)
+
+
+def test_route_trie_for_app():
+    """
+    Normally :: Build the trie of an app once
+
+    Expects:
+        The trie is reused, and rebuilt when routes are added
+    """
+    app, spec = setup_test(None)
+
+    @app.route("/items/{id}")
+    def get_item(id):
+        pass
+
+    trie = RouteTrie.for_app(app)
+    assert RouteTrie.for_app(app) is trie
+
+    @app.route("/users/{id}")
+    def get_user(id):
+        pass
+
+    assert RouteTrie.for_app(app) is not trie
+    assert RouteTrie.for_app(app).match("/users/1") == ("/users/{id}", {"id": "1"})
+
+
+def test_parameter_index():
+    """
+    Normally :: Index the location of the parameters of each route
+
+    Expects:
+        Path parameters, and parameters declared on the documented Operation
+    """
+    app, spec = setup_test(None)
+
+    @app.route(
+        "/items/{id}",
+        methods=["GET", "DELETE"],
+        docs=Docs(
+            get=Operation(
+                response=AnotherSchema,
+                parameters=[{"in": "query", "name": "limit"}],
+            )
+        ),
+    )
+    def item(id):
+        pass
+
+    index = ParameterIndex.for_app(app)
+    assert index.locations("/items/{id}", "get") == {"id": "path", "limit": "query"}
+    assert index.locations("/items/{id}", "DELETE") == {"id": "path"}
+    assert index.locations("/unknown", "GET") == {}
+    assert ParameterIndex.for_app(app) is index
+
+
+def test_operation_index_shadowed_collisions():
+    """
+    Normally :: Two routes with the same generated operationId (/a-b and /a/b)
+        and their own documented operationIds
+
+    Expects:
+        Both routes are indexed by their documented operationId
+    """
+    app, spec = setup_test(None)
+
+    @app.route(
+        "/a-b",
+        methods=["GET"],
+        docs=Docs(get=Operation(response=AnotherSchema, operation_id="getDashed")),
+    )
+    def dashed():
+        pass
+
+    @app.route(
+        "/a/b",
+        methods=["GET"],
+        docs=Docs(get=Operation(response=AnotherSchema, operation_id="get_a_b")),
+    )
+    def nested():
+        pass
+
+    index = OperationIndex(app)
+    assert index.get("getDashed") == ("/a-b", "GET")
+    assert index.get("get_a_b") == ("/a/b", "GET")
+
+
+def test_indexes_are_kept_on_the_app():
+    """
+    Normally :: The indexes of an app are built once
+
+    Expects:
+        They are rebuilt when a method is added to a path, or a route is bound
+    """
+    app, spec = setup_test(None)
+
+    @app.route("/items", methods=["GET"])
+    def list_items():
+        pass
+
+    trie = RouteTrie.for_app(app)
+    index = OperationIndex.for_app(app)
+    groups = ActionGroupIndex.for_app(app)
+    assert RouteTrie.for_app(app) is trie
+    assert OperationIndex.for_app(app) is index
+
+    @app.route("/items", methods=["POST"])
+    def create_item():
+        pass
+
+    assert RouteTrie.for_app(app) is not trie
+    assert OperationIndex.for_app(app).get("create_item") == ("/items", "POST")
+    assert ActionGroupIndex.for_app(app) is not groups
+
+    app.bind_action_group("Items", "/items", ["GET"])
+    assert "Items" in ActionGroupIndex.for_app(app)
@@ -1,25 +1,44 @@
 import json
+import subprocess
+import sys
 from apispec import APISpec
+from chalice_spec import compat
 from chalice_spec.chalice import ChaliceWithSpec
-from chalice_spec.docs import Docs
+from chalice_spec.docs import Docs, Operation
 from chalice_spec.pydantic import PydanticPlugin
 from chalice_spec.runtime.api_runtime import (
+    APIRuntime,
     APIRuntimeBedrockAgent,
     APIRuntimeAll,
     APIRuntimeApiGateway,
+    classify_event,
+)
+from chalice_spec.runtime import registry
+from chalice_spec.runtime.converter import ConversionContext, EventConverter
+from chalice_spec.runtime.registry import (
+    RuntimeDefinition,
+    RuntimeRegistry,
+    register_runtime,
+)
+from chalice_spec.runtime.models.apigw import APIGatewayProxyEventView
+from chalice_spec.runtime.models.bedrock_agent import (
+    BedrockAgentEventModel,
+    BedrockAgentEventView,
 )
-from chalice_spec.runtime.converter import EventConverter
 from chalice_spec.runtime.model_utility.apigw import (
+    API_GATEWAY_EVENT_TEMPLATE,
+    build_api_gateway_event,
     empty_api_gateway_event,
     is_api_gateway_event,
 )
 from chalice_spec.runtime.model_utility.bedrock_agent import (
+    build_bedrock_agent_response,
     empty_bedrock_agent_event,
     empty_bedrock_agent_response,
     is_bedrock_agent_event,
 )
 from tests.schema import TestSchema, AnotherSchema
-from pydantic import BaseModel
+from pydantic import BaseModel, ValidationError
 
 
 def setup_test(runtime):
@@ -345,3 +364,474 @@ def test_utility_functions_create_empty_base_models():
     assert not is_api_gateway_event(empty_bedrock_agent_event().dict(by_alias=True))
     assert not is_bedrock_agent_event(empty_api_gateway_event().dict(by_alias=True))
     empty_bedrock_agent_response()
+
+
+def test_classify_event_by_shape():
+    """
+    Normally :: Classify events from their discriminating keys
+
+    Expects:
+        Each event is classified to the runtime that sent it
+    """
+    api_gateway = parameter_api_gateway(
+        APIParameter(httpMethod="POST", apiPath="/posts")
+    )
+    bedrock_agent = parameter_agents_for_amazon_bedrock(
+        APIParameter(httpMethod="POST", apiPath="/posts")
+    )
+    assert classify_event(api_gateway, APIRuntimeAll) == APIRuntime.APIGateway
+    assert classify_event(bedrock_agent, APIRuntimeAll) == APIRuntime.BedrockAgent
+    assert classify_event(api_gateway, APIRuntimeBedrockAgent) is None
+    assert classify_event(bedrock_agent, APIRuntimeApiGateway) is None
+    assert classify_event({"Hello": "world"}, APIRuntimeAll) is None
+
+
+def test_classify_event_strict():
+    """
+    Anomaly :: Classify an event that has the right shape, but is invalid
+
+    Condition:
+        API Gateway event without requestContext.identity
+    Expects:
+        Shape classifier accepts the event, strict classifier rejects it
+    """
+    event = parameter_api_gateway(APIParameter(httpMethod="POST", apiPath="/posts"))
+    del event["requestContext"]["identity"]
+    assert is_api_gateway_event(event)
+    assert not is_api_gateway_event(event, strict=True)
+    assert classify_event(event, APIRuntimeAll, strict=True) is None
+
+
+def test_invoke_with_strict_event_detection():
+    """
+    Normally :: Invoke with strict event detection
+
+    Condition:
+        Invoke from Amazon Bedrock Agent and Amazon API Gateway
+    Expects:
+        Return response for Correct response
+    """
+    spec = APISpec(
+        title="Test Schema",
+        openapi_version="3.0.1",
+        version="0.0.0",
+        plugins=[PydanticPlugin()],
+    )
+    app = ChaliceWithSpec(
+        app_name="test", spec=spec, runtime=APIRuntimeAll, strict_event_detection=True
+    )
+
+    @app.route(
+        "/posts",
+        methods=["POST"],
+        content_types=["application/json"],
+        docs=Docs(request=TestSchema, response=AnotherSchema),
+    )
+    def get_post():
+        return AnotherSchema(nintendo="koikoi", atari="game").json()
+
+    response = app(
+        parameter_api_gateway(APIParameter(httpMethod="POST", apiPath="/posts")),
+        {},
+    )
+    assert response["statusCode"] == 200
+
+    response = app(
+        parameter_agents_for_amazon_bedrock(
+            APIParameter(httpMethod="POST", apiPath="/posts")
+        ),
+        {},
+    )
+    assert response["response"]["httpStatusCode"] == 200
+
+
+def test_bedrock_agent_event_parsed_once(monkeypatch):
+    """
+    Normally :: Bedrock Agent event is parsed once per invocation
+
+    Condition:
+        Invoke from Amazon Bedrock Agent with strict event detection
+    Expects:
+        Detection, request and response conversion share one parsed event
+    """
+    spec = APISpec(
+        title="Test Schema",
+        openapi_version="3.0.1",
+        version="0.0.0",
+        plugins=[PydanticPlugin()],
+    )
+    app = ChaliceWithSpec(
+        app_name="test",
+        spec=spec,
+        runtime=APIRuntimeBedrockAgent,
+        strict_event_detection=True,
+    )
+
+    @app.route(
+        "/posts",
+        methods=["POST"],
+        content_types=["application/json"],
+        docs=Docs(request=TestSchema, response=AnotherSchema),
+    )
+    def get_post():
+        return AnotherSchema(nintendo="koikoi", atari="game").json()
+
+    calls = []
+    parse_model = compat.parse_model
+
+    def counting_parse_model(model, obj):
+        if model is BedrockAgentEventModel:
+            calls.append(obj)
+        return parse_model(model, obj)
+
+    monkeypatch.setattr(compat, "parse_model", counting_parse_model)
+
+    response = app(
+        parameter_agents_for_amazon_bedrock(
+            APIParameter(httpMethod="POST", apiPath="/posts")
+        ),
+        {},
+    )
+    assert response["response"]["httpStatusCode"] == 200
+    assert len(calls) == 1
+
+
+def test_conversion_context_parse():
+    """
+    Normally :: Conversion context caches the parsed model
+
+    Expects:
+        The same parsed model is returned for the same model class
+    """
+    conversion = ConversionContext(empty_bedrock_agent_event().dict(by_alias=True))
+    assert conversion.parse(BedrockAgentEventModel) is conversion.parse(
+        BedrockAgentEventModel
+    )
+
+
+def test_build_events_from_templates():
+    """
+    Normally :: Build events from the immutable templates
+
+    Expects:
+        Built events are valid, and changing them does not touch the template
+    """
+    event = build_api_gateway_event(
+        http_method="POST",
+        resource_path="/posts",
+        headers={"content-type": "application/json"},
+        body="{}",
+    )
+    assert is_api_gateway_event(event, strict=True)
+    assert event["requestContext"]["httpMethod"] == "POST"
+    assert event["requestContext"]["resourcePath"] == "/posts"
+
+    event["requestContext"]["identity"]["sourceIp"] = "127.0.0.1"
+    event["multiValueHeaders"]["accept"] = ["application/json"]
+    assert API_GATEWAY_EVENT_TEMPLATE["requestContext"]["identity"] == {
+        "sourceIp": "0.0.0.0"
+    }
+    assert API_GATEWAY_EVENT_TEMPLATE["multiValueHeaders"] == {}
+    try:
+        API_GATEWAY_EVENT_TEMPLATE["body"] = "changed"
+        assert False
+    except TypeError:
+        pass
+
+    response = build_bedrock_agent_response(
+        action_group="Main",
+        api_path="/posts",
+        http_method="POST",
+        http_status_code=200,
+        content_type="application/json",
+        body="{}",
+    )
+    assert response["response"]["responseBody"] == {"application/json": {"body": "{}"}}
+
+
+def test_lazy_event_views():
+    """
+    Normally :: Read events through lazy views
+
+    Expects:
+        Fields are readable by name and by alias, and only read fields are validated
+    """
+    event = parameter_api_gateway(APIParameter(httpMethod="POST", apiPath="/posts"))
+    # identity is invalid, but the view does not validate it until it is read
+    event["requestContext"]["identity"] = {}
+    view = APIGatewayProxyEventView(event)
+    assert view.requestContext.httpMethod == "POST"
+    assert view.requestContext.resourcePath == "/posts"
+    assert view.headers == {"content-type": "application/json"}
+    try:
+        view.requestContext.identity.sourceIp
+        assert False
+    except ValidationError:
+        pass
+
+    agent_event = BedrockAgentEventView(
+        parameter_agents_for_amazon_bedrock(
+            APIParameter(httpMethod="POST", apiPath="/posts")
+        )
+    )
+    assert agent_event.http_method == "POST"
+    assert agent_event.httpMethod == "POST"
+    assert agent_event.agent.id_ == "string"
+    assert agent_event.parameters[0].type_ == "string"
+    assert isinstance(agent_event.to_model(), BedrockAgentEventModel)
+
+
+def test_lazy_event_views_anomaly():
+    """
+    Anomaly :: Read missing fields, write to the view
+
+    Expects:
+        Missing required fields raise ValidationError, views are read-only
+    """
+    view = BedrockAgentEventView({"messageVersion": "1.0"})
+    assert view.parameters is None
+    try:
+        view.api_path
+        assert False
+    except ValidationError:
+        pass
+    try:
+        view.api_path = "/posts"
+        assert False
+    except AttributeError:
+        pass
+    try:
+        view.unknown_field
+        assert False
+    except AttributeError:
+        pass
+
+
+def test_invoke_from_agents_for_amazon_bedrock_in_process_body():
+    """
+    Normally :: Request body reaches the handler in-process
+
+    Condition:
+        Invoke from Amazon Bedrock Agent, handler returns a pydantic model
+    Expects:
+        Handler reads the converted body without JSON parsing,
+        and the returned model is serialized into the response body
+    """
+    app, spec = setup_test(APIRuntimeBedrockAgent)
+    received = {}
+
+    @app.route(
+        "/posts",
+        methods=["POST"],
+        content_types=["application/json"],
+        docs=Docs(request=TestSchema, response=AnotherSchema),
+    )
+    def get_post():
+        received["event_body"] = app.current_request.to_original_event()["body"]
+        received["json_body"] = app.current_request.json_body
+        received["raw_body"] = app.current_request.raw_body
+        return AnotherSchema(nintendo="koikoi", atari="game")
+
+    response = app(
+        parameter_agents_for_amazon_bedrock(
+            APIParameter(httpMethod="POST", apiPath="/posts")
+        ),
+        {},
+    )
+    assert received["event_body"] is None
+    assert received["json_body"] == {"hello": "hello", "world": 123}
+    assert json.loads(received["raw_body"]) == received["json_body"]
+    assert response["response"]["httpStatusCode"] == 200
+    assert json.loads(
+        response["response"]["responseBody"]["application/json"]["body"]
+    ) == {"nintendo": "koikoi", "atari": "game"}
+
+
+def test_invoke_from_agents_for_amazon_bedrock_parameters():
+    """
+    Normally :: Parameters are mapped to path parameters, query strings, headers
+        and cookies
+
+    Condition:
+        Invoke from Amazon Bedrock Agent, with the apiPath of a route with path parameters
+    Expects:
+        Parameters are mapped according to their "in" in the spec,
+        undeclared parameters are query strings
+    """
+    app, spec = setup_test(APIRuntimeBedrockAgent)
+    received = {}
+
+    @app.route(
+        "/items/{item_id}/tags/{tag}",
+        methods=["GET"],
+        docs=Docs(
+            get=Operation(
+                response=AnotherSchema,
+                parameters=[
+                    {"in": "query", "name": "limit", "schema": {"type": "integer"}},
+                    {"in": "header", "name": "X-Trace", "schema": {"type": "string"}},
+                    {"in": "cookie", "name": "session", "schema": {"type": "string"}},
+                    {"in": "cookie", "name": "theme", "schema": {"type": "string"}},
+                ],
+            )
+        ),
+    )
+    def get_item_tag(item_id, tag):
+        request = app.current_request
+        received["uri_params"] = request.uri_params
+        received["query_params"] = dict(request.query_params or {})
+        received["trace"] = request.headers.get("x-trace")
+        received["cookie"] = request.headers.get("cookie")
+        received["path"] = request.to_original_event()["path"]
+        return AnotherSchema(nintendo=item_id, atari=tag)
+
+    @app.route("/items/new/tags/{tag}", methods=["GET"])
+    def get_new_item_tag(tag):
+        return {}
+
+    event = parameter_agents_for_amazon_bedrock(
+        APIParameter(httpMethod="GET", apiPath="/items/{item_id}/tags/{tag}")
+    )
+    event["parameters"] = [
+        {"name": "item_id", "type": "string", "value": "a/1"},
+        {"name": "tag", "type": "string", "value": "red"},
+        {"name": "limit", "type": "integer", "value": "10"},
+        {"name": "X-Trace", "type": "string", "value": "abc"},
+        {"name": "session", "type": "string", "value": "s1"},
+        {"name": "theme", "type": "string", "value": "dark; admin=1"},
+        {"name": "other", "type": "string", "value": "x"},
+    ]
+    response = app(event, {})
+
+    assert response["response"]["httpStatusCode"] == 200
+    assert received == {
+        "uri_params": {"item_id": "a/1", "tag": "red"},
+        "query_params": {"limit": "10", "other": "x"},
+        "trace": "abc",
+        "cookie": "session=s1; theme=dark%3B%20admin=1",
+        "path": "/items/a%2F1/tags/red",
+    }
+
+
+def test_invoke_from_api_gateway_returns_model():
+    """
+    Normally :: Handler returns a pydantic model
+
+    Condition:
+        Invoke from Amazon API Gateway
+    Expects:
+        The returned model is serialized into the response body
+    """
+    app, spec = setup_test(APIRuntimeApiGateway)
+
+    @app.route(
+        "/posts",
+        methods=["POST"],
+        content_types=["application/json"],
+        docs=Docs(request=TestSchema, response=AnotherSchema),
+    )
+    def get_post():
+        assert app.current_request.json_body == {"hello": "abc", "world": 123}
+        return AnotherSchema(nintendo="koikoi", atari="game")
+
+    response = app(
+        parameter_api_gateway(APIParameter(httpMethod="POST", apiPath="/posts")),
+        {},
+    )
+    assert response["statusCode"] == 200
+    assert json.loads(response["body"]) == {"nintendo": "koikoi", "atari": "game"}
+
+
+def is_custom_event(event, strict=False, conversion=None):
+    return isinstance(event, dict) and "customPath" in event
+
+
+class CustomEventToApiGateway(EventConverter):
+    def convert_request(self, event, conversion=None):
+        return build_api_gateway_event(
+            http_method="GET",
+            resource_path=event["customPath"],
+            headers={"content-type": "application/json"},
+        )
+
+    def convert_response(self, event, response, conversion=None):
+        return {"custom": json.loads(response["body"])}
+
+
+def test_invoke_from_registered_runtime():
+    """
+    Normally :: Invoke from a runtime registered by name
+
+    Condition:
+        Runtime is registered with import paths of the detector and converter
+    Expects:
+        Converter is imported on first matching event, and converts the response
+    """
+    register_runtime(
+        "custom",
+        detector="tests.test_runtime:is_custom_event",
+        converter="tests.test_runtime:CustomEventToApiGateway",
+    )
+    app, spec = setup_test(["custom", APIRuntime.APIGateway])
+
+    @app.route("/hello", methods=["GET"])
+    def hello():
+        return {"hello": "world"}
+
+    assert app({"customPath": "/hello"}, {}) == {"custom": {"hello": "world"}}
+    response = app(
+        parameter_api_gateway(APIParameter(httpMethod="GET", apiPath="/hello")),
+        {},
+    )
+    assert response["statusCode"] == 200
+
+
+def test_runtime_registry_entry_points(monkeypatch):
+    """
+    Normally :: Load runtimes from entry points
+
+    Condition:
+        Runtime is not registered, but is provided by an entry point
+    Expects:
+        Runtime is loaded from the entry point, unknown runtimes raise KeyError
+    """
+
+    class EntryPoint:
+        name = "entry-point-runtime"
+
+        def load(self):
+            return RuntimeDefinition(
+                "entry-point-runtime", is_custom_event, CustomEventToApiGateway
+            )
+
+    monkeypatch.setattr(registry, "_entry_points", lambda group: [EntryPoint()])
+    runtime_registry = RuntimeRegistry()
+    definition = runtime_registry.get("entry-point-runtime")
+    assert definition.detect({"customPath": "/"})
+    assert isinstance(definition.create_converter(), CustomEventToApiGateway)
+    assert runtime_registry.get("entry-point-runtime") is definition
+    try:
+        runtime_registry.get("unknown-runtime")
+        assert False
+    except KeyError:
+        pass
+
+
+def test_converters_are_imported_lazily():
+    """
+    Normally :: Import chalice-spec without Bedrock converter
+
+    Expects:
+        Bedrock converter and models are not imported until a Bedrock event arrives
+    """
+    subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            "import sys, chalice_spec; "
+            "assert 'chalice_spec.runtime.converter.bedrock_agent_event_to_apigw' "
+            "not in sys.modules; "
+            "assert 'chalice_spec.runtime.models.bedrock_agent' not in sys.modules",
+        ],
+        check=True,
+    )
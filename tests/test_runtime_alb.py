@@ -0,0 +1,115 @@
+import json
+
+from chalice import Response
+
+from chalice_spec.runtime.api_runtime import (
+    APIRuntimeAll,
+    APIRuntimeApplicationLoadBalancer,
+    classify_event,
+)
+from chalice_spec.runtime.model_utility.alb import is_alb_event
+from tests.test_runtime import setup_test
+
+
+def parameter_alb(method: str, path: str, multi_value: bool = False, body: str = ""):
+    event = {
+        "requestContext": {
+            "elb": {
+                "targetGroupArn": "arn:aws:elasticloadbalancing:us-east-1:"
+                "123456789012:targetgroup/lambda/abcdef"
+            }
+        },
+        "httpMethod": method,
+        "path": path,
+        "body": body,
+        "isBase64Encoded": False,
+    }
+    if multi_value:
+        event["multiValueHeaders"] = {
+            "content-type": ["application/json"],
+            "x-forwarded-for": ["192.0.2.1", "192.0.2.2"],
+        }
+        event["multiValueQueryStringParameters"] = {"tag": ["a%20b", "c"]}
+    else:
+        event["headers"] = {
+            "content-type": "application/json",
+            "x-forwarded-for": "192.0.2.1",
+        }
+        event["queryStringParameters"] = {"tag": "a%20b"}
+    return event
+
+
+def setup_alb_app():
+    app, spec = setup_test(APIRuntimeApplicationLoadBalancer)
+
+    @app.route("/items/{item_id}", methods=["POST"])
+    def post_item(item_id):
+        request = app.current_request
+        return Response(
+            body={
+                "item_id": item_id,
+                "tags": request.query_params.getlist("tag"),
+                "forwarded_for": request.headers["x-forwarded-for"],
+                "body": request.json_body,
+            },
+            headers={"Set-Cookie": ["a=1", "b=2"], "X-Single": "one"},
+            status_code=201,
+        )
+
+    return app
+
+
+def test_invoke_from_alb_single_value():
+    """
+    Normally :: Invoke from Application Load Balancer in single-value mode
+
+    Expects:
+        Handler is routed with decoded query strings,
+        response is built with single-value headers
+    """
+    app = setup_alb_app()
+    response = app(parameter_alb("POST", "/items/1", body='{"hello": "world"}'), {})
+    assert response["statusCode"] == 201
+    assert response["statusDescription"] == "201 Created"
+    assert "multiValueHeaders" not in response
+    assert response["headers"]["X-Single"] == "one"
+    assert response["headers"]["Set-Cookie"] == "b=2"
+    assert json.loads(response["body"]) == {
+        "item_id": "1",
+        "tags": ["a b"],
+        "forwarded_for": "192.0.2.1",
+        "body": {"hello": "world"},
+    }
+
+
+def test_invoke_from_alb_multi_value():
+    """
+    Normally :: Invoke from Application Load Balancer in multi-value mode
+
+    Expects:
+        Handler receives every query value,
+        response is built with multi-value headers
+    """
+    app = setup_alb_app()
+    response = app(parameter_alb("POST", "/items/1", multi_value=True, body="{}"), {})
+    assert response["statusCode"] == 201
+    assert "headers" not in response
+    assert response["multiValueHeaders"]["Set-Cookie"] == ["a=1", "b=2"]
+    assert response["multiValueHeaders"]["X-Single"] == ["one"]
+    assert json.loads(response["body"])["tags"] == ["a b", "c"]
+    assert json.loads(response["body"])["forwarded_for"] == "192.0.2.2"
+
+
+def test_alb_event_detection():
+    """
+    Normally :: Detect ALB events
+
+    Expects:
+        ALB events are detected only by the ALB runtime
+    """
+    event = parameter_alb("GET", "/")
+    assert is_alb_event(event)
+    assert is_alb_event(event, strict=True)
+    assert classify_event(event, APIRuntimeAll) is None
+    del event["path"]
+    assert not is_alb_event(event)
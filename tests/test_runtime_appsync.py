@@ -0,0 +1,133 @@
+import threading
+import time
+
+from chalice import BadRequestError
+
+from chalice_spec.docs import Docs, Operation
+from chalice_spec.runtime.api_runtime import APIRuntimeAppSyncBatch
+from chalice_spec.runtime.model_utility.appsync import is_appsync_batch_event
+from chalice_spec.runtime.routing import OperationIndex
+from tests.schema import TestSchema, AnotherSchema
+from tests.test_runtime import setup_test
+
+
+def resolver_context(field_name: str, arguments: dict, parent="Query"):
+    return {
+        "arguments": arguments,
+        "identity": None,
+        "source": None,
+        "request": {"headers": {}},
+        "prev": None,
+        "info": {
+            "fieldName": field_name,
+            "parentTypeName": parent,
+            "variables": {},
+            "selectionSetList": [],
+        },
+        "stash": {},
+    }
+
+
+def setup_appsync_app():
+    app, spec = setup_test(APIRuntimeAppSyncBatch)
+    threads = []
+
+    @app.route(
+        "/posts/{post_id}",
+        methods=["GET"],
+        docs=Docs(get=Operation(response=AnotherSchema, operation_id="getPost")),
+    )
+    def get_post(post_id):
+        time.sleep(0.01)
+        threads.append(threading.current_thread().name)
+        query = app.current_request.query_params or {}
+        return AnotherSchema(nintendo=post_id, atari=query.get("atari", ""))
+
+    @app.route(
+        "/posts",
+        methods=["POST"],
+        docs=Docs(post=Operation(request=TestSchema, response=AnotherSchema)),
+    )
+    def create_post():
+        body = app.current_request.json_body
+        if body["world"] < 0:
+            raise BadRequestError("negative world")
+        return AnotherSchema(nintendo=body["hello"], atari=str(body["world"]))
+
+    return app, threads
+
+
+def test_detect_appsync_batch_event():
+    """
+    Normally ::
+        BatchInvoke events are detected, in strict mode as well
+    Anomaly ::
+        Other events are not detected
+    """
+    event = [resolver_context("getPost", {"post_id": "1"})]
+    assert is_appsync_batch_event(event)
+    assert is_appsync_batch_event(event, strict=True)
+    assert not is_appsync_batch_event([])
+    assert not is_appsync_batch_event({"Records": []})
+    assert not is_appsync_batch_event([{"info": {}}])
+    assert not is_appsync_batch_event([{"arguments": {}, "info": {}}])
+
+
+def test_operation_index():
+    """
+    Normally ::
+        Routes are indexed by operationId and by view name
+    """
+    app, _ = setup_appsync_app()
+    index = OperationIndex.for_app(app)
+    assert index.get("getPost") == ("/posts/{post_id}", "GET")
+    assert index.get("get_post") == ("/posts/{post_id}", "GET")
+    assert index.get("create_post") == ("/posts", "POST")
+    assert index.get("unknown") is None
+    assert OperationIndex.for_app(app) is index
+
+
+def test_invoke_from_appsync_batch():
+    """
+    Normally ::
+        Every resolver context is dispatched concurrently, results keep order
+    """
+    app, threads = setup_appsync_app()
+    event = [
+        resolver_context("getPost", {"post_id": str(i), "atari": "a"}) for i in range(6)
+    ]
+    event.append(
+        resolver_context("create_post", {"hello": "h", "world": 3}, "Mutation")
+    )
+
+    results = app(event, {})
+
+    assert results[:6] == [
+        {"data": {"nintendo": str(i), "atari": "a"}} for i in range(6)
+    ]
+    assert results[6] == {"data": {"nintendo": "h", "atari": "3"}}
+    assert len(set(threads)) > 1
+
+
+def test_invoke_from_appsync_batch_errors():
+    """
+    Anomaly ::
+        Failed items report an error, without failing the other items
+    """
+    app, _ = setup_appsync_app()
+    event = [
+        resolver_context("create_post", {"hello": "h", "world": -1}, "Mutation"),
+        resolver_context("unknownField", {}),
+        resolver_context("getPost", {"post_id": "2"}),
+    ]
+
+    results = app(event, {})
+
+    assert results[0] == {
+        "data": None,
+        "errorMessage": "negative world",
+        "errorType": "BadRequestError",
+    }
+    assert results[1]["data"] is None
+    assert results[1]["errorType"] == "NotFound"
+    assert results[2] == {"data": {"nintendo": "2", "atari": ""}}
@@ -0,0 +1,205 @@
+import base64
+import json
+import threading
+import time
+
+from chalice import Response
+
+from chalice_spec.docs import Docs, Operation
+from chalice_spec.runtime.api_runtime import APIRuntimeBatch
+from chalice_spec.runtime.converter.batch_event_to_apigw import deserialize_dynamodb
+from chalice_spec.runtime.model_utility.batch import is_batch_event
+from tests.schema import TestSchema, AnotherSchema
+from tests.test_runtime import setup_test
+
+
+def sqs_record(message_id: str, message: dict):
+    return {
+        "messageId": message_id,
+        "receiptHandle": "handle",
+        "body": json.dumps(message),
+        "attributes": {},
+        "messageAttributes": {},
+        "eventSource": "aws:sqs",
+        "eventSourceARN": "arn:aws:sqs:us-east-1:123456789012:queue",
+        "awsRegion": "us-east-1",
+    }
+
+
+def kinesis_record(sequence_number: str, message: dict):
+    return {
+        "kinesis": {
+            "partitionKey": "1",
+            "sequenceNumber": sequence_number,
+            "data": base64.b64encode(json.dumps(message).encode()).decode(),
+        },
+        "eventSource": "aws:kinesis",
+        "eventID": "shardId-000000000006:" + sequence_number,
+    }
+
+
+def dynamodb_record(sequence_number: str, new_image: dict = None):
+    dynamodb = {"SequenceNumber": sequence_number, "Keys": {"id": {"S": "1"}}}
+    if new_image is not None:
+        dynamodb["NewImage"] = new_image
+    return {
+        "eventID": "1",
+        "eventName": "INSERT" if new_image else "REMOVE",
+        "eventSource": "aws:dynamodb",
+        "dynamodb": dynamodb,
+    }
+
+
+def setup_batch_app():
+    app, spec = setup_test(APIRuntimeBatch)
+    calls = []
+
+    @app.route(
+        "/posts/{post_id}",
+        methods=["PUT"],
+        docs=Docs(put=Operation(request=TestSchema, response=AnotherSchema)),
+    )
+    def put_post(post_id):
+        body = app.current_request.json_body
+        # Let other records run, current_request must stay this record's
+        time.sleep(0.01)
+        assert app.current_request.json_body is body
+        calls.append((post_id, body, threading.current_thread().name))
+        if body["world"] < 0:
+            return Response(body={"error": "negative"}, status_code=500)
+        return AnotherSchema(nintendo=post_id, atari=body["hello"])
+
+    @app.route("/undocumented", methods=["POST"])
+    def undocumented():
+        return {}
+
+    return app, calls
+
+
+def test_invoke_from_sqs_batch():
+    """
+    Normally :: Invoke from SQS batch
+
+    Condition:
+        Records for a documented route, an invalid body, an undocumented route
+        and an unknown path
+    Expects:
+        Valid records are dispatched concurrently,
+        the others are reported in batchItemFailures
+    """
+    app, calls = setup_batch_app()
+    records = [
+        sqs_record(
+            f"ok-{index}",
+            {
+                "method": "PUT",
+                "path": f"/posts/{index}",
+                "body": {"hello": "h", "world": index},
+            },
+        )
+        for index in range(8)
+    ]
+    records += [
+        sqs_record(
+            "invalid", {"method": "PUT", "path": "/posts/1", "body": {"hello": "h"}}
+        ),
+        sqs_record("undocumented", {"path": "/undocumented", "body": {}}),
+        sqs_record("unknown", {"path": "/unknown", "body": {}}),
+        sqs_record("not-json", {}),
+    ]
+    records[-1]["body"] = "not json"
+    response = app({"Records": records}, {})
+    assert response == {
+        "batchItemFailures": [
+            {"itemIdentifier": "invalid"},
+            {"itemIdentifier": "undocumented"},
+            {"itemIdentifier": "unknown"},
+            {"itemIdentifier": "not-json"},
+        ]
+    }
+    assert sorted(int(post_id) for post_id, _, _ in calls) == list(range(8))
+    assert len({thread for _, _, thread in calls}) > 1
+
+
+def test_invoke_from_kinesis_and_dynamodb_batches():
+    """
+    Normally :: Invoke from Kinesis and DynamoDB Streams batches
+
+    Expects:
+        Failed handlers are reported by sequence number, removed items are skipped
+    """
+    app, calls = setup_batch_app()
+    response = app(
+        {
+            "Records": [
+                kinesis_record(
+                    "1",
+                    {
+                        "method": "PUT",
+                        "path": "/posts/1",
+                        "body": {"hello": "h", "world": 1},
+                    },
+                ),
+                kinesis_record(
+                    "2",
+                    {
+                        "method": "PUT",
+                        "path": "/posts/2",
+                        "body": {"hello": "h", "world": -1},
+                    },
+                ),
+            ]
+        },
+        {},
+    )
+    assert response == {"batchItemFailures": [{"itemIdentifier": "2"}]}
+
+    response = app(
+        {
+            "Records": [
+                dynamodb_record(
+                    "10",
+                    {
+                        "method": {"S": "PUT"},
+                        "path": {"S": "/posts/3"},
+                        "body": {"M": {"hello": {"S": "h"}, "world": {"N": "3"}}},
+                    },
+                ),
+                dynamodb_record("11"),
+            ]
+        },
+        {},
+    )
+    assert response == {"batchItemFailures": []}
+    assert ("3", {"hello": "h", "world": 3}) in [call[:2] for call in calls]
+
+
+def test_batch_event_detection():
+    """
+    Normally :: Detect batch events
+
+    Expects:
+        Only SQS, Kinesis and DynamoDB Streams records are detected
+    """
+    assert is_batch_event({"Records": [sqs_record("1", {})]}, strict=True)
+    assert not is_batch_event({"Records": []})
+    assert not is_batch_event({"Records": [{"eventSource": "aws:s3"}]})
+
+
+def test_deserialize_dynamodb():
+    """
+    Normally :: Deserialize DynamoDB attribute values
+    """
+    assert deserialize_dynamodb(
+        {
+            "M": {
+                "s": {"S": "a"},
+                "i": {"N": "1"},
+                "f": {"N": "1.5"},
+                "b": {"BOOL": True},
+                "n": {"NULL": True},
+                "l": {"L": [{"S": "a"}, {"N": "2"}]},
+                "ns": {"NS": ["1", "2"]},
+            }
+        }
+    ) == {"s": "a", "i": 1, "f": 1.5, "b": True, "n": None, "l": ["a", 2], "ns": [1, 2]}
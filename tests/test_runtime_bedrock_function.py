@@ -0,0 +1,312 @@
+import json
+
+from chalice import BadRequestError
+
+from chalice_spec.chalice import BlueprintWithSpec
+from chalice_spec.docs import Docs, Operation
+from chalice_spec.runtime.api_runtime import (
+    APIRuntime,
+    APIRuntimeBedrockAgentAll,
+    APIRuntimeBedrockAgentFunction,
+    classify_event,
+)
+from chalice_spec.runtime.converter.bedrock_agent_function_event_to_apigw import (
+    BedrockAgentFunctionEventToApiGateway,
+)
+from chalice_spec.runtime.model_utility.bedrock_agent import (
+    is_bedrock_agent_event,
+    is_bedrock_agent_function_event,
+)
+from tests.schema import AnotherSchema, TestSchema
+from tests.test_runtime import (
+    APIParameter,
+    parameter_agents_for_amazon_bedrock,
+    setup_test,
+)
+
+
+def setup_function_app(runtime=APIRuntimeBedrockAgentFunction):
+    app, spec = setup_test(runtime)
+
+    @app.route(
+        "/posts/{post_id}",
+        methods=["POST"],
+        docs=Docs(
+            post=Operation(
+                summary="Update a post",
+                operation_id="updatePost",
+                request=TestSchema,
+                response=TestSchema,
+                parameters=[
+                    {"name": "x-trace", "in": "header", "schema": {"type": "string"}}
+                ],
+            )
+        ),
+    )
+    def update_post(post_id):
+        body = app.current_request.json_body
+        if body["world"] < 0:
+            raise BadRequestError("negative world")
+        return TestSchema(
+            hello=f"{post_id}:{app.current_request.headers.get('x-trace')}",
+            world=body["world"],
+        )
+
+    @app.route(
+        "/search",
+        methods=["GET"],
+        docs=Docs(
+            get=Operation(
+                description="Search the posts",
+                parameters=[
+                    {
+                        "name": "q",
+                        "in": "query",
+                        "required": True,
+                        "description": "Search words",
+                        "schema": {"type": "string"},
+                    }
+                ],
+                response=AnotherSchema,
+            )
+        ),
+    )
+    def search():
+        query = app.current_request.query_params or {}
+        app.current_request.session.session_attributes["last"] = query["q"]
+        return AnotherSchema(nintendo=query["q"], atari="found")
+
+    @app.route("/fail", methods=["GET"])
+    def fail():
+        raise Exception("boom")
+
+    return app, spec
+
+
+def function_event(function: str, parameters=None, action_group="Posts") -> dict:
+    return {
+        "messageVersion": "1.0",
+        "agent": {
+            "name": "string",
+            "id": "string",
+            "alias": "string",
+            "version": "string",
+        },
+        "inputText": "string",
+        "sessionId": "string",
+        "actionGroup": action_group,
+        "function": function,
+        "parameters": [
+            {"name": name, "type": type_, "value": value}
+            for name, type_, value in (parameters or [])
+        ],
+        "sessionAttributes": {"user": "alice"},
+        "promptSessionAttributes": {},
+    }
+
+
+def response_text(response: dict) -> str:
+    return response["response"]["functionResponse"]["responseBody"]["TEXT"]["body"]
+
+
+def test_detect_function_event():
+    """
+    Normally ::
+        Function details events are told apart from OpenAPI action group events
+    """
+    event = function_event("updatePost")
+    openapi_event = parameter_agents_for_amazon_bedrock(
+        APIParameter(apiPath="/search", httpMethod="GET")
+    )
+    assert is_bedrock_agent_function_event(event)
+    assert is_bedrock_agent_function_event(event, strict=True)
+    assert not is_bedrock_agent_event(event)
+    assert not is_bedrock_agent_function_event(openapi_event)
+    assert (
+        classify_event(event, APIRuntimeBedrockAgentAll)
+        == APIRuntime.BedrockAgentFunction
+    )
+    assert (
+        classify_event(openapi_event, APIRuntimeBedrockAgentAll)
+        == APIRuntime.BedrockAgent
+    )
+
+
+def test_invoke_function_by_operation_id():
+    """
+    Normally ::
+        The function is dispatched to the route of its operationId, with
+        path, header and body parameters where the spec declares them
+    """
+    app, _ = setup_function_app()
+    event = function_event(
+        "updatePost",
+        [
+            ("post_id", "string", "a b"),
+            ("x-trace", "string", "t1"),
+            ("hello", "string", "hi"),
+            ("world", "number", "7"),
+        ],
+    )
+    response = app(event, {})
+    assert response["messageVersion"] == "1.0"
+    assert response["response"]["actionGroup"] == "Posts"
+    assert response["response"]["function"] == "updatePost"
+    assert "responseState" not in response["response"]["functionResponse"]
+    assert json.loads(response_text(response)) == {"hello": "a b:t1", "world": 7}
+    assert response["sessionAttributes"] == {"user": "alice"}
+
+
+def test_invoke_function_cookies():
+    """
+    Normally ::
+        Cookie parameters of the spec are sent as the Cookie header
+    """
+    app, _ = setup_function_app()
+
+    @app.route(
+        "/preferences",
+        methods=["GET"],
+        docs=Docs(
+            get=Operation(
+                operation_id="getPreferences",
+                parameters=[
+                    {"name": "theme", "in": "cookie", "schema": {"type": "string"}}
+                ],
+                response=AnotherSchema,
+            )
+        ),
+    )
+    def preferences():
+        request = app.current_request
+        return AnotherSchema(
+            nintendo=request.headers.get("cookie"),
+            atari=json.dumps(request.query_params),
+        )
+
+    event = function_event("getPreferences", [("theme", "string", "dark")])
+    assert json.loads(response_text(app(event, {}))) == {
+        "nintendo": "theme=dark",
+        "atari": "null",
+    }
+
+
+def test_invoke_function_query_and_session():
+    """
+    Normally ::
+        Parameters of routes without body are query strings, by generated operationId
+        and by view name
+    """
+    app, _ = setup_function_app()
+    for name in ("get_search", "search"):
+        response = app(function_event(name, [("q", "string", "chalice")]), {})
+        assert json.loads(response_text(response)) == {
+            "nintendo": "chalice",
+            "atari": "found",
+        }
+        assert response["sessionAttributes"] == {"user": "alice", "last": "chalice"}
+
+
+def test_invoke_function_error_states():
+    """
+    Anomaly ::
+        Client errors are REPROMPT, server errors and unknown functions are FAILURE
+    """
+    app, _ = setup_function_app()
+    event = function_event(
+        "updatePost",
+        [("post_id", "string", "1"), ("hello", "string", "hi"), ("world", "", "-1")],
+    )
+    response = app(event, {})
+    assert response["response"]["functionResponse"]["responseState"] == "REPROMPT"
+    assert json.loads(response_text(response))["Message"] == "negative world"
+
+    response = app(function_event("fail"), {})
+    assert response["response"]["functionResponse"]["responseState"] == "FAILURE"
+
+    response = app(function_event("unknown"), {})
+    assert response["response"]["functionResponse"]["responseState"] == "FAILURE"
+    assert json.loads(response_text(response))["Code"] == "NotFoundError"
+    assert response["sessionAttributes"] == {"user": "alice"}
+    assert response["promptSessionAttributes"] == {}
+
+
+def test_invoke_function_resolves_once(monkeypatch):
+    """
+    Normally ::
+        The function is resolved to a route once per invocation
+    """
+    app, _ = setup_function_app()
+    functions = []
+    match_route = BedrockAgentFunctionEventToApiGateway._match_route
+
+    def counting_match_route(self, app, agent_event):
+        functions.append(agent_event.function)
+        return match_route(self, app, agent_event)
+
+    monkeypatch.setattr(
+        BedrockAgentFunctionEventToApiGateway, "_match_route", counting_match_route
+    )
+
+    app(function_event("search", [("q", "string", "x")]), {})
+    app(function_event("unknown"), {})
+    assert functions == ["search", "unknown"]
+
+
+def test_invoke_function_by_action_group():
+    """
+    Anomaly ::
+        Functions of an action group that routes are bound to are resolved
+        among the routes of the group only
+    """
+    app, _ = setup_function_app()
+    orders = BlueprintWithSpec(__name__, action_group="Orders")
+
+    @orders.route("/items/{item_id}", methods=["GET"])
+    def get_order_item(item_id):
+        return {"item": item_id}
+
+    app.register_blueprint(orders, url_prefix="/orders")
+
+    response = app(
+        function_event("get_order_item", [("item_id", "string", "9")], "Orders"), {}
+    )
+    assert json.loads(response_text(response)) == {"item": "9"}
+
+    response = app(function_event("search", [("q", "string", "x")], "Orders"), {})
+    assert response["response"]["functionResponse"]["responseState"] == "FAILURE"
+
+
+def test_function_definitions():
+    """
+    Normally ::
+        Function details are generated from the documented operations
+    """
+    app, _ = setup_function_app(APIRuntimeBedrockAgentAll)
+    functions = {
+        function["name"]: function
+        for function in app.function_definitions()["functions"]
+    }
+    # Routes without docs are not in the spec
+    assert set(functions) == {"updatePost", "get_search"}
+    assert functions["updatePost"] == {
+        "name": "updatePost",
+        "description": "Update a post",
+        "parameters": {
+            "post_id": {"type": "string", "required": True},
+            "x-trace": {"type": "string", "required": False},
+            "hello": {"type": "string", "required": True, "description": "Hello"},
+            "world": {"type": "integer", "required": True, "description": "World"},
+        },
+    }
+    assert functions["get_search"] == {
+        "name": "get_search",
+        "description": "Search the posts",
+        "parameters": {
+            "q": {"type": "string", "required": True, "description": "Search words"}
+        },
+    }
+
+    # Each exported function is dispatched by its name
+    for name in functions:
+        assert app(function_event(name), {})["response"]["function"] == name
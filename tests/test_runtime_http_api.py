@@ -0,0 +1,158 @@
+import json
+
+from chalice import Response
+
+from chalice_spec.runtime.api_runtime import APIRuntime, APIRuntimeHttpApi
+from chalice_spec.runtime.converter.http_api_event_to_apigw import (
+    HttpApiEventToApiGateway,
+)
+from chalice_spec.runtime.model_utility.http_api import is_http_api_event
+from tests.test_runtime import setup_test
+
+
+def parameter_http_api(
+    method: str,
+    raw_path: str,
+    route_key: str = "$default",
+    raw_query_string: str = "",
+    body: str = None,
+):
+    return {
+        "version": "2.0",
+        "routeKey": route_key,
+        "rawPath": raw_path,
+        "rawQueryString": raw_query_string,
+        "cookies": ["session=abc", "theme=dark"],
+        "headers": {"content-type": "application/json", "accept": "*/*"},
+        "requestContext": {
+            "accountId": "123456789012",
+            "apiId": "api-id",
+            "domainName": "id.execute-api.us-east-1.amazonaws.com",
+            "domainPrefix": "id",
+            "http": {
+                "method": method,
+                "path": raw_path,
+                "protocol": "HTTP/1.1",
+                "sourceIp": "192.0.2.1",
+                "userAgent": "agent",
+            },
+            "requestId": "id",
+            "routeKey": route_key,
+            "stage": "$default",
+            "time": "12/Mar/2020:19:03:58 +0000",
+            "timeEpoch": 1583348638390,
+        },
+        "body": body,
+        "isBase64Encoded": False,
+    }
+
+
+def test_invoke_from_http_api_route_key():
+    """
+    Normally :: Invoke from API Gateway HTTP API
+
+    Condition:
+        Route key names the Chalice route
+    Expects:
+        Handler receives method, path parameters, query, cookies and body
+    """
+    app, spec = setup_test(APIRuntimeHttpApi)
+
+    @app.route("/posts/{post_id}", methods=["PUT"])
+    def put_post(post_id):
+        request = app.current_request
+        return {
+            "post_id": post_id,
+            "tags": request.query_params.getlist("tag"),
+            "cookie": request.headers["cookie"],
+            "body": request.json_body,
+            "source_ip": request.context["identity"]["sourceIp"],
+        }
+
+    event = parameter_http_api(
+        "PUT",
+        "/posts/42",
+        route_key="PUT /posts/{post_id}",
+        raw_query_string="tag=a&tag=b",
+        body=json.dumps({"hello": "world"}),
+    )
+    event["pathParameters"] = {"post_id": "42"}
+    response = app(event, {})
+    assert response["statusCode"] == 200
+    assert "multiValueHeaders" not in response
+    assert json.loads(response["body"]) == {
+        "post_id": "42",
+        "tags": ["a", "b"],
+        "cookie": "session=abc; theme=dark",
+        "body": {"hello": "world"},
+        "source_ip": "192.0.2.1",
+    }
+
+
+def test_invoke_from_function_url():
+    """
+    Normally :: Invoke from Lambda Function URL
+
+    Condition:
+        Default route key, path parameters are resolved from the raw path
+    Expects:
+        Handler is routed, Set-Cookie headers are returned as cookies
+    """
+    app, spec = setup_test([APIRuntime.HttpApi, APIRuntime.APIGateway])
+
+    @app.route("/users/{user_id}/posts/{post_id}", methods=["GET"])
+    def get_post(user_id, post_id):
+        return Response(
+            body={"user_id": user_id, "post_id": post_id},
+            headers={
+                "Set-Cookie": ["a=1", "b=2"],
+                "X-Values": ["one", "two"],
+            },
+        )
+
+    @app.route("/users/me/posts/{post_id}", methods=["GET"])
+    def get_my_post(post_id):
+        return {"me": post_id}
+
+    response = app(parameter_http_api("GET", "/users/john%20doe/posts/7"), {})
+    assert response["statusCode"] == 200
+    assert json.loads(response["body"]) == {"user_id": "john doe", "post_id": "7"}
+    assert response["cookies"] == ["a=1", "b=2"]
+    assert response["headers"]["X-Values"] == "one,two"
+
+    response = app(parameter_http_api("GET", "/users/me/posts/7"), {})
+    assert json.loads(response["body"]) == {"me": "7"}
+
+
+def test_http_api_event_detection():
+    """
+    Normally :: Detect HTTP API events
+
+    Expects:
+        Only payload v2.0 events are detected, strict mode validates them
+    """
+    event = parameter_http_api("GET", "/")
+    assert is_http_api_event(event)
+    assert is_http_api_event(event, strict=True)
+    assert not is_http_api_event({"version": "1.0", "requestContext": {}})
+    del event["rawPath"]
+    assert is_http_api_event(event)
+    assert not is_http_api_event(event, strict=True)
+
+
+def test_http_api_converter_without_app():
+    """
+    Normally :: Convert an HTTP API event without conversion context
+
+    Expects:
+        Route key is used as the resource path, body is passed through as-is
+    """
+    body = '{"hello": "world"}'
+    event = parameter_http_api(
+        "POST", "/posts", route_key="POST /posts", raw_query_string="a=1", body=body
+    )
+    converted = HttpApiEventToApiGateway().convert_request(event)
+    assert converted["requestContext"]["resourcePath"] == "/posts"
+    assert converted["requestContext"]["httpMethod"] == "POST"
+    assert converted["multiValueQueryStringParameters"] == {"a": ["1"]}
+    assert converted["body"] is body
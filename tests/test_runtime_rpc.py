@@ -0,0 +1,154 @@
+import pytest
+from chalice import BadRequestError, NotFoundError, Response
+
+from chalice_spec.docs import Docs, Operation, default_operation_id
+from chalice_spec.runtime.api_runtime import APIRuntime, APIRuntimeRpc
+from chalice_spec.runtime.model_utility.rpc import is_rpc_event
+from tests.schema import TestSchema, AnotherSchema
+from tests.test_runtime import setup_test
+
+
+def setup_rpc_app():
+    app, spec = setup_test(APIRuntimeRpc + [APIRuntime.APIGateway])
+
+    @app.route(
+        "/posts/{post_id}",
+        methods=["PUT"],
+        docs=Docs(
+            put=Operation(
+                request=TestSchema, response=AnotherSchema, operation_id="updatePost"
+            )
+        ),
+    )
+    def update_post(post_id):
+        request = app.current_request
+        assert request.method == "PUT"
+        assert request.path == "/posts/{post_id}"
+        return AnotherSchema(
+            nintendo=post_id + request.query_params.get("suffix", ""),
+            atari=request.json_body["hello"],
+        )
+
+    @app.route("/posts", methods=["GET"], docs=Docs(get=AnotherSchema))
+    def list_posts():
+        return Response(body=[{"query": app.current_request.query_params}])
+
+    @app.route("/posts/{post_id}", methods=["GET"], docs=Docs(get=AnotherSchema))
+    def get_post(post_id):
+        return AnotherSchema(nintendo=post_id, atari="game").json()
+
+    @app.route("/posts/{post_id}/text", methods=["GET"])
+    def get_post_text(post_id):
+        return Response(
+            body='"plain"', headers={"Content-Type": "text/plain"}, status_code=200
+        )
+
+    return app
+
+
+def test_default_operation_id():
+    """
+    Normally ::
+        operationIds are generated from the method and the path
+    """
+    assert default_operation_id("/users/{user_id}", "GET") == "get_users_user_id"
+    assert default_operation_id("/", "post") == "post"
+    assert default_operation_id("/a-b/{c}/d", "DELETE") == "delete_a_b_c_d"
+
+
+def test_detect_rpc_event():
+    """
+    Normally ::
+        RPC events are detected, in strict mode as well
+    Anomaly ::
+        Events with other keys are not detected
+    """
+    assert is_rpc_event({"operationId": "updatePost"})
+    assert is_rpc_event({"operationId": "x", "params": {}, "body": 1}, strict=True)
+    assert not is_rpc_event({"operationId": 1})
+    assert not is_rpc_event({"operationId": "x", "requestContext": {}})
+    assert not is_rpc_event({"operationId": "x", "params": "p"}, strict=True)
+    assert not is_rpc_event([])
+
+
+def test_invoke_rpc():
+    """
+    Normally ::
+        The view is called directly, and returns its serialized result
+    """
+    app = setup_rpc_app()
+    event = {
+        "operationId": "updatePost",
+        "params": {"post_id": 1, "suffix": "a"},
+        "body": {"hello": "world", "world": 1},
+    }
+    assert app(event, {}) == {"nintendo": "1a", "atari": "world"}
+
+    # Generated operationId, and view function name
+    event["operationId"] = "put_posts_post_id"
+    assert app(event, {}) == {"nintendo": "1a", "atari": "world"}
+    assert app({"operationId": "list_posts"}, {}) == [{"query": None}]
+    assert app({"operationId": "get_posts", "params": {"q": [1, 2]}}, {}) == [
+        {"query": {"q": "2"}}
+    ]
+
+
+def test_invoke_rpc_json_string_result():
+    """
+    Normally ::
+        A view returning Model(...).json() returns the object, not a JSON string
+    """
+    app = setup_rpc_app()
+    assert app({"operationId": "get_post", "params": {"post_id": "7"}}, {}) == {
+        "nintendo": "7",
+        "atari": "game",
+    }
+    # Other content types are returned as sent
+    assert (
+        app({"operationId": "get_post_text", "params": {"post_id": "7"}}, {})
+        == '"plain"'
+    )
+
+
+def test_invoke_rpc_errors():
+    """
+    Anomaly ::
+        Unknown operations and missing path parameters raise chalice errors
+    """
+    app = setup_rpc_app()
+    with pytest.raises(NotFoundError):
+        app({"operationId": "unknown"}, {})
+    with pytest.raises(BadRequestError):
+        app({"operationId": "updatePost", "body": {}}, {})
+
+
+def test_invoke_rpc_generated_collisions():
+    """
+    Normally :: /a-b and /a/b generate the same operationId, get_a_b
+
+    Expects:
+        Operations are invoked by their documented operationId, the generated
+        one raises a BadRequestError
+    """
+    app, spec = setup_test(APIRuntimeRpc)
+
+    @app.route(
+        "/a-b",
+        methods=["GET"],
+        docs=Docs(get=Operation(response=AnotherSchema, operation_id="getDashed")),
+    )
+    def dashed():
+        return {"route": "/a-b"}
+
+    @app.route(
+        "/a/b",
+        methods=["GET"],
+        docs=Docs(get=Operation(response=AnotherSchema, operation_id="getNested")),
+    )
+    def nested():
+        return {"route": "/a/b"}
+
+    assert app({"operationId": "getDashed"}, {}) == {"route": "/a-b"}
+    assert app({"operationId": "getNested"}, {}) == {"route": "/a/b"}
+    with pytest.raises(BadRequestError, match="get_a_b"):
+        app({"operationId": "get_a_b"}, {})
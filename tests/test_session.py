@@ -0,0 +1,142 @@
+import json
+import time
+
+from chalice_spec.docs import Docs
+from chalice_spec.runtime.api_runtime import APIRuntimeBedrockAgent
+from chalice_spec.runtime.models.bedrock_agent import BedrockAgentResponseModel
+from chalice_spec.runtime.session import DEFAULT_CACHE_KEY, SessionCache, SessionState
+from tests.schema import AnotherSchema
+from tests.test_runtime import (
+    APIParameter,
+    parameter_agents_for_amazon_bedrock,
+    setup_test,
+)
+
+
+def test_session_cache():
+    """
+    Normally ::
+        Values round-trip through the encoded cache until they expire
+    """
+    cache = SessionCache()
+    cache.set("user", {"name": "a"})
+    cache.set("old", 1, ttl=-1)
+    assert cache.get("user") == {"name": "a"}
+    assert "old" not in cache
+    assert cache.get("old", "default") == "default"
+
+    restored = SessionCache(cache.dumps())
+    assert restored.get("user") == {"name": "a"}
+    assert "old" not in restored
+    assert restored.get_or_set("user", lambda: 1 / 0) == {"name": "a"}
+    assert restored.get_or_set("count", lambda: 3) == 3
+    restored.delete("count")
+    assert "count" not in restored
+
+    # Unmodified caches are returned as they were read
+    encoded = restored.dumps()
+    assert SessionCache(encoded).dumps() is encoded
+    assert SessionCache().dumps() is None
+
+
+def test_session_cache_anomaly():
+    """
+    Anomaly ::
+        Entries expiring first are evicted over the size budget,
+        invalid caches are dropped
+    """
+    cache = SessionCache(max_bytes=200)
+    for index in range(20):
+        cache.set(f"key{index}", "value %d" % index * 10, ttl=100 + index)
+    encoded = cache.dumps()
+    assert len(encoded) <= 200
+    restored = SessionCache(encoded)
+    assert "key19" in restored
+    assert "key0" not in restored
+
+    assert SessionCache("not a cache").get("key") is None
+    assert SessionCache("not a cache").dumps() is None
+
+
+def test_session_state():
+    """
+    Normally ::
+        The cache is kept in a session attribute, only if it is used
+    """
+    state = SessionState({"user": "a", DEFAULT_CACHE_KEY: "x"}, {"p": "1"})
+    assert state.dump_session_attributes() == {"user": "a", DEFAULT_CACHE_KEY: "x"}
+
+    state = SessionState({"user": "a"})
+    state.cache.set("k", 1)
+    attributes = state.dump_session_attributes()
+    assert attributes["user"] == "a"
+    assert SessionCache(attributes[DEFAULT_CACHE_KEY]).get("k") == 1
+    assert DEFAULT_CACHE_KEY not in state.session_attributes
+
+
+def test_bedrock_agent_session_round_trip():
+    """
+    Normally ::
+        Handlers read and write session attributes and the cache,
+        they are returned to the agent and read back on the next turn
+    """
+    app, spec = setup_test(APIRuntimeBedrockAgent)
+    lookups = []
+
+    @app.route("/profile", methods=["GET"], docs=Docs(get=AnotherSchema))
+    def profile():
+        session = app.current_request.session
+        session.session_attributes["turns"] = str(
+            int(session.session_attributes.get("turns", "0")) + 1
+        )
+        session.prompt_session_attributes["now"] = "today"
+
+        def lookup():
+            lookups.append(time.time())
+            return {"name": "koikoi"}
+
+        user = session.cache.get_or_set("user", lookup, ttl=60)
+        return AnotherSchema(
+            nintendo=user["name"], atari=session.session_attributes["turns"]
+        )
+
+    event = parameter_agents_for_amazon_bedrock(
+        APIParameter(httpMethod="GET", apiPath="/profile")
+    )
+    event["sessionAttributes"] = {}
+    event["promptSessionAttributes"] = {}
+    for turn in (1, 2):
+        response = app(event, {})
+        BedrockAgentResponseModel.parse_obj(response)
+        body = json.loads(
+            response["response"]["responseBody"]["application/json"]["body"]
+        )
+        assert body == {"nintendo": "koikoi", "atari": str(turn)}
+        assert response["sessionAttributes"]["turns"] == str(turn)
+        assert response["promptSessionAttributes"] == {"now": "today"}
+        event["sessionAttributes"] = response["sessionAttributes"]
+
+    assert len(lookups) == 1
+
+
+def test_bedrock_agent_session_request_to_dict():
+    """
+    Normally ::
+        The request with a session serializes to JSON without the session
+    """
+    app, spec = setup_test(APIRuntimeBedrockAgent)
+
+    @app.route("/request", methods=["GET"])
+    def request():
+        assert isinstance(app.current_request.session, SessionState)
+        return json.loads(json.dumps(app.current_request.to_dict()))
+
+    event = parameter_agents_for_amazon_bedrock(
+        APIParameter(httpMethod="GET", apiPath="/request")
+    )
+    response = app(event, {})
+
+    assert response["response"]["httpStatusCode"] == 200
+    body = json.loads(response["response"]["responseBody"]["application/json"]["body"])
+    assert body["method"] == "GET"
+    assert "session" not in body